@@ -0,0 +1,325 @@
+"""
+Run every course test suite in parallel.
+
+Each suite runs in its own `python -m pytest` subprocess from its own
+directory, so Django and FastAPI projects never share settings, modules or
+databases. Suites whose sources have not changed since their last passing
+run are skipped. Per-test durations are appended to a history, and tests
+that are slow, or much slower than they used to be, are flagged.
+
+Usage:
+    python run_tests.py                  # all suites, one worker per CPU
+    python run_tests.py sessao9 sessao13 # suites whose name starts with these
+    python run_tests.py --shard 1/3      # CI matrix: this job's share of suites
+    python run_tests.py --no-cache --slow 0.5
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(ROOT, ".test-cache")
+RESULTS_FILE = os.path.join(CACHE_DIR, "results.json")
+HISTORY_FILE = os.path.join(CACHE_DIR, "durations.json")
+REPORT_FILE = os.path.join(CACHE_DIR, "report.json")
+
+HISTORY_LENGTH = 20
+SOURCE_SUFFIXES = (".py", ".ini", ".toml", ".cfg", ".txt", ".json", ".html")
+SKIP_DIRS = {
+    "__pycache__", ".pytest_cache", ".hypothesis", ".benchmarks", ".test-cache",
+    "logs", ".git", ".venv", "venv", "node_modules",
+}
+
+
+@dataclass
+class Suite:
+    """A directory tested by one pytest invocation."""
+
+    name: str
+    root: str
+    args: List[str] = field(default_factory=list)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(ROOT, self.root)
+
+
+# Suites that pytest's defaults cannot find or run on their own
+EXPLICIT_SUITES = [
+    # Tests also live in the exercise modules, which pytest does not collect by name
+    Suite("sessao8", "sessao8", ["challenge.py", "exercise.py", "test_properties.py", "test_benchmarks.py"]),
+    # The project is both the rootdir and a package: import by path. The test
+    # database is built by running the migrations, so they are exercised too
+    Suite("sessao9/blog_project", "sessao9/blog_project", ["--import-mode=importlib"]),
+    Suite("sessao13/django_hello", "sessao13/django_hello", ["hello_app/tests.py"]),
+]
+
+
+@dataclass
+class SuiteResult:
+    suite: Suite
+    status: str
+    duration: float = 0.0
+    tests: Dict[str, float] = field(default_factory=dict)
+    failures: List[str] = field(default_factory=list)
+    output: str = ""
+
+
+def _has_pytest_config(directory: str) -> bool:
+    if os.path.exists(os.path.join(directory, "pytest.ini")):
+        return True
+    pyproject = os.path.join(directory, "pyproject.toml")
+    if os.path.exists(pyproject):
+        with open(pyproject, encoding="utf-8") as f:
+            return "[tool.pytest.ini_options]" in f.read()
+    return False
+
+
+def discover_suites() -> List[Suite]:
+    """
+    Find every test suite in the repository.
+
+    A directory with a pytest configuration is a suite root; test files
+    below it belong to it. Loose `test_*.py` files elsewhere make their
+    directory a suite.
+    """
+    suites = {suite.root: suite for suite in EXPLICIT_SUITES}
+    for directory, dirnames, filenames in os.walk(ROOT):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith("."))
+        relative = os.path.relpath(directory, ROOT)
+        if relative == "." or any(relative == root or relative.startswith(root + os.sep) for root in suites):
+            continue
+        if _has_pytest_config(directory):
+            suites[relative] = Suite(relative, relative)
+            continue
+        if any(name.startswith("test_") and name.endswith(".py") for name in filenames):
+            suites[relative] = Suite(relative, relative)
+    return sorted(suites.values(), key=lambda suite: suite.name)
+
+
+def source_hash(suite: Suite) -> str:
+    """Hash the suite's sources, its arguments and the interpreter version."""
+    digest = hashlib.sha256()
+    digest.update(sys.version.encode())
+    digest.update("\0".join(suite.args).encode())
+    for directory, dirnames, filenames in os.walk(suite.path):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in sorted(filenames):
+            if not name.endswith(SOURCE_SUFFIXES):
+                continue
+            path = os.path.join(directory, name)
+            digest.update(os.path.relpath(path, suite.path).encode())
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def _parse_junit(path: str) -> tuple:
+    tests: Dict[str, float] = {}
+    failures: List[str] = []
+    try:
+        tree = ET.parse(path)
+    except (OSError, ET.ParseError):
+        return tests, failures
+    for case in tree.iter("testcase"):
+        test_id = f"{case.get('classname', '')}::{case.get('name', '')}"
+        tests[test_id] = float(case.get("time") or 0)
+        if case.find("failure") is not None or case.find("error") is not None:
+            failures.append(test_id)
+    return tests, failures
+
+
+def run_suite(suite: Suite) -> SuiteResult:
+    """Run one suite in a fresh interpreter."""
+    with tempfile.TemporaryDirectory() as tmp:
+        junit = os.path.join(tmp, "junit.xml")
+        command = [
+            sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider",
+            f"--junitxml={junit}", "-o", "junit_family=xunit1", *suite.args,
+        ]
+        env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+        start = time.perf_counter()
+        process = subprocess.run(command, cwd=suite.path, env=env, capture_output=True, text=True)
+        duration = time.perf_counter() - start
+        tests, failures = _parse_junit(junit)
+
+    # 5: no tests collected, which is not a failure of the suite
+    status = "passed" if process.returncode in (0, 5) else "failed"
+    return SuiteResult(suite, status, duration, tests, failures, process.stdout + process.stderr)
+
+
+def select_shard(suites: List[Suite], shard: str, history: Dict[str, List[float]]) -> List[Suite]:
+    """
+    Return this shard's suites, balanced on their recorded durations.
+
+    Suites are assigned longest first to the least loaded shard, so every
+    CI job gets a similar amount of work and the assignment is stable for
+    a given history.
+    """
+    index, count = (int(part) for part in shard.split("/"))
+    if not 1 <= index <= count:
+        raise ValueError(f"Invalid shard {shard}")
+
+    def expected(suite: Suite) -> float:
+        total = sum(
+            durations[-1] for test_id, durations in history.items() if test_id.startswith(suite.name + "|")
+        )
+        return total or 1.0
+
+    loads = [0.0] * count
+    assigned: List[List[Suite]] = [[] for _ in range(count)]
+    for suite in sorted(suites, key=lambda s: (-expected(s), s.name)):
+        target = loads.index(min(loads))
+        assigned[target].append(suite)
+        loads[target] += expected(suite)
+    return sorted(assigned[index - 1], key=lambda suite: suite.name)
+
+
+def _load(path: str) -> dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(path: str, data: dict) -> None:
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _median(values: List[float]) -> float:
+    ordered = sorted(values)
+    middle = len(ordered) // 2
+    return ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+
+
+def flag_slow_tests(
+    results: List[SuiteResult], history: Dict[str, List[float]], slow: float, regression: float
+) -> List[dict]:
+    """
+    Flag tests over `slow` seconds, or over `regression` times their median.
+
+    The median is taken over previous runs only, so a test is compared to
+    how it used to behave rather than to itself.
+    """
+    flagged = []
+    for result in results:
+        for test_id, duration in result.tests.items():
+            key = f"{result.suite.name}|{test_id}"
+            previous = history.get(key, [])
+            baseline = _median(previous) if previous else None
+            reasons = []
+            if duration >= slow:
+                reasons.append(f"over {slow:g}s")
+            if baseline and duration >= 0.05 and duration > regression * baseline:
+                reasons.append(f"{duration / baseline:.1f}x its median {baseline:.3f}s")
+            if reasons:
+                flagged.append({"test": key, "duration": round(duration, 4), "reasons": reasons})
+    return sorted(flagged, key=lambda item: -item["duration"])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the course test suites in parallel")
+    parser.add_argument("filters", nargs="*", help="Only run suites whose name starts with one of these")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="Parallel suites")
+    parser.add_argument("--shard", help="Run shard I of N, e.g. 2/4")
+    parser.add_argument("--no-cache", action="store_true", help="Run suites even if unchanged")
+    parser.add_argument("--slow", type=float, default=1.0, help="Flag tests slower than this (seconds)")
+    parser.add_argument("--regression", type=float, default=2.0, help="Flag tests this much slower than usual")
+    parser.add_argument("--list", action="store_true", help="List the discovered suites and exit")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Print the output of failed suites")
+    args = parser.parse_args(argv)
+
+    suites = discover_suites()
+    if args.filters:
+        suites = [s for s in suites if any(s.name.startswith(f.rstrip("/")) for f in args.filters)]
+    history: Dict[str, List[float]] = _load(HISTORY_FILE)
+    if args.shard:
+        suites = select_shard(suites, args.shard, history)
+    if args.list:
+        for suite in suites:
+            print(f"{suite.name:<40} {' '.join(suite.args)}")
+        return 0
+
+    cached_results = _load(RESULTS_FILE)
+    hashes = {suite.name: source_hash(suite) for suite in suites}
+    to_run = []
+    results: List[SuiteResult] = []
+    for suite in suites:
+        cached = cached_results.get(suite.name)
+        if not args.no_cache and cached and cached["hash"] == hashes[suite.name] and cached["status"] == "passed":
+            results.append(SuiteResult(suite, "cached", cached["duration"]))
+        else:
+            to_run.append(suite)
+
+    start = time.perf_counter()
+    # Longest suites first so they do not end up alone at the tail
+    to_run.sort(key=lambda s: -cached_results.get(s.name, {}).get("duration", 0))
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+        results.extend(pool.map(run_suite, to_run))
+    wall = time.perf_counter() - start
+
+    flagged = flag_slow_tests(results, history, args.slow, args.regression)
+    for result in results:
+        if result.status == "cached":
+            continue
+        cached_results[result.suite.name] = {
+            "hash": hashes[result.suite.name],
+            "status": result.status,
+            "duration": round(result.duration, 3),
+        }
+        for test_id, duration in result.tests.items():
+            key = f"{result.suite.name}|{test_id}"
+            history[key] = (history.get(key, []) + [round(duration, 4)])[-HISTORY_LENGTH:]
+    _save(RESULTS_FILE, cached_results)
+    _save(HISTORY_FILE, history)
+    _save(REPORT_FILE, {
+        "wall_time": round(wall, 3),
+        "suites": {
+            r.suite.name: {"status": r.status, "duration": round(r.duration, 3), "tests": len(r.tests),
+                           "failures": r.failures}
+            for r in results
+        },
+        "slow_tests": flagged,
+    })
+
+    results.sort(key=lambda r: r.suite.name)
+    print(f"{'suite':<40} {'status':<8} {'tests':>6} {'time':>8}")
+    for result in results:
+        tests = len(result.tests) if result.status != "cached" else "-"
+        print(f"{result.suite.name:<40} {result.status:<8} {tests:>6} {result.duration:>7.2f}s")
+    serial = sum(r.duration for r in results if r.status != "cached")
+    print(f"\nWall time {wall:.2f}s for {serial:.2f}s of suite time across {len(to_run)} suite(s)")
+
+    if flagged:
+        print("\nSlow tests:")
+        for item in flagged[:20]:
+            print(f"  {item['duration']:>8.3f}s  {item['test']}  ({', '.join(item['reasons'])})")
+
+    failed = [r for r in results if r.status == "failed"]
+    for result in failed:
+        print(f"\nFAILED {result.suite.name}")
+        for test_id in result.failures:
+            print(f"  {test_id}")
+        if args.verbose or not result.failures:
+            print(result.output[-4000:])
+    print(f"\nFull report: {os.path.relpath(REPORT_FILE)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -25,7 +25,7 @@ async def health_check():
     return {"status": "UP", "timestamp": time.time()}
 
 @router.get("/products/", response_model=List[ProductResponse])
-@measure_execution_time
+@measure_execution_time(name="GET /api/products/")
 async def get_products(
     skip: int = Query(0, ge=0, description="Skip the first N items"),
     limit: int = Query(100, ge=1, le=100, description="Limit the number of items returned"),
@@ -36,7 +36,7 @@ async def get_products(
     Retrieve all products with pagination and optional filtering.
     """
     try:
-        logger.info(f"Retrieving products (skip={skip}, limit={limit}, category={category})")
+        logger.info("Retrieving products (skip=%s, limit=%s, category=%s)", skip, limit, category)
         
         query = "SELECT id, name, price, category FROM products"
         params = []
@@ -61,24 +61,24 @@ async def get_products(
             for row in rows
         ]
         
-        logger.debug(f"Retrieved {len(products)} products")
+        logger.debug("Retrieved %d products", len(products))
         return products
     
     except Exception as e:
-        logger.error(f"Error retrieving products: {str(e)}")
+        logger.error("Error retrieving products: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Failed to retrieve products"
         )
 
 @router.get("/products/{product_id}", response_model=ProductResponse)
-@measure_execution_time
+@measure_execution_time(name="GET /api/products/{product_id}")
 async def get_product(product_id: int, db=Depends(get_db)):
     """
     Retrieve a product by its ID.
     """
     try:
-        logger.info(f"Retrieving product with ID {product_id}")
+        logger.info("Retrieving product with ID %s", product_id)
         
         cursor = db.execute(
             "SELECT id, name, price, category FROM products WHERE id = ?",
@@ -87,7 +87,7 @@ async def get_product(product_id: int, db=Depends(get_db)):
         row = cursor.fetchone()
         
         if not row:
-            logger.warning(f"Product with ID {product_id} not found")
+            logger.warning("Product with ID %s not found", product_id)
             raise HTTPException(
                 status_code=404,
                 detail=f"Product with ID {product_id} not found"
@@ -100,26 +100,26 @@ async def get_product(product_id: int, db=Depends(get_db)):
             category=row[3]
         )
         
-        logger.debug(f"Retrieved product: {product}")
+        logger.debug("Retrieved product: %s", product)
         return product
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving product {product_id}: {str(e)}")
+        logger.error("Error retrieving product %s: %s", product_id, e)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve product with ID {product_id}"
         )
 
 @router.post("/products/", response_model=ProductResponse, status_code=201)
-@measure_execution_time
+@measure_execution_time(name="POST /api/products/")
 async def create_product(product: ProductCreate, db=Depends(get_db)):
     """
     Create a new product.
     """
     try:
-        logger.info(f"Creating new product: {product.name}")
+        logger.info("Creating new product: %s", product.name)
         
         cursor = db.execute(
             "INSERT INTO products (name, price, category) VALUES (?, ?, ?)",
@@ -136,12 +136,12 @@ async def create_product(product: ProductCreate, db=Depends(get_db)):
             category=product.category
         )
         
-        logger.info(f"Created product with ID {product_id}")
+        logger.info("Created product with ID %s", product_id)
         return new_product
     
     except Exception as e:
         db.rollback()
-        logger.error(f"Error creating product: {str(e)}")
+        logger.error("Error creating product: %s", e)
         raise HTTPException(
             status_code=500,
             detail="Failed to create product"
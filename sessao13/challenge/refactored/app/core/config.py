@@ -26,6 +26,14 @@ class Settings(BaseSettings):
     LOG_LEVEL: str = "INFO"
     LOG_FILE: str = "app.log"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_JSON: bool = False
+    LOG_MAX_BYTES: int = 10485760
+    LOG_ROTATE_WHEN: str = "midnight"
+    LOG_BACKUP_COUNT: int = 5
+    LOG_COMPRESSION: str = "gzip"
+    
+
+    METRICS_SAMPLE_RATE: float = 1.0
     
 
     ENVIRONMENT: str = "development"
@@ -0,0 +1,178 @@
+"""
+Size-or-time rotating file handler with background compression.
+"""
+
+import glob
+import gzip
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+import traceback
+from datetime import datetime, timedelta
+from logging.handlers import BaseRotatingHandler
+from typing import List, Optional
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+GZIP = "gzip"
+ZSTD = "zstd"
+
+_INTERVALS = {"S": 1, "M": 60, "H": 3600, "D": 86400}
+
+
+def compress_file(path: str, compression: str = GZIP) -> str:
+    """Compress `path` next to itself and remove the original; returns the new path."""
+    if compression == ZSTD and zstandard is not None:
+        target = path + ".zst"
+        with open(path, "rb") as src, open(target + ".tmp", "wb") as dst:
+            zstandard.ZstdCompressor().copy_stream(src, dst)
+    else:
+        target = path + ".gz"
+        with open(path, "rb") as src, gzip.open(target + ".tmp", "wb") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+    os.replace(target + ".tmp", target)
+    os.remove(path)
+    return target
+
+
+class CompressingRotatingFileHandler(BaseRotatingHandler):
+    """
+    Rotate on size OR time, compress rotated segments in the background.
+
+    On rollover the active file is only renamed to a timestamped segment and
+    reopened, so emitting threads are blocked for a rename, not for the
+    compression. A background thread then compresses the segment (zstd when
+    the `zstandard` package is installed, gzip otherwise) and deletes all
+    but the `backup_count` most recent segments.
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes: int = 10 * 1024 * 1024,
+        when: Optional[str] = "midnight",
+        interval: int = 1,
+        backup_count: int = 5,
+        compression: str = GZIP,
+        encoding: str = "utf-8",
+        delay: bool = False,
+    ):
+        """
+        Args:
+            filename: Path of the active log file
+            max_bytes: Rotate once the file has reached this size (0 disables)
+            when: "S", "M", "H", "D" or "midnight" (None disables time rotation)
+            interval: Number of `when` units between time-based rotations
+            backup_count: Number of rotated segments to keep
+            compression: "gzip" or "zstd"
+        """
+        super().__init__(filename, "a", encoding=encoding, delay=delay)
+        self.max_bytes = max_bytes
+        self.when = when.upper() if when else None
+        self.interval = interval
+        self.backup_count = backup_count
+        self.compression = compression
+        self.rollover_at = self._next_rollover(time.time())
+        self._segment_re = re.compile(
+            re.escape(os.path.basename(self.baseFilename)) + r"\.(\d{8}-\d{6})(?:-(\d+))?(?:\.gz|\.zst)?$"
+        )
+        self._last_stamp = None
+        self._sequence = 0
+        self._jobs = queue.Queue()
+        self._worker = threading.Thread(target=self._compress_loop, name="log-compressor", daemon=True)
+        self._worker.start()
+
+    def _next_rollover(self, now: float) -> Optional[float]:
+        if self.when is None:
+            return None
+        if self.when == "MIDNIGHT":
+            midnight = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0)
+            return (midnight + timedelta(days=self.interval)).timestamp()
+        return now + _INTERVALS[self.when] * self.interval
+
+    def shouldRollover(self, record):
+        if self.rollover_at is not None and record.created >= self.rollover_at:
+            return True
+        if self.max_bytes > 0:
+            # Checking the current size instead of formatting the record
+            # twice: a segment may overshoot `max_bytes` by one record (or
+            # one batch when driven by the queue listener)
+            if self.stream is None:
+                self.stream = self._open()
+            if self.stream.tell() >= self.max_bytes:
+                return True
+        return False
+
+    def _segment_name(self) -> str:
+        # A per-handler sequence keeps names ordered when several rotations
+        # happen within a second, even after older segments were pruned
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._sequence = self._sequence + 1 if stamp == self._last_stamp else 0
+        self._last_stamp = stamp
+        while True:
+            name = f"{self.baseFilename}.{stamp}" + (f"-{self._sequence}" if self._sequence else "")
+            if not any(os.path.exists(name + ext) for ext in ("", ".gz", ".zst")):
+                return name
+            self._sequence += 1
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            segment = self._segment_name()
+            os.rename(self.baseFilename, segment)
+            self._jobs.put(segment)
+        if not self.delay:
+            self.stream = self._open()
+        self.rollover_at = self._next_rollover(time.time())
+
+    def _compress_loop(self):
+        while True:
+            segment = self._jobs.get()
+            try:
+                if segment is None:
+                    return
+                if os.path.exists(segment):
+                    compress_file(segment, self.compression)
+                self._prune()
+            except Exception:
+                traceback.print_exc()
+            finally:
+                self._jobs.task_done()
+
+    def segments(self) -> List[str]:
+        """Rotated segments, newest first."""
+        paths = [
+            path for path in glob.glob(glob.escape(self.baseFilename) + ".*")
+            if self._segment_re.match(os.path.basename(path))
+        ]
+        # Names embed the rotation time, so lexical order is age order
+        return sorted(paths, key=self._segment_key, reverse=True)
+
+    def _segment_key(self, path):
+        match = self._segment_re.match(os.path.basename(path))
+        return match.group(1), int(match.group(2) or 0)
+
+    def _prune(self):
+        for path in self.segments()[self.backup_count:]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def wait_for_compression(self):
+        """Block until every queued segment has been compressed."""
+        self._jobs.join()
+
+    def close(self):
+        super().close()
+        if self._worker.is_alive():
+            self._jobs.put(None)
+            self._worker.join()
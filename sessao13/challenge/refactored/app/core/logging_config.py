@@ -3,12 +3,13 @@ Logging configuration.
 """
 
 import logging
-import logging.handlers
 import os
 import sys
 from pathlib import Path
 
 from app.core.config import settings
+from app.core.log_rotation import CompressingRotatingFileHandler
+from app.core.structured_logging import BoundLogger, CachedTimeFormatter, JsonFormatter
 
 def setup_logging():
     """Configure and set up logging for the application."""
@@ -25,7 +26,8 @@ def setup_logging():
         root_logger.handlers.clear()
     
 
-    formatter = logging.Formatter(settings.LOG_FORMAT)
+    formatter = CachedTimeFormatter(settings.LOG_FORMAT)
+    file_formatter = JsonFormatter() if settings.LOG_JSON else formatter
     
 
     console_handler = logging.StreamHandler(stream=sys.stdout)
@@ -33,18 +35,22 @@ def setup_logging():
     root_logger.addHandler(console_handler)
     
 
-    file_handler = logging.handlers.RotatingFileHandler(
+    file_handler = CompressingRotatingFileHandler(
         log_dir / settings.LOG_FILE,
-        maxBytes=10485760,  
-        backupCount=5,
+        max_bytes=settings.LOG_MAX_BYTES,
+        when=settings.LOG_ROTATE_WHEN or None,
+        backup_count=settings.LOG_BACKUP_COUNT,
+        compression=settings.LOG_COMPRESSION,
     )
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(file_formatter)
     root_logger.addHandler(file_handler)
     
 
     logger = logging.getLogger(__name__)
     logger.info(
-        f"Logging configured with level {settings.LOG_LEVEL} in {settings.ENVIRONMENT} environment"
+        "Logging configured with level %s in %s environment",
+        settings.LOG_LEVEL,
+        settings.ENVIRONMENT,
     )
     
     return logger
@@ -52,3 +58,8 @@ def setup_logging():
 def get_logger(name: str) -> logging.Logger:
     """Get a logger instance with the specified name."""
     return logging.getLogger(name)
+
+
+def get_bound_logger(name: str, **fields) -> BoundLogger:
+    """Get a logger that adds `fields` to every record it emits."""
+    return BoundLogger(logging.getLogger(name), fields)
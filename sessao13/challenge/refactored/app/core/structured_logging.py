@@ -0,0 +1,132 @@
+"""
+Structured logging: JSON formatter, cached timestamps and context binding.
+"""
+
+import contextlib
+import contextvars
+import json
+import logging
+import time
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("log_context", default={})
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRS = frozenset(vars(logging.makeLogRecord({}))) | {"message", "asctime", "context"}
+
+
+def _dumps_stdlib(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, separators=(",", ":"), default=str, ensure_ascii=False)
+
+
+def _dumps_orjson(payload: Dict[str, Any]) -> str:
+    return orjson.dumps(payload, default=str).decode()
+
+
+dumps = _dumps_orjson if orjson is not None else _dumps_stdlib
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders `asctime` at most once per second.
+
+    `time.strftime` dominates the cost of the stock formatter; records logged
+    within the same second reuse the cached prefix and only the milliseconds
+    are appended.
+    """
+
+    default_msec_format = "%s,%03d"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._cached_second: Optional[int] = None
+        self._cached_prefix = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_prefix = time.strftime(datefmt or self.default_time_format, self.converter(second))
+            self._cached_second = second
+        if datefmt:
+            return self._cached_prefix
+        return self.default_msec_format % (self._cached_prefix, record.msecs)
+
+
+class JsonFormatter(CachedTimeFormatter):
+    """
+    Render each record as one JSON object per line.
+
+    The message is built lazily from the record's args, so `%`-style calls
+    cost nothing when the level is disabled. Bound context, request-scoped
+    context and `extra` fields are merged into the object.
+    """
+
+    default_msec_format = "%s.%03d"
+
+    def __init__(self, datefmt: str = "%Y-%m-%dT%H:%M:%S", static_fields: Optional[Dict[str, Any]] = None):
+        super().__init__(datefmt=None)
+        self.json_datefmt = datefmt
+        self.static_fields = dict(static_fields or {})
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "timestamp": self.default_msec_format % (self.formatTime(record, self.json_datefmt), record.msecs),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if self.static_fields:
+            payload.update(self.static_fields)
+        context = _context.get()
+        if context:
+            payload.update(context)
+        bound = getattr(record, "context", None)
+        if bound:
+            payload.update(bound)
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                payload[key] = value
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return dumps(payload)
+
+
+class BoundLogger(logging.LoggerAdapter):
+    """
+    Logger adapter carrying key-value context.
+
+    `bind()` returns a new adapter with extra fields; the fields end up in
+    the JSON output of every record logged through it.
+    """
+
+    def __init__(self, logger: logging.Logger, context: Optional[Dict[str, Any]] = None):
+        super().__init__(logger, context or {})
+
+    def bind(self, **fields: Any) -> "BoundLogger":
+        return BoundLogger(self.logger, {**self.extra, **fields})
+
+    def process(self, msg, kwargs):
+        if self.extra:
+            # Build new dicts: the caller may reuse the `extra` it passed
+            extra = kwargs.get("extra") or {}
+            kwargs["extra"] = {**extra, "context": {**self.extra, **extra.get("context", {})}}
+        return msg, kwargs
+
+
+@contextlib.contextmanager
+def log_context(**fields: Any) -> Iterator[None]:
+    """Add fields to every record logged in the current context (e.g. a request)."""
+    token = _context.set({**_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _context.reset(token)
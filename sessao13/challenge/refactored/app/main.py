@@ -2,15 +2,17 @@
 Main module for the FastAPI application.
 """
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.api.routes import router as api_router
 from app.core.config import settings
 from app.core.logging_config import setup_logging
 from app.db.database import init_db
+from app.utils.performance import registry
 
 
 logger = setup_logging()
@@ -45,6 +47,13 @@ def create_application() -> FastAPI:
 
     application.include_router(api_router, prefix="/api")
     
+    @application.get("/metrics", include_in_schema=False)
+    async def metrics(format: str = Query("json", pattern="^(json|prometheus)$")):
+        """Per-route latency percentiles (milliseconds) from the timing decorator."""
+        if format == "prometheus":
+            return PlainTextResponse(registry.to_prometheus())
+        return registry.snapshot()
+    
     @application.on_event("startup")
     async def startup_event():
         """Actions to perform on application startup."""
@@ -2,36 +2,220 @@
 Performance utilities for the application.
 """
 
-import time
 import functools
-from typing import Callable
+import inspect
+import random
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from app.core.config import settings
+
+# Log-linear buckets: each power of two is split into 2**SUB_BUCKET_BITS
+# linear sub-buckets, so a recorded value is off by at most 1/16 (6.25%)
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+BUCKET_COUNT = 64 * SUB_BUCKETS
+# Each per-thread array carries the total of its recorded values after the buckets
+TOTAL_SLOT = BUCKET_COUNT
+
 
-from app.core.logging_config import get_logger
+def bucket_index(value: int) -> int:
+    """Map a non-negative integer to its log-linear bucket."""
+    if value < SUB_BUCKETS:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKETS + (value >> shift) - SUB_BUCKETS
 
-logger = get_logger(__name__)
 
-def measure_execution_time(func: Callable) -> Callable:
+def bucket_bounds(index: int) -> tuple:
+    """Return the [lower, upper) range of values mapped to a bucket."""
+    if index < SUB_BUCKETS:
+        return index, index + 1
+    shift = index // SUB_BUCKETS - 1
+    mantissa = index % SUB_BUCKETS + SUB_BUCKETS
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class LatencyHistogram:
     """
-    Decorator to measure and log the execution time of a function.
-    
+    HDR-style latency histogram in nanoseconds.
+
+    Recording never takes a lock: every thread increments its own array of
+    bucket counts and running total, and readers merge the per-thread
+    arrays. Percentiles are reported as bucket midpoints.
+    """
+
+    def __init__(self, name: str, sample_rate: float = 1.0):
+        self.name = name
+        self.sample_rate = sample_rate
+        self._local = threading.local()
+        self._shards: List[List[int]] = []
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> List[int]:
+        shard = [0] * (BUCKET_COUNT + 1)
+        # Only taken the first time a thread records into this histogram
+        with self._shards_lock:
+            self._shards.append(shard)
+        self._local.counts = shard
+        return shard
+
+    def record(self, value_ns: int) -> None:
+        counts = getattr(self._local, "counts", None)
+        if counts is None:
+            counts = self._shard()
+        counts[bucket_index(value_ns)] += 1
+        counts[TOTAL_SLOT] += value_ns
+
+    def _merged(self) -> List[int]:
+        with self._shards_lock:
+            shards = list(self._shards)
+        return [sum(column) for column in zip(*shards)] if shards else [0] * (BUCKET_COUNT + 1)
+
+    def counts(self) -> List[int]:
+        return self._merged()[:BUCKET_COUNT]
+
+    def reset(self) -> None:
+        with self._shards_lock:
+            for shard in self._shards:
+                shard[:] = [0] * (BUCKET_COUNT + 1)
+
+    def summary(self, quantiles=(0.5, 0.95, 0.99)) -> Dict[str, float]:
+        """
+        Summarise the recorded latencies.
+
+        Returns:
+            Sampled count and sum, estimated total calls, the requested
+            percentiles and the maximum, all latencies in milliseconds.
+        """
+        merged = self._merged()
+        counts = merged[:BUCKET_COUNT]
+        total = sum(counts)
+        result: Dict[str, float] = {
+            "count": total,
+            "sum": merged[TOTAL_SLOT] / 1e6,
+            "estimated_calls": round(total / self.sample_rate) if self.sample_rate else 0,
+            "sample_rate": self.sample_rate,
+        }
+        targets = sorted(quantiles)
+        seen = 0
+        position = 0
+        for index, count in enumerate(counts):
+            if not count:
+                continue
+            seen += count
+            while position < len(targets) and seen >= targets[position] * total:
+                lower, upper = bucket_bounds(index)
+                result[f"p{targets[position] * 100:g}"] = (lower + upper) / 2 / 1e6
+                position += 1
+            result["max"] = bucket_bounds(index)[1] / 1e6
+        for quantile in targets[position:]:
+            result[f"p{quantile * 100:g}"] = 0.0
+        result.setdefault("max", 0.0)
+        return result
+
+
+class MetricsRegistry:
+    """Named latency histograms, one per route."""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, sample_rate: float = 1.0) -> LatencyHistogram:
+        histogram = self._histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(name, LatencyHistogram(name, sample_rate))
+        return histogram
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: histogram.summary() for name, histogram in sorted(self._histograms.items())}
+
+    def to_prometheus(self, metric: str = "route_latency_seconds") -> str:
+        """
+        Render the histograms as a Prometheus summary in seconds.
+
+        Quantiles come from the sampled calls; `_count` and `_sum` are scaled
+        up by the sample rate so rate() reflects every call.
+        """
+        lines = [
+            f"# HELP {metric} Route latency in seconds",
+            f"# TYPE {metric} summary",
+        ]
+        for name, summary in self.snapshot().items():
+            for quantile in ("0.5", "0.95", "0.99"):
+                value = summary[f"p{float(quantile) * 100:g}"] / 1e3
+                lines.append(f'{metric}{{route="{name}",quantile="{quantile}"}} {value:.9f}')
+            rate = summary["sample_rate"]
+            total = summary["sum"] / 1e3 / rate if rate else 0.0
+            lines.append(f'{metric}_sum{{route="{name}"}} {total:.9f}')
+            lines.append(f'{metric}_count{{route="{name}"}} {summary["estimated_calls"]}')
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Zero every histogram; decorated functions keep their reference."""
+        for histogram in list(self._histograms.values()):
+            histogram.reset()
+
+
+registry = MetricsRegistry()
+
+
+def measure_execution_time(
+    func: Optional[Callable] = None,
+    *,
+    name: Optional[str] = None,
+    sample_rate: Optional[float] = None,
+) -> Callable:
+    """
+    Decorator recording the execution time of a sync or async function.
+
+    Timings go into the route's histogram in `registry`. Only a
+    `sample_rate` fraction of calls is timed; the others run with one
+    random draw of overhead.
+
     Args:
         func: The function to measure.
-        
+        name: Histogram name, defaults to the function name.
+        sample_rate: Fraction of calls to time, defaults to
+            settings.METRICS_SAMPLE_RATE.
+
     Returns:
-        A wrapped function that logs execution time.
+        A wrapped function that records its execution time.
     """
-    @functools.wraps(func)
-    async def wrapper(*args, **kwargs):
+    if func is None:
+        return functools.partial(measure_execution_time, name=name, sample_rate=sample_rate)
 
-        start_time = time.time()
-        
+    rate = settings.METRICS_SAMPLE_RATE if sample_rate is None else sample_rate
+    histogram = registry.histogram(name or func.__name__, rate)
+    record = histogram.record
+    perf_counter_ns = time.perf_counter_ns
+    draw = random.random
+    always = rate >= 1.0
 
-        result = await func(*args, **kwargs)
-        
+    if inspect.iscoroutinefunction(func):
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not always and draw() >= rate:
+                return await func(*args, **kwargs)
+            start = perf_counter_ns()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                record(perf_counter_ns() - start)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not always and draw() >= rate:
+            return func(*args, **kwargs)
+        start = perf_counter_ns()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record(perf_counter_ns() - start)
 
-        execution_time = time.time() - start_time
-        logger.debug(f"Function {func.__name__} executed in {execution_time:.4f} seconds")
-        
-        return result
-    
     return wrapper
@@ -0,0 +1,85 @@
+"""
+Benchmark for the structured logging helpers.
+
+1. Disabled level: cost of an f-string call vs. a deferred `%`-args call.
+2. Formatting throughput: stock Formatter vs. CachedTimeFormatter vs.
+   JsonFormatter with orjson and with the stdlib json fallback.
+
+Run with: python benchmark_logging.py
+"""
+
+import logging
+import time
+
+from app.core import structured_logging
+from app.core.config import settings
+from app.core.structured_logging import BoundLogger, CachedTimeFormatter, JsonFormatter
+
+CALLS = 1_000_000
+RECORDS = 200_000
+
+
+def bench(label, fn, count):
+    start = time.perf_counter()
+    fn(count)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {count / elapsed:>12,.0f} ops/s  {elapsed / count * 1e9:8.0f} ns/op")
+
+
+def disabled_calls():
+    logger = logging.getLogger("bench.disabled")
+    logger.setLevel(logging.WARNING)
+    bound = BoundLogger(logger).bind(component="api")
+    skip, limit, category = 10, 100, "books"
+
+    def fstring(n):
+        for _ in range(n):
+            logger.info(f"Retrieving products (skip={skip}, limit={limit}, category={category})")
+
+    def deferred(n):
+        for _ in range(n):
+            logger.info("Retrieving products (skip=%s, limit=%s, category=%s)", skip, limit, category)
+
+    def deferred_bound(n):
+        for _ in range(n):
+            bound.info("Retrieving products (skip=%s, limit=%s, category=%s)", skip, limit, category)
+
+    print(f"Disabled INFO calls ({CALLS:,} each)")
+    bench("f-string", fstring, CALLS)
+    bench("%-args", deferred, CALLS)
+    bench("%-args via BoundLogger", deferred_bound, CALLS)
+
+
+def formatting():
+    records = [
+        logging.LogRecord(
+            "app.api.routes", logging.INFO, __file__, 1,
+            "Retrieving products (skip=%s, limit=%s, category=%s)", (i, 100, "books"), None,
+        )
+        for i in range(RECORDS)
+    ]
+
+    def run(formatter):
+        def inner(n):
+            fmt = formatter.format
+            for record in records[:n]:
+                fmt(record)
+        return inner
+
+    print(f"\nFormatting ({RECORDS:,} records, orjson {'available' if structured_logging.orjson else 'missing'})")
+    bench("logging.Formatter", run(logging.Formatter(settings.LOG_FORMAT)), RECORDS)
+    bench("CachedTimeFormatter", run(CachedTimeFormatter(settings.LOG_FORMAT)), RECORDS)
+    bench("JsonFormatter (default dumps)", run(JsonFormatter()), RECORDS)
+
+    structured_logging.dumps = structured_logging._dumps_stdlib
+    try:
+        bench("JsonFormatter (stdlib json)", run(JsonFormatter()), RECORDS)
+    finally:
+        structured_logging.dumps = (
+            structured_logging._dumps_orjson if structured_logging.orjson else structured_logging._dumps_stdlib
+        )
+
+
+if __name__ == "__main__":
+    disabled_calls()
+    formatting()
@@ -0,0 +1,26 @@
+"""
+Tests for the compressing rotating file handler.
+"""
+import gzip
+import logging
+
+from app.core.log_rotation import CompressingRotatingFileHandler
+
+
+def test_rotated_segments_are_compressed_and_pruned(tmp_path):
+    handler = CompressingRotatingFileHandler(tmp_path / "app.log", max_bytes=200, when=None, backup_count=2)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    try:
+        for i in range(50):
+            handler.handle(logging.makeLogRecord({"msg": "record %04d %s" % (i, "x" * 20)}))
+        handler.wait_for_compression()
+        segments = handler.segments()
+    finally:
+        handler.close()
+
+    assert len(segments) == 2
+    assert all(path.endswith(".gz") for path in segments)
+    with gzip.open(segments[0], "rt") as f:
+        newest = f.read().splitlines()
+    current = (tmp_path / "app.log").read_text().splitlines()
+    assert int(newest[-1].split()[1]) + 1 == int(current[0].split()[1])
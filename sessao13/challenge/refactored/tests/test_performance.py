@@ -0,0 +1,124 @@
+"""
+Tests for the timing decorator and latency histograms.
+"""
+import asyncio
+import random
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils.performance import (
+    LatencyHistogram,
+    bucket_bounds,
+    bucket_index,
+    measure_execution_time,
+    registry,
+)
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+    yield
+    registry.reset()
+
+
+def test_buckets_bound_the_relative_error():
+    for value in [0, 1, 15, 16, 17, 1000, 123_456, 10**9, 3 * 10**12]:
+        lower, upper = bucket_bounds(bucket_index(value))
+        assert lower <= value < upper
+        assert (upper - lower) / max(lower, 1) <= 1 / 16 or upper - lower == 1
+
+
+def test_percentiles_match_the_recorded_distribution():
+    histogram = LatencyHistogram("test")
+    values = [random.randint(1_000, 1_000_000) for _ in range(10_000)]
+    for value in values:
+        histogram.record(value)
+
+    summary = histogram.summary()
+    ordered = sorted(values)
+    assert summary["count"] == 10_000
+    assert summary["sum"] == pytest.approx(sum(values) / 1e6)
+    for quantile, key in [(0.5, "p50"), (0.95, "p95"), (0.99, "p99")]:
+        expected = ordered[int(quantile * len(ordered)) - 1] / 1e6
+        assert summary[key] == pytest.approx(expected, rel=0.07)
+
+
+def test_records_from_several_threads_are_merged():
+    histogram = LatencyHistogram("threads")
+
+    def work():
+        for _ in range(1000):
+            histogram.record(5000)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert histogram.summary()["count"] == 8000
+
+
+def test_decorator_handles_sync_and_async_functions():
+    @measure_execution_time(name="sync")
+    def sync_work(x):
+        time.sleep(0.002)
+        return x * 2
+
+    @measure_execution_time
+    async def async_work(x):
+        await asyncio.sleep(0.002)
+        return x + 1
+
+    assert sync_work(2) == 4
+    assert asyncio.run(async_work(2)) == 3
+
+    snapshot = registry.snapshot()
+    assert snapshot["sync"]["count"] == 1
+    assert snapshot["async_work"]["count"] == 1
+    assert snapshot["async_work"]["p50"] >= 1.5
+
+
+def test_sampling_times_a_fraction_of_calls():
+    @measure_execution_time(name="sampled", sample_rate=0.1)
+    def work():
+        pass
+
+    for _ in range(10_000):
+        work()
+
+    summary = registry.snapshot()["sampled"]
+    assert 700 < summary["count"] < 1300
+    assert summary["estimated_calls"] == round(summary["count"] / 0.1)
+
+
+def test_metrics_endpoint():
+    @measure_execution_time(name="GET /example")
+    def handler():
+        pass
+
+    handler()
+    client = TestClient(app, base_url="http://localhost")
+
+    body = client.get("/metrics").json()
+    assert set(body["GET /example"]) >= {"count", "p50", "p95", "p99"}
+
+    text = client.get("/metrics", params={"format": "prometheus"}).text
+    assert 'route_latency_seconds_count{route="GET /example"} 1' in text
+    assert 'route_latency_seconds_sum{route="GET /example"} ' in text
+
+
+def test_prometheus_export_is_in_seconds_and_scaled_by_the_sample_rate():
+    histogram = registry.histogram("GET /sampled", sample_rate=0.25)
+    for _ in range(10):
+        histogram.record(2_000_000)
+
+    lines = dict(line.rsplit(" ", 1) for line in registry.to_prometheus().splitlines() if line[0] != "#")
+    assert float(lines['route_latency_seconds{route="GET /sampled",quantile="0.5"}']) == pytest.approx(0.002, rel=0.07)
+    assert float(lines['route_latency_seconds_sum{route="GET /sampled"}']) == pytest.approx(0.08)
+    assert lines['route_latency_seconds_count{route="GET /sampled"}'] == "40"
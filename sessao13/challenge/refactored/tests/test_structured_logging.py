@@ -0,0 +1,101 @@
+"""
+Tests for the structured logging helpers.
+"""
+import json
+import logging
+
+import pytest
+
+from app.core.structured_logging import (
+    BoundLogger,
+    CachedTimeFormatter,
+    JsonFormatter,
+    log_context,
+)
+
+
+@pytest.fixture
+def capture():
+    """Attach a JSON-formatting handler collecting output lines."""
+    lines = []
+
+    class ListHandler(logging.Handler):
+        def emit(self, record):
+            lines.append(self.format(record))
+
+    handler = ListHandler()
+    handler.setFormatter(JsonFormatter())
+    logger = logging.getLogger("tests.structured")
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    logger.addHandler(handler)
+    yield logger, lines
+    logger.removeHandler(handler)
+
+
+def test_json_output_with_deferred_args(capture):
+    logger, lines = capture
+    logger.info("Retrieved %d products", 3, extra={"route": "/products/"})
+
+    payload = json.loads(lines[0])
+    assert payload["message"] == "Retrieved 3 products"
+    assert payload["level"] == "INFO"
+    assert payload["logger"] == "tests.structured"
+    assert payload["route"] == "/products/"
+    assert len(payload["timestamp"]) == len("2024-01-01T00:00:00.000")
+
+
+def test_bound_and_request_context(capture):
+    logger, lines = capture
+    bound = BoundLogger(logger).bind(component="api").bind(version=2)
+
+    with log_context(request_id="abc"):
+        bound.warning("Product %s not found", 42)
+    bound.info("outside")
+
+    first, second = (json.loads(line) for line in lines)
+    assert first["component"] == "api" and first["version"] == 2
+    assert first["request_id"] == "abc"
+    assert "request_id" not in second
+
+
+def test_bound_fields_do_not_leak_into_reused_extra(capture):
+    logger, lines = capture
+    bound = BoundLogger(logger).bind(component="api")
+    extra = {"route": "/products/", "context": {"user": 7}}
+
+    bound.info("bound", extra=extra)
+    logger.info("plain", extra=extra)
+
+    assert extra == {"route": "/products/", "context": {"user": 7}}
+    first, second = (json.loads(line) for line in lines)
+    assert first["component"] == "api" and first["user"] == 7
+    assert "component" not in second and second["user"] == 7
+
+
+def test_exception_is_included(capture):
+    logger, lines = capture
+    try:
+        raise ValueError("bad price")
+    except ValueError:
+        logger.exception("Error creating product")
+
+    assert "ValueError: bad price" in json.loads(lines[0])["exc_info"]
+
+
+def test_disabled_level_does_not_render_args(capture):
+    logger, lines = capture
+    logger.setLevel(logging.WARNING)
+
+    class Exploding:
+        def __str__(self):
+            raise AssertionError("message was rendered")
+
+    logger.info("value %s", Exploding())
+    assert lines == []
+
+
+def test_cached_time_formatter_matches_stock_formatter():
+    fmt = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    record = logging.LogRecord("app", logging.INFO, __file__, 1, "hello %s", ("world",), None)
+    assert CachedTimeFormatter(fmt).format(record) == logging.Formatter(fmt).format(record)
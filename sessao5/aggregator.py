@@ -0,0 +1,104 @@
+import asyncio
+import time
+
+
+FRESH = 'fresh'
+STALE = 'stale'
+MISSING = 'missing'
+
+
+class FanOutAggregator:
+    """
+    Fan-out to several async sources with per-source deadlines and caching
+
+    Each source is a zero-argument coroutine function. For every call:
+        - a cached value younger than `ttl` is returned as `fresh`
+        - an older value (up to `stale_ttl`) is returned immediately as
+          `stale` while a background refresh updates the cache
+        - otherwise the source is awaited for at most `deadline` seconds;
+          if it misses the deadline the result is `missing` and the fetch
+          keeps running to warm the cache for the next request
+
+    Concurrent calls for the same source share one in-flight fetch
+    (request coalescing), so a burst of requests costs one upstream call.
+    """
+
+    def __init__(self, sources, deadline=0.8, ttl=2.0, stale_ttl=30.0, deadlines=None):
+        """
+        Args:
+            sources: Mapping of source name to coroutine function
+            deadline: Default per-source deadline in seconds
+            ttl: Seconds a cached value is considered fresh
+            stale_ttl: Seconds a cached value may still be served as stale
+            deadlines: Optional per-source deadline overrides
+        """
+        self.sources = dict(sources)
+        self.deadline = deadline
+        self.deadlines = dict(deadlines or {})
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.cache = {}
+        self.inflight = {}
+        self.stats = {
+            'fresh': 0,
+            'stale': 0,
+            'missing': 0,
+            'upstream_calls': 0,
+            'coalesced': 0,
+        }
+
+    def _start_fetch(self, name):
+        """Return the in-flight fetch for `name`, starting one if needed"""
+        task = self.inflight.get(name)
+        if task is not None:
+            self.stats['coalesced'] += 1
+            return task
+
+        async def run():
+            try:
+                self.stats['upstream_calls'] += 1
+                value = await self.sources[name]()
+                self.cache[name] = (time.monotonic(), value)
+                return value
+            finally:
+                self.inflight.pop(name, None)
+
+        task = asyncio.ensure_future(run())
+        # Retrieve the exception so abandoned background fetches don't warn
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self.inflight[name] = task
+        return task
+
+    async def get(self, name):
+        """
+        Get a single source
+
+        Returns:
+            Dictionary with `data` (None when missing) and `state`
+        """
+        entry = self.cache.get(name)
+        if entry is not None:
+            age = time.monotonic() - entry[0]
+            if age < self.ttl:
+                self.stats[FRESH] += 1
+                return {'data': entry[1], 'state': FRESH}
+            if age < self.stale_ttl:
+                self._start_fetch(name)
+                self.stats[STALE] += 1
+                return {'data': entry[1], 'state': STALE}
+
+        task = self._start_fetch(name)
+        deadline = self.deadlines.get(name, self.deadline)
+        try:
+            data = await asyncio.wait_for(asyncio.shield(task), deadline)
+        except Exception:
+            self.stats[MISSING] += 1
+            return {'data': None, 'state': MISSING}
+        self.stats[FRESH] += 1
+        return {'data': data, 'state': FRESH}
+
+    async def fetch_all(self):
+        """Fetch every source concurrently, each bounded by its own deadline"""
+        names = list(self.sources)
+        results = await asyncio.gather(*(self.get(name) for name in names))
+        return dict(zip(names, results))
@@ -2,6 +2,8 @@ import aiohttp
 import asyncio
 from datetime import datetime
 
+from resilience import ResilientFetcher
+
 async def fetch_html(session, url):
     """Fetch HTML content from a single URL"""
     try:
@@ -22,10 +24,18 @@ async def fetch_html(session, url):
             'status': 'failed'
         }
 
-async def scrape_urls(urls):
-    """Scrape multiple URLs concurrently"""
+async def scrape_urls(urls, fetcher=None):
+    """
+    Scrape multiple URLs concurrently
+
+    Args:
+        urls: URLs to fetch
+        fetcher: Optional `resilience.ResilientFetcher` adding retries,
+            hedging and circuit breaking around each request
+    """
+    fetch = fetcher.fetch if fetcher is not None else fetch_html
     async with aiohttp.ClientSession() as session:
-        tasks = [fetch_html(session, url) for url in urls]
+        tasks = [fetch(session, url) for url in urls]
         return await asyncio.gather(*tasks)
 
 async def main():
@@ -37,8 +47,10 @@ async def main():
         'https://docs.aiohttp.org'
     ]
     
+    fetcher = ResilientFetcher()
+
     print(f"Starting scrape at {datetime.now()}")
-    results = await scrape_urls(urls)
+    results = await scrape_urls(urls, fetcher)
     
     print("\nScraping Results:")
     for result in results:
@@ -51,5 +63,7 @@ async def main():
         if 'error' in result:
             print(f"Error: {result['error']}")
 
+    print(f"\nResilience counters: {fetcher.counters}")
+
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
@@ -1,8 +1,10 @@
-from fastapi import FastAPI
+from fastapi import Depends, FastAPI
 import asyncio
 from datetime import datetime
 import random
 
+from aggregator import FanOutAggregator
+
 app = FastAPI()
 
 async def fetch_data_from_source_1():
@@ -23,15 +25,26 @@ async def fetch_data_from_source_2():
         "delay": f"{delay:.2f} seconds"
     }
 
+aggregator = FanOutAggregator(
+    {
+        "source_1_data": fetch_data_from_source_1,
+        "source_2_data": fetch_data_from_source_2,
+    },
+    deadline=0.8,
+    ttl=2.0,
+    stale_ttl=30.0,
+)
+
+def get_aggregator() -> FanOutAggregator:
+    """Dependency returning the shared fan-out aggregator"""
+    return aggregator
+
 @app.get("/fetch-data")
-async def fetch_data():
-    results = await asyncio.gather(
-        fetch_data_from_source_1(),
-        fetch_data_from_source_2()
-    )
+async def fetch_data(aggregator: FanOutAggregator = Depends(get_aggregator)):
+    results = await aggregator.fetch_all()
     
-    return {
-        "source_1_data": results[0],
-        "source_2_data": results[1],
-        "note": "Both fetches completed concurrently"
-    }
+    response = {name: result["data"] for name, result in results.items()}
+    response["sources"] = {name: result["state"] for name, result in results.items()}
+    response["partial"] = any(result["state"] != "fresh" for result in results.values())
+    response["note"] = "Sources fetched concurrently with per-source deadlines and caching"
+    return response
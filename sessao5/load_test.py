@@ -0,0 +1,79 @@
+"""
+Load test for the /fetch-data endpoint
+
+Compares the original `asyncio.gather` implementation against the fan-out
+aggregator in exercise.py by firing concurrent requests with httpx against
+the in-process ASGI app and reporting latency percentiles.
+
+Run with: python load_test.py [requests] [concurrency]
+"""
+import asyncio
+import statistics
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from exercise import app, fetch_data_from_source_1, fetch_data_from_source_2
+
+
+baseline_app = FastAPI()
+
+@baseline_app.get("/fetch-data")
+async def baseline_fetch_data():
+    results = await asyncio.gather(
+        fetch_data_from_source_1(),
+        fetch_data_from_source_2()
+    )
+    return {
+        "source_1_data": results[0],
+        "source_2_data": results[1],
+    }
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+async def run_load(target_app, total, concurrency):
+    """Send `total` requests with at most `concurrency` in flight"""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=target_app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.get("/fetch-data")
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+                # Spread requests over time so cache expiry is exercised
+                await asyncio.sleep(0.05)
+
+        await asyncio.gather(*(one() for _ in range(total)))
+    return latencies
+
+
+def report(name, latencies):
+    print(
+        f"{name:<12} n={len(latencies):<5} "
+        f"p50={percentile(latencies, 50) * 1000:7.1f}ms "
+        f"p95={percentile(latencies, 95) * 1000:7.1f}ms "
+        f"p99={percentile(latencies, 99) * 1000:7.1f}ms "
+        f"mean={statistics.mean(latencies) * 1000:7.1f}ms"
+    )
+
+
+async def main(total=500, concurrency=50):
+    print(f"Running {total} requests with concurrency {concurrency}")
+    report("baseline", await run_load(baseline_app, total, concurrency))
+    report("aggregator", await run_load(app, total, concurrency))
+
+
+if __name__ == "__main__":
+    args = [int(arg) for arg in sys.argv[1:3]]
+    asyncio.run(main(*args))
@@ -0,0 +1,239 @@
+import asyncio
+import random
+import time
+from collections import deque
+from datetime import datetime
+from urllib.parse import urlparse
+
+import aiohttp
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is rejected because the host circuit is open"""
+
+
+class UpstreamError(Exception):
+    """Raised when an upstream answers with a server error status"""
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker
+
+    After `failure_threshold` consecutive failures the circuit opens and every
+    call fails fast for `cooldown` seconds. The first call after the cooldown
+    is let through as a probe (half-open): success closes the circuit again,
+    failure re-opens it for another cooldown.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold=5, cooldown=30.0):
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = 0.0
+        self.state = self.CLOSED
+
+    def allow(self):
+        """Return True if a request may be sent to the host"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            self.state = self.HALF_OPEN
+            return True
+        if self.state == self.HALF_OPEN:
+            # Only one probe at a time while half-open
+            return False
+        return True
+
+    def record_success(self):
+        self.failures = 0
+        self.state = self.CLOSED
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def release_probe(self):
+        """
+        Give back the half-open probe slot when the probe ended without an
+        outcome (e.g. it was cancelled), so the next call probes again
+        """
+        if self.state == self.HALF_OPEN:
+            self.state = self.OPEN
+
+
+class LatencyTracker:
+    """Sliding window of observed latencies used to derive the hedge threshold"""
+
+    def __init__(self, window=200, initial=1.0, min_samples=20):
+        self.samples = deque(maxlen=window)
+        self.initial = initial
+        self.min_samples = min_samples
+
+    def observe(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, pct):
+        if len(self.samples) < self.min_samples:
+            return self.initial
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
+
+
+class ResilientFetcher:
+    """
+    Resilience layer around a single HTTP GET
+
+    Combines three techniques:
+        - retries with exponential backoff and full jitter
+        - hedged requests: if the first attempt is slower than the observed
+          p95 latency a second identical request is fired and the first
+          response wins
+        - per-host circuit breakers that fast-fail while a host is unhealthy
+
+    Every decision is counted in `self.counters`.
+    """
+
+    def __init__(self, max_attempts=3, base_delay=0.1, max_delay=2.0,
+                 hedge=True, hedge_percentile=95, initial_hedge_delay=1.0,
+                 failure_threshold=5, cooldown=30.0, request_timeout=10.0):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.request_timeout = request_timeout
+        self.latency = LatencyTracker(initial=initial_hedge_delay)
+        self.breakers = {}
+        self.counters = {
+            'requests': 0,
+            'successes': 0,
+            'failures': 0,
+            'retries': 0,
+            'hedges': 0,
+            'hedge_wins': 0,
+            'circuit_open': 0,
+            'circuit_rejections': 0,
+        }
+
+    def breaker_for(self, url):
+        """Return the circuit breaker for the host of `url`"""
+        host = urlparse(url).netloc
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.cooldown)
+            self.breakers[host] = breaker
+        return breaker
+
+    def backoff(self, attempt):
+        """Full-jitter exponential backoff for the given attempt number"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+    async def _get(self, session, url):
+        self.counters['requests'] += 1
+        start = time.perf_counter()
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout)
+        async with session.get(url, timeout=timeout) as response:
+            html = await response.text()
+            if response.status >= 500:
+                raise UpstreamError(f"{url} answered {response.status}")
+            self.latency.observe(time.perf_counter() - start)
+            return response.status, html
+
+    async def _hedged_get(self, session, url):
+        """Send the request, hedging with a second copy if it is slow"""
+        if not self.hedge:
+            return await self._get(session, url)
+
+        primary = asyncio.ensure_future(self._get(session, url))
+        pending = {primary}
+        error = None
+        try:
+            delay = self.latency.percentile(self.hedge_percentile)
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return primary.result()
+
+            self.counters['hedges'] += 1
+            backup = asyncio.ensure_future(self._get(session, url))
+            pending = {primary, backup}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup:
+                            self.counters['hedge_wins'] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _record_failure(self, breaker):
+        was_open = breaker.state == CircuitBreaker.OPEN
+        breaker.record_failure()
+        if not was_open and breaker.state == CircuitBreaker.OPEN:
+            self.counters['circuit_open'] += 1
+
+    async def _call(self, session, url):
+        """Run retries and hedging behind the host circuit breaker"""
+        breaker = self.breaker_for(url)
+        last_error = None
+        for attempt in range(self.max_attempts):
+            if not breaker.allow():
+                self.counters['circuit_rejections'] += 1
+                raise CircuitOpenError(f"Circuit open for {urlparse(url).netloc}")
+            if attempt > 0:
+                self.counters['retries'] += 1
+            try:
+                result = await self._hedged_get(session, url)
+            except (aiohttp.ClientError, asyncio.TimeoutError, UpstreamError) as e:
+                last_error = e
+                self._record_failure(breaker)
+                if attempt + 1 < self.max_attempts:
+                    await asyncio.sleep(self.backoff(attempt))
+                continue
+            except asyncio.CancelledError:
+                breaker.release_probe()
+                raise
+            except Exception:
+                # Not worth retrying, but it still counts against the host
+                self._record_failure(breaker)
+                raise
+            breaker.record_success()
+            return result
+        raise last_error
+
+    async def fetch(self, session, url):
+        """
+        Fetch a URL through the resilience layer
+
+        Returns the same result dict shape as `challenge.fetch_html`.
+        """
+        start_time = datetime.now()
+        try:
+            status, html = await self._call(session, url)
+        except Exception as e:
+            self.counters['failures'] += 1
+            return {
+                'url': url,
+                'error': str(e) or type(e).__name__,
+                'status': 'failed'
+            }
+        self.counters['successes'] += 1
+        return {
+            'url': url,
+            'html': html[:100] + '...',
+            'status': status,
+            'time_taken': str(datetime.now() - start_time)
+        }
@@ -0,0 +1,80 @@
+"""
+Tests for the fan-out aggregator in aggregator.py
+"""
+import asyncio
+
+from aggregator import FanOutAggregator, FRESH, MISSING, STALE
+
+
+def make_source(delay, calls):
+    async def source():
+        calls.append(delay)
+        await asyncio.sleep(delay)
+        return f"value-{len(calls)}"
+    return source
+
+
+def test_concurrent_calls_share_one_fetch():
+    """Identical concurrent calls are coalesced into one upstream call"""
+    calls = []
+
+    async def scenario():
+        aggregator = FanOutAggregator({"a": make_source(0.05, calls)}, deadline=1.0)
+        return await asyncio.gather(*(aggregator.get("a") for _ in range(20)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(r == {"data": "value-1", "state": FRESH} for r in results)
+
+
+def test_slow_source_is_missing_and_warms_cache():
+    """A source over its deadline is reported missing but still fills the cache"""
+    calls = []
+
+    async def scenario():
+        aggregator = FanOutAggregator(
+            {"fast": make_source(0.01, []), "slow": make_source(0.2, calls)},
+            deadline=0.05,
+            ttl=10.0,
+        )
+        first = await aggregator.fetch_all()
+        await asyncio.sleep(0.3)
+        second = await aggregator.fetch_all()
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first["fast"]["state"] == FRESH
+    assert first["slow"] == {"data": None, "state": MISSING}
+    assert second["slow"]["state"] == FRESH
+    assert len(calls) == 1
+
+
+def test_expired_entry_served_stale_with_background_refresh():
+    """Past the TTL the cached value is served stale and refreshed in the background"""
+    calls = []
+
+    async def scenario():
+        aggregator = FanOutAggregator({"a": make_source(0.01, calls)}, ttl=0.05, stale_ttl=10.0)
+        first = await aggregator.get("a")
+        await asyncio.sleep(0.1)
+        stale = await aggregator.get("a")
+        await asyncio.sleep(0.05)
+        refreshed = await aggregator.get("a")
+        return first, stale, refreshed
+
+    first, stale, refreshed = asyncio.run(scenario())
+    assert first == {"data": "value-1", "state": FRESH}
+    assert stale == {"data": "value-1", "state": STALE}
+    assert refreshed == {"data": "value-2", "state": FRESH}
+
+
+def test_failing_source_is_missing():
+    """Exceptions from a source surface as a missing result, not an error"""
+    async def broken():
+        raise RuntimeError("down")
+
+    async def scenario():
+        aggregator = FanOutAggregator({"a": broken})
+        return await aggregator.get("a")
+
+    assert asyncio.run(scenario()) == {"data": None, "state": MISSING}
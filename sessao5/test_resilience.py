@@ -0,0 +1,195 @@
+"""
+Tests for the resilience layer in resilience.py
+
+A local aiohttp server injects latency and faults so no network access is needed.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+
+import aiohttp
+from aiohttp import web
+
+from challenge import scrape_urls
+from resilience import CircuitBreaker, ResilientFetcher
+
+
+@asynccontextmanager
+async def fault_server():
+    """Start a local server with routes that fail, flake or stall"""
+    hits = {'flaky': 0, 'slow_once': 0}
+
+    async def ok(request):
+        return web.Response(text='ok')
+
+    async def flaky(request):
+        hits['flaky'] += 1
+        if hits['flaky'] <= 2:
+            return web.Response(status=503, text='unavailable')
+        return web.Response(text='recovered')
+
+    async def broken(request):
+        return web.Response(status=500, text='boom')
+
+    async def slow_once(request):
+        hits['slow_once'] += 1
+        if hits['slow_once'] == 1:
+            await asyncio.sleep(2)
+        return web.Response(text='fast')
+
+    app = web.Application()
+    app.router.add_get('/ok', ok)
+    app.router.add_get('/flaky', flaky)
+    app.router.add_get('/broken', broken)
+    app.router.add_get('/slow-once', slow_once)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    try:
+        yield f'http://127.0.0.1:{port}', hits
+    finally:
+        await runner.cleanup()
+
+
+def test_retries_recover_from_transient_errors():
+    """A host failing twice then succeeding is recovered by retries"""
+    async def scenario():
+        fetcher = ResilientFetcher(max_attempts=3, base_delay=0.01, hedge=False)
+        async with fault_server() as (base, hits):
+            async with aiohttp.ClientSession() as session:
+                result = await fetcher.fetch(session, f'{base}/flaky')
+        return fetcher, result, hits
+
+    fetcher, result, hits = asyncio.run(scenario())
+    assert result['status'] == 200
+    assert hits['flaky'] == 3
+    assert fetcher.counters['retries'] == 2
+    assert fetcher.counters['successes'] == 1
+
+
+def test_hedged_request_beats_slow_primary():
+    """A second request is fired after the hedge delay and wins"""
+    async def scenario():
+        fetcher = ResilientFetcher(hedge=True, initial_hedge_delay=0.1)
+        async with fault_server() as (base, _):
+            async with aiohttp.ClientSession() as session:
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                result = await fetcher.fetch(session, f'{base}/slow-once')
+                elapsed = loop.time() - start
+        return fetcher, result, elapsed
+
+    fetcher, result, elapsed = asyncio.run(scenario())
+    assert result['status'] == 200
+    assert elapsed < 1.0
+    assert fetcher.counters['hedges'] == 1
+    assert fetcher.counters['hedge_wins'] == 1
+
+
+def test_circuit_breaker_fast_fails_unhealthy_host():
+    """Once the breaker opens, further calls do not reach the server"""
+    async def scenario():
+        fetcher = ResilientFetcher(max_attempts=1, hedge=False, failure_threshold=2, cooldown=60)
+        async with fault_server() as (base, _):
+            results = []
+            async with aiohttp.ClientSession() as session:
+                for _ in range(5):
+                    results.append(await fetcher.fetch(session, f'{base}/broken'))
+        return fetcher, results
+
+    fetcher, results = asyncio.run(scenario())
+    assert all(r['status'] == 'failed' for r in results)
+    assert fetcher.counters['requests'] == 2
+    assert fetcher.counters['circuit_open'] == 1
+    assert fetcher.counters['circuit_rejections'] == 3
+
+
+def test_circuit_breaker_half_open_probe():
+    """After the cooldown a single probe decides whether the circuit closes"""
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is True
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow() is False
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_cancelled_probe_releases_half_open_slot():
+    """A cancelled or crashing probe does not leave the circuit stuck half-open"""
+    async def scenario():
+        fetcher = ResilientFetcher(max_attempts=1, hedge=False, failure_threshold=1, cooldown=0)
+        breaker = fetcher.breaker_for('http://upstream/')
+        breaker.record_failure()
+        started = asyncio.Event()
+
+        async def hanging_get(session, url):
+            started.set()
+            await asyncio.sleep(60)
+
+        fetcher._get = hanging_get
+        probe = asyncio.create_task(fetcher.fetch(None, 'http://upstream/'))
+        await started.wait()
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        probe.cancel()
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+        assert breaker.state == CircuitBreaker.OPEN
+        assert breaker.allow() is True
+
+        async def bad_body(session, url):
+            raise UnicodeDecodeError('utf-8', b'\xff', 0, 1, 'invalid start byte')
+
+        fetcher._get = bad_body
+        breaker.state = CircuitBreaker.OPEN
+        result = await fetcher.fetch(None, 'http://upstream/')
+        return breaker, result
+
+    breaker, result = asyncio.run(scenario())
+    assert result['status'] == 'failed'
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.allow() is True
+
+
+def test_cancelled_caller_cancels_unhedged_primary():
+    """Cancelling the caller before the hedge fires leaves no request running"""
+    async def scenario():
+        fetcher = ResilientFetcher(hedge=True, initial_hedge_delay=10)
+        outcome = {}
+
+        async def slow_get(session, url):
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                outcome['cancelled'] = True
+                raise
+
+        fetcher._get = slow_get
+        caller = asyncio.create_task(fetcher._hedged_get(None, 'http://upstream/'))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0)
+        return outcome, len(asyncio.all_tasks())
+
+    outcome, live = asyncio.run(scenario())
+    assert outcome == {'cancelled': True}
+    assert live == 1
+
+
+def test_scrape_urls_with_fetcher():
+    """scrape_urls routes every URL through the resilient fetcher"""
+    async def scenario():
+        fetcher = ResilientFetcher(hedge=False)
+        async with fault_server() as (base, _):
+            results = await scrape_urls([f'{base}/ok', f'{base}/ok'], fetcher)
+        return fetcher, results
+
+    fetcher, results = asyncio.run(scenario())
+    assert [r['status'] for r in results] == [200, 200]
+    assert fetcher.counters['successes'] == 2
@@ -1,9 +1,14 @@
 import asyncio
+import os
 import time
 import random
-from typing import List
+from typing import List, Optional
 import logging
 
+from instrumentation import LoopMonitor
+from rate_limit_backends import DistributedRateLimiter, RateLimitBackend
+from rate_limiting import TokenBucket
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -15,44 +20,57 @@ class AsyncRateLimiter:
     """
     Rate limiter that allows only a fixed number of tasks per second
     
-    Uses a semaphore and task scheduling to control execution rate
+    Backed by a monotonic-clock token bucket with FIFO waiters, so the
+    long-run rate is exact and bursts are bounded by `burst`
     """
     
-    def __init__(self, tasks_per_second: int):
+    def __init__(self, tasks_per_second: float, burst: Optional[float] = None,
+                 backend: Optional[RateLimitBackend] = None, key: str = "default",
+                 batch: float = 1):
         """
         Initialize rate limiter
         
         Args:
             tasks_per_second: Maximum number of tasks allowed per second
+            burst: Maximum number of tasks started back-to-back after an
+                idle period (defaults to one second worth of tasks)
+            backend: Optional shared-state backend; when given, every
+                process using the same backend and key shares one quota
+            key: Bucket name in the shared backend
+            batch: Tokens pre-fetched per backend round-trip
         """
         self.tasks_per_second = tasks_per_second
-        self.interval = 1.0 / tasks_per_second  
-        self.semaphore = asyncio.Semaphore(tasks_per_second)
-        self.last_released = 0
+        if backend is None:
+            self.limiter = TokenBucket(rate=tasks_per_second, capacity=burst)
+        else:
+            self.limiter = DistributedRateLimiter(
+                backend, key, rate=tasks_per_second, capacity=burst, batch=batch
+            )
         logger.info(f"Rate limiter initialized: {tasks_per_second} tasks/second")
     
-    async def execute(self, coro, *args, **kwargs):
+    @property
+    def max_weight(self) -> float:
+        """Largest weight a single acquire may ask for (the burst size)"""
+        return self.limiter.capacity
+    
+    async def acquire(self, weight: float = 1):
+        """Wait until `weight` tokens are available and take them"""
+        await self.limiter.acquire(weight)
+    
+    async def execute(self, coro, *args, weight: float = 1, **kwargs):
         """
         Execute a coroutine with rate limiting
         
         Args:
             coro: The coroutine function to execute
             *args, **kwargs: Arguments to pass to the coroutine
+            weight: Number of tokens the call costs
             
         Returns:
             The result of the coroutine execution
         """
-        async with self.semaphore:
-            now = time.time()
-            time_since_last = now - self.last_released
-            
-            if time_since_last < self.interval and self.last_released > 0:
-                delay = self.interval - time_since_last
-                await asyncio.sleep(delay)
-            
-            self.last_released = time.time()
-            
-            return await coro(*args, **kwargs)
+        await self.acquire(weight)
+        return await coro(*args, **kwargs)
 
 async def sample_task(task_id: int) -> str:
     """Sample task for rate limiter demonstration"""
@@ -76,12 +94,18 @@ async def demo_rate_limiter() -> List[str]:
 
 async def main():
     logger.info("\n=== CHALLENGE: Rate Limiter ===")
-    start_time = time.time()
-    rate_limiter_results = await demo_rate_limiter()
-    elapsed = time.time() - start_time
+    async with LoopMonitor(slow_callback_ms=50, report_interval=1.0) as monitor:
+        metrics_port = os.environ.get("METRICS_PORT")
+        if metrics_port:
+            monitor.serve(port=int(metrics_port))
+        
+        start_time = time.time()
+        rate_limiter_results = await demo_rate_limiter()
+        elapsed = time.time() - start_time
     
     logger.info(f"Rate limiter completed {len(rate_limiter_results)} tasks in {elapsed:.2f} seconds")
     logger.info(f"Average rate: {len(rate_limiter_results)/elapsed:.2f} tasks/second")
+    logger.info(f"Event loop stats: {monitor.snapshot()}")
 
 if __name__ == "__main__":
     try:
@@ -1,9 +1,11 @@
 import asyncio
 import time
 import random
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import logging
 
+from task_group import BoundedTaskGroup
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
@@ -24,57 +26,38 @@ async def task_with_random_duration(name: str, min_delay: float, max_delay: floa
         logger.warning(f"Task {name} was cancelled")
         raise  
 
-async def run_tasks_with_timeout(timeout: float = 2.0) -> Dict[str, Any]:
+async def run_tasks_with_timeout(timeout: float = 2.0, num_tasks: int = 5,
+                                 max_concurrency: int = 5,
+                                 task_timeout: Optional[float] = None) -> Dict[str, Any]:
     """
     Launch multiple tasks and handle timeouts gracefully
     
     Args:
-        timeout: Maximum time to wait for tasks (in seconds)
+        timeout: Maximum time to wait for all tasks (in seconds)
+        num_tasks: Number of tasks to launch
+        max_concurrency: Maximum number of tasks running at once
+        task_timeout: Optional deadline for each individual task
         
     Returns:
-        Dictionary with results and task status information
+        Dictionary with the completed results, the names of the timed out
+        tasks, the number of tasks cancelled for overrunning the deadline,
+        failed tasks and a latency histogram
     """
-    tasks = [
-        asyncio.create_task(task_with_random_duration(f"Task {i}", 0.5, 3.0))
-        for i in range(1, 6)  
-    ]
-    
-    results = {
-        "completed": [],
-        "timed_out": [],
-        "cancelled": 0
-    }
+    group = BoundedTaskGroup(max_concurrency, task_timeout=task_timeout, timeout=timeout)
     
-    try:
-        done, pending = await asyncio.wait(
-            tasks, 
-            timeout=timeout,
-            return_when=asyncio.ALL_COMPLETED
-        )
+    async with group:
+        for i in range(1, num_tasks + 1):
+            group.create_task(task_with_random_duration(f"Task {i}", 0.5, 3.0), name=f"Task {i}")
         
-        for task in done:
-            try:
-                result = task.result()
-                results["completed"].append(result)
-            except Exception as e:
-                logger.error(f"Task failed with error: {e}")
-        
-        results["timed_out"] = [f"Task {i+1}" for i, task in enumerate(tasks) if task in pending]
-        results["cancelled"] = len(pending)
-        
-        for task in pending:
-            task.cancel()
-            
-        if pending:
-            await asyncio.wait(pending, return_when=asyncio.ALL_COMPLETED)
-            logger.info(f"Cancelled {len(pending)} tasks that exceeded timeout")
+        async for outcome in group.as_completed():
+            logger.info(f"{outcome.name} finished as {outcome.status} after {outcome.latency:.2f}s")
     
-    except Exception as e:
-        logger.error(f"Error while waiting for tasks: {e}")
-        for task in tasks:
-            if not task.done():
-                task.cancel()
+    if group.summary.timed_out:
+        logger.info(f"Cancelled {len(group.summary.timed_out)} tasks that exceeded timeout")
     
+    results = group.summary.to_dict()
+    # Kept as a count of the tasks stopped by the deadline, as before
+    results["cancelled"] = len(group.summary.timed_out) + len(group.summary.cancelled)
     return results
 
 
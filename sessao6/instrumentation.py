@@ -0,0 +1,311 @@
+import asyncio
+import collections.abc
+import json
+import sys
+import threading
+import time
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+import logging
+
+from metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, float("inf"))
+
+
+def coroutine_name(coro) -> str:
+    code = getattr(coro, "cr_code", None) or getattr(coro, "gi_code", None)
+    if code is not None:
+        return getattr(code, "co_qualname", code.co_name)
+    return type(coro).__qualname__
+
+
+class CoroutineStats:
+    """Accumulated timings for every task running a given coroutine function"""
+
+    __slots__ = ("count", "wall", "busy", "max_step")
+
+    def __init__(self):
+        self.count = 0
+        self.wall = 0.0
+        self.busy = 0.0
+        self.max_step = 0.0
+
+    @property
+    def awaiting(self) -> float:
+        return max(0.0, self.wall - self.busy)
+
+
+class TimedCoroutine(collections.abc.Coroutine):
+    """
+    Coroutine proxy measuring the time spent inside each step
+
+    The event loop drives a task by calling `send`/`throw` on its coroutine;
+    time spent inside those calls is CPU time on the loop ("busy"), the rest
+    of the task's lifetime is time spent awaiting.
+    """
+
+    __slots__ = ("coro", "busy", "max_step")
+
+    def __init__(self, coro):
+        self.coro = coro
+        self.busy = 0.0
+        self.max_step = 0.0
+
+    def _timed(self, method, *args):
+        start = time.perf_counter()
+        try:
+            return method(*args)
+        finally:
+            step = time.perf_counter() - start
+            self.busy += step
+            if step > self.max_step:
+                self.max_step = step
+
+    def send(self, value):
+        return self._timed(self.coro.send, value)
+
+    def throw(self, *args):
+        return self._timed(self.coro.throw, *args)
+
+    def close(self):
+        return self.coro.close()
+
+    def __await__(self):
+        return self
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.send(None)
+
+
+class LoopMonitor:
+    """
+    Event loop instrumentation
+
+    - event-loop lag: a probe sleeps for `interval` and records how late it
+      wakes up
+    - task counts: live (not done) tasks, tasks created/finished, and the
+      number of callbacks ready to run
+    - per-coroutine wall vs. busy vs. await time, through a task factory
+      that wraps every task's coroutine in a TimedCoroutine
+    - slow callbacks: a watchdog thread notices when the loop has not run
+      the probe for more than `slow_callback_ms` and logs the loop thread's
+      stack, which points at the blocking code
+
+    Snapshots are logged as JSON lines every `report_interval` seconds and
+    can be scraped in Prometheus text format via `serve()`.
+    """
+
+    def __init__(self, interval: float = 0.05, slow_callback_ms: float = 100,
+                 report_interval: Optional[float] = 10.0, stack_depth: int = 8):
+        """
+        Args:
+            interval: Seconds between lag probes
+            slow_callback_ms: Loop stall (ms) after which a stack is captured
+            report_interval: Seconds between structured log reports (None disables)
+            stack_depth: Number of frames kept in slow callback stack snippets
+        """
+        self.interval = interval
+        self.slow_callback = slow_callback_ms / 1000
+        self.report_interval = report_interval
+        self.stack_depth = stack_depth
+        self.lag = Histogram(LAG_BUCKETS)
+        self.coroutines: Dict[str, CoroutineStats] = {}
+        self.tasks_created = 0
+        self.tasks_finished = 0
+        self.tasks_live = 0
+        self.ready_callbacks = 0
+        self.slow_callbacks = 0
+        self.last_slow_stack: Optional[str] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._previous_factory = None
+        self._heartbeat = time.monotonic()
+        self._probe: Optional[asyncio.Task] = None
+        self._reporter: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    async def __aenter__(self) -> "LoopMonitor":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+        return False
+
+    def start(self) -> None:
+        """Install the task factory and start the probe, reporter and watchdog"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._previous_factory = self._loop.get_task_factory()
+        self._loop.set_task_factory(self._task_factory)
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._probe = self._loop.create_task(self._probe_loop(), name="loop-monitor-probe")
+        if self.report_interval:
+            self._reporter = self._loop.create_task(self._report_loop(), name="loop-monitor-report")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-monitor-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        for task in (self._probe, self._reporter):
+            if task is not None:
+                task.cancel()
+        await asyncio.gather(*(t for t in (self._probe, self._reporter) if t), return_exceptions=True)
+        if self._loop is not None:
+            self._loop.set_task_factory(self._previous_factory)
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _task_factory(self, loop, coro, **kwargs):
+        timed = TimedCoroutine(coro)
+        if self._previous_factory is not None:
+            task = self._previous_factory(loop, timed, **kwargs)
+        else:
+            task = asyncio.Task(timed, loop=loop, **kwargs)
+        started = time.perf_counter()
+        name = coroutine_name(coro)
+        self.tasks_created += 1
+
+        def finished(_):
+            self.tasks_finished += 1
+            stats = self.coroutines.get(name)
+            if stats is None:
+                stats = self.coroutines[name] = CoroutineStats()
+            stats.count += 1
+            stats.wall += time.perf_counter() - started
+            stats.busy += timed.busy
+            stats.max_step = max(stats.max_step, timed.max_step)
+
+        task.add_done_callback(finished)
+        return task
+
+    async def _probe_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag.observe(max(0.0, loop.time() - expected))
+            self._heartbeat = time.monotonic()
+            self.tasks_live = len(asyncio.all_tasks(loop))
+            self.ready_callbacks = len(getattr(loop, "_ready", ()))
+
+    async def _report_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            logger.info(json.dumps(self.snapshot()))
+
+    def _watch(self) -> None:
+        """Watchdog thread: capture the loop thread's stack when the loop stalls"""
+        threshold = self.interval + self.slow_callback
+        reported_beat = None
+        while not self._stopping.wait(self.slow_callback / 2):
+            beat = self._heartbeat
+            if time.monotonic() - beat < threshold or beat == reported_beat:
+                continue
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame, limit=self.stack_depth))
+            self.slow_callbacks += 1
+            self.last_slow_stack = stack
+            logger.warning(json.dumps({
+                "event": "slow_callback",
+                "blocked_ms": round((time.monotonic() - beat - self.interval) * 1000, 1),
+                "stack": stack,
+            }))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current metrics as a JSON-serialisable dictionary"""
+        return {
+            "event": "loop_stats",
+            "lag_p50_ms": self.lag.quantile(0.5) * 1000,
+            "lag_p99_ms": self.lag.quantile(0.99) * 1000,
+            "lag_samples": self.lag.count,
+            "tasks_live": self.tasks_live,
+            "tasks_created": self.tasks_created,
+            "tasks_finished": self.tasks_finished,
+            "ready_callbacks": self.ready_callbacks,
+            "slow_callbacks": self.slow_callbacks,
+            "coroutines": {
+                name: {
+                    "count": stats.count,
+                    "wall_s": round(stats.wall, 6),
+                    "busy_s": round(stats.busy, 6),
+                    "await_s": round(stats.awaiting, 6),
+                    "max_step_ms": round(stats.max_step * 1000, 3),
+                }
+                for name, stats in list(self.coroutines.items())
+            },
+        }
+
+    def to_prometheus(self) -> str:
+        """Metrics in Prometheus text exposition format"""
+        lines = [
+            "# HELP asyncio_loop_lag_seconds Delay between scheduled and actual probe wake-up",
+            "# TYPE asyncio_loop_lag_seconds histogram",
+        ]
+        lines.extend(self.lag.to_prometheus("asyncio_loop_lag_seconds"))
+        for name, kind, value in (
+            ("asyncio_tasks_live", "gauge", self.tasks_live),
+            ("asyncio_ready_callbacks", "gauge", self.ready_callbacks),
+            ("asyncio_tasks_created_total", "counter", self.tasks_created),
+            ("asyncio_tasks_finished_total", "counter", self.tasks_finished),
+            ("asyncio_slow_callbacks_total", "counter", self.slow_callbacks),
+        ):
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {value}")
+        for metric, attr in (
+            ("asyncio_coroutine_wall_seconds_total", "wall"),
+            ("asyncio_coroutine_busy_seconds_total", "busy"),
+            ("asyncio_coroutine_await_seconds_total", "awaiting"),
+            ("asyncio_coroutine_tasks_total", "count"),
+        ):
+            lines.append(f"# TYPE {metric} counter")
+            for name, stats in list(self.coroutines.items()):
+                lines.append(f'{metric}{{coroutine="{name}"}} {getattr(stats, attr)}')
+        return "\n".join(lines) + "\n"
+
+    def serve(self, host: str = "127.0.0.1", port: int = 9108) -> int:
+        """
+        Serve `/metrics` from a background thread
+
+        The exporter runs outside the event loop, so it still answers while
+        the loop is blocked. Returns the bound port (useful with port 0).
+        """
+        monitor = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = monitor.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self._server.serve_forever, name="loop-monitor-metrics", daemon=True).start()
+        bound = self._server.server_address[1]
+        logger.info(f"Serving event loop metrics on http://{host}:{bound}/metrics")
+        return bound
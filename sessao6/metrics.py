@@ -0,0 +1,51 @@
+import math
+from typing import List, Tuple
+
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative export"""
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                return
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        running = 0
+        result = []
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            result.append((bound, running))
+        return result
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket containing the q-th quantile"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        for bound, running in self.cumulative():
+            if running >= target:
+                return bound
+        return math.inf
+
+    def to_prometheus(self, name: str, labels: str = "") -> List[str]:
+        sep = "," if labels else ""
+        lines = []
+        for bound, running in self.cumulative():
+            le = "+Inf" if bound == math.inf else repr(bound)
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{le}"}} {running}')
+        lines.append(f"{name}_sum{{{labels}}} {self.total}")
+        lines.append(f"{name}_count{{{labels}}} {self.count}")
+        return lines
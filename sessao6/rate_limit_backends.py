@@ -0,0 +1,268 @@
+import asyncio
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Tuple
+import logging
+
+from rate_limiting import WeightedAcquire
+
+logger = logging.getLogger(__name__)
+
+
+def refill_and_take(tokens: float, updated: float, now: float, rate: float, capacity: float,
+                    min_tokens: float, max_tokens: float) -> Tuple[float, float, float]:
+    """
+    Token bucket step shared by the backends
+
+    Refills the bucket up to `now` and takes between `min_tokens` and
+    `max_tokens` tokens if at least `min_tokens` are available.
+
+    Returns:
+        Tuple of (remaining tokens, granted tokens, seconds to wait when
+        nothing was granted)
+    """
+    if now > updated:
+        tokens = min(capacity, tokens + (now - updated) * rate)
+    if tokens >= min_tokens:
+        granted = min(tokens, max_tokens)
+        return tokens - granted, granted, 0.0
+    return tokens, 0.0, (min_tokens - tokens) / rate
+
+
+class RateLimitBackend(ABC):
+    """
+    Shared state for a token bucket
+
+    Implementations must make `take` atomic across every process that
+    shares the backend, so the processes collectively respect one quota.
+    """
+
+    @abstractmethod
+    def take(self, key: str, rate: float, capacity: float,
+             min_tokens: float, max_tokens: float) -> Tuple[float, float]:
+        """
+        Atomically take tokens from the bucket stored under `key`
+
+        Args:
+            key: Bucket identifier shared by all processes
+            rate: Refill rate in tokens per second
+            capacity: Bucket size
+            min_tokens: Tokens the caller needs right now
+            max_tokens: Tokens the caller would like (pre-fetching)
+
+        Returns:
+            Tuple of (granted tokens, seconds to wait if none were granted)
+        """
+
+    def close(self) -> None:
+        """Release any connections held by the backend"""
+
+
+class InMemoryBackend(RateLimitBackend):
+    """Process-local backend, useful for tests and single-worker deployments"""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, capacity, min_tokens, max_tokens):
+        with self._lock:
+            now = time.monotonic()
+            tokens, updated = self._buckets.get(key, (capacity, now))
+            tokens, granted, wait = refill_and_take(
+                tokens, updated, now, rate, capacity, min_tokens, max_tokens
+            )
+            self._buckets[key] = (tokens, now)
+            return granted, wait
+
+
+class SQLiteBackend(RateLimitBackend):
+    """
+    Backend storing buckets in a shared SQLite file
+
+    The database runs in WAL mode and every update happens inside a
+    `BEGIN IMMEDIATE` transaction, which takes the write lock up front so
+    concurrent processes serialise on the read-modify-write. Within a
+    process, one connection is shared by every thread (calls arrive through
+    `asyncio.to_thread`) behind a lock.
+    """
+
+    def __init__(self, path: str, busy_timeout: float = 5.0):
+        self.path = path
+        self.busy_timeout = busy_timeout
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limit_buckets ("
+            " key TEXT PRIMARY KEY,"
+            " tokens REAL NOT NULL,"
+            " updated REAL NOT NULL)"
+        )
+
+    def take(self, key, rate, capacity, min_tokens, max_tokens):
+        with self._lock:
+            if self._conn is None:
+                raise RuntimeError("SQLiteBackend is closed")
+            return self._take(self._conn, key, rate, capacity, min_tokens, max_tokens)
+
+    def _take(self, conn, key, rate, capacity, min_tokens, max_tokens):
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated FROM rate_limit_buckets WHERE key = ?", (key,)
+            ).fetchone()
+            tokens, updated = row if row else (capacity, now)
+            tokens, granted, wait = refill_and_take(
+                tokens, updated, now, rate, capacity, min_tokens, max_tokens
+            )
+            conn.execute(
+                "INSERT INTO rate_limit_buckets (key, tokens, updated) VALUES (?, ?, ?)"
+                " ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, max(now, updated)),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return granted, wait
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RedisBackend(RateLimitBackend):
+    """
+    Backend for any server speaking the Redis protocol
+
+    The token bucket update runs as a Lua script, so it is atomic on the
+    server and uses the server clock, which keeps workers on different
+    hosts consistent regardless of local clock skew.
+    """
+
+    SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local capacity = tonumber(ARGV[2])
+    local min_tokens = tonumber(ARGV[3])
+    local max_tokens = tonumber(ARGV[4])
+    local t = redis.call('TIME')
+    local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or capacity
+    local updated = tonumber(state[2]) or now
+    if now > updated then
+        tokens = math.min(capacity, tokens + (now - updated) * rate)
+        updated = now
+    end
+    local granted = 0
+    local wait = 0
+    if tokens >= min_tokens then
+        granted = math.min(tokens, max_tokens)
+        tokens = tokens - granted
+    else
+        wait = (min_tokens - tokens) / rate
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(updated))
+    redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate * 1000) + 1000)
+    return {tostring(granted), tostring(wait)}
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        """
+        Args:
+            client: A `redis.Redis` compatible client
+            prefix: Prefix for the bucket keys
+        """
+        self.client = client
+        self.prefix = prefix
+        self._script = client.register_script(self.SCRIPT)
+
+    def take(self, key, rate, capacity, min_tokens, max_tokens):
+        granted, wait = self._script(
+            keys=[self.prefix + key], args=[rate, capacity, min_tokens, max_tokens]
+        )
+        return float(granted), float(wait)
+
+    def close(self):
+        self.client.close()
+
+
+class DistributedRateLimiter:
+    """
+    Async token bucket limiter whose state lives in a shared backend
+
+    To amortise backend round-trips the limiter pre-fetches up to `batch`
+    tokens per call and serves subsequent acquires from that local pool.
+    Pre-fetched tokens are reserved for this process, so keep `batch`
+    small relative to the rate when many workers share one quota.
+    Waiters are served in FIFO order (asyncio.Lock is fair).
+    """
+
+    def __init__(self, backend: RateLimitBackend, key: str, rate: float,
+                 capacity: Optional[float] = None, batch: float = 1):
+        """
+        Args:
+            backend: Shared state backend
+            key: Bucket name shared by every worker
+            rate: Tokens per second across all workers
+            capacity: Bucket size (burst); defaults to one second worth of tokens
+            batch: Tokens to pre-fetch per backend round-trip
+        """
+        self.backend = backend
+        self.key = key
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.batch = batch
+        self.local_tokens = 0.0
+        self.round_trips = 0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, weight: float = 1) -> None:
+        """Wait until `weight` tokens are available and take them"""
+        if weight <= 0 or weight > self.capacity:
+            raise ValueError(f"Weight must be in (0, {self.capacity}], got {weight}")
+
+        async with self._lock:
+            while self.local_tokens < weight:
+                needed = weight - self.local_tokens
+                wanted = max(self.batch, weight) - self.local_tokens
+                self.round_trips += 1
+                take = asyncio.ensure_future(asyncio.to_thread(
+                    self.backend.take, self.key, self.rate, self.capacity, needed, wanted
+                ))
+                try:
+                    granted, wait = await asyncio.shield(take)
+                except asyncio.CancelledError:
+                    # The backend may already have handed out tokens: keep
+                    # them in the local pool for the next acquire
+                    take.add_done_callback(self._keep_granted)
+                    raise
+                self.local_tokens += granted
+                if self.local_tokens < weight:
+                    await asyncio.sleep(wait)
+            self.local_tokens -= weight
+
+    def _keep_granted(self, take: asyncio.Future) -> None:
+        if not take.cancelled() and take.exception() is None:
+            self.local_tokens += take.result()[0]
+
+    def weighted(self, weight: float) -> WeightedAcquire:
+        """Return an async context manager acquiring `weight` tokens"""
+        return WeightedAcquire(self, weight)
+
+    async def __aenter__(self):
+        await self.acquire(1)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
@@ -0,0 +1,287 @@
+import asyncio
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from typing import Any, Callable, Deque, Optional, Tuple
+
+
+class WeightedAcquire:
+    """Async context manager acquiring `weight` permits from a limiter"""
+
+    def __init__(self, limiter: "FifoRateLimiter", weight: float):
+        self.limiter = limiter
+        self.weight = weight
+
+    async def __aenter__(self):
+        await self.limiter.acquire(self.weight)
+        return self.limiter
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+class FifoRateLimiter(ABC):
+    """
+    Base class for async rate limiters with FIFO fairness
+
+    Waiters are served strictly in arrival order: a new caller never
+    overtakes one that is already queued, even if enough capacity is
+    available for its (smaller) weight. Subclasses implement the accounting
+    through `_try_acquire`, `_time_until` and `_refund`, all driven by a
+    monotonic clock. `_try_acquire` returns a grant (None when it cannot
+    grant) that `_refund` gets back if the waiter is cancelled after all.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self.clock = clock
+        self._waiters: Deque[Tuple[float, asyncio.Future]] = deque()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    @abstractmethod
+    def _max_weight(self) -> float:
+        """Largest weight a single acquire may ask for"""
+
+    @abstractmethod
+    def _try_acquire(self, weight: float, now: float) -> Optional[Any]:
+        """Take `weight` permits if available, returning the grant, else None"""
+
+    @abstractmethod
+    def _time_until(self, weight: float, now: float) -> float:
+        """Seconds until `weight` permits could be granted"""
+
+    @abstractmethod
+    def _refund(self, grant: Any, now: float) -> None:
+        """Give back the permits of a grant returned by `_try_acquire`"""
+
+    def try_acquire(self, weight: float = 1) -> bool:
+        """Acquire without waiting; returns False if it would have to queue"""
+        self._check_weight(weight)
+        if self._waiters:
+            return False
+        return self._try_acquire(weight, self.clock()) is not None
+
+    async def acquire(self, weight: float = 1) -> None:
+        """
+        Wait until `weight` permits are available and take them
+
+        Args:
+            weight: Number of permits this operation costs
+        """
+        self._check_weight(weight)
+        if not self._waiters and self._try_acquire(weight, self.clock()) is not None:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((weight, future))
+        self._schedule()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # Permits were granted just as we were cancelled: give them back
+                self._refund(future.result(), self.clock())
+            else:
+                try:
+                    self._waiters.remove((weight, future))
+                except ValueError:
+                    pass
+            self._wake()
+            raise
+
+    def weighted(self, weight: float) -> WeightedAcquire:
+        """Return an async context manager acquiring `weight` permits"""
+        return WeightedAcquire(self, weight)
+
+    async def __aenter__(self):
+        await self.acquire(1)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    @property
+    def waiting(self) -> int:
+        """Number of queued acquirers"""
+        return len(self._waiters)
+
+    def _check_weight(self, weight: float) -> None:
+        if weight <= 0 or weight > self._max_weight():
+            raise ValueError(f"Weight must be in (0, {self._max_weight()}], got {weight}")
+
+    def _schedule(self) -> None:
+        if self._timer is None:
+            self._wake()
+
+    def _wake(self) -> None:
+        """Grant permits to queued waiters in order, then re-arm the timer"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._waiters:
+            weight, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            now = self.clock()
+            grant = self._try_acquire(weight, now)
+            if grant is None:
+                delay = max(self._time_until(weight, now), 0.0)
+                loop = asyncio.get_running_loop()
+                self._timer = loop.call_later(delay, self._wake)
+                return
+            self._waiters.popleft()
+            future.set_result(grant)
+
+
+class TokenBucket(FifoRateLimiter):
+    """
+    Token bucket limiter
+
+    Tokens refill continuously at `rate` per second up to `capacity`, which
+    is the largest burst allowed after an idle period.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Bucket size (burst); defaults to one second worth of tokens
+            clock: Monotonic clock returning seconds
+        """
+        super().__init__(clock)
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1)
+        self.tokens = self.capacity
+        self.updated = clock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated = now
+
+    def _max_weight(self) -> float:
+        return self.capacity
+
+    def _try_acquire(self, weight: float, now: float) -> Optional[float]:
+        self._refill(now)
+        if self.tokens >= weight:
+            self.tokens -= weight
+            return weight
+        return None
+
+    def _time_until(self, weight: float, now: float) -> float:
+        self._refill(now)
+        return (weight - self.tokens) / self.rate
+
+    def _refund(self, grant: float, now: float) -> None:
+        self._refill(now)
+        self.tokens = min(self.capacity, self.tokens + grant)
+
+
+class SlidingWindowLog(FifoRateLimiter):
+    """
+    Sliding window log limiter
+
+    Keeps a timestamped log of grants and allows at most `limit` permits in
+    any window of `window` seconds. Exact, at O(limit) memory.
+    """
+
+    def __init__(self, limit: float, window: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(clock)
+        self.limit = limit
+        self.window = window
+        self.log: Deque[Tuple[float, float]] = deque()
+        self.used = 0.0
+
+    def _evict(self, now: float) -> None:
+        horizon = now - self.window
+        while self.log and self.log[0][0] <= horizon:
+            self.used -= self.log.popleft()[1]
+
+    def _max_weight(self) -> float:
+        return self.limit
+
+    def _try_acquire(self, weight: float, now: float) -> Optional[Tuple[float, float]]:
+        self._evict(now)
+        if self.used + weight <= self.limit:
+            entry = (now, weight)
+            self.log.append(entry)
+            self.used += weight
+            return entry
+        return None
+
+    def _time_until(self, weight: float, now: float) -> float:
+        self._evict(now)
+        needed = self.used + weight - self.limit
+        for stamp, granted in self.log:
+            needed -= granted
+            if needed <= 0:
+                return stamp + self.window - now
+        return 0.0
+
+    def _refund(self, grant: Tuple[float, float], now: float) -> None:
+        # Remove the grant's own entry; once evicted it no longer counts
+        try:
+            self.log.remove(grant)
+        except ValueError:
+            return
+        self.used -= grant[1]
+
+
+class SlidingWindowCounter(FifoRateLimiter):
+    """
+    Sliding window counter limiter
+
+    Approximates a sliding window with two fixed windows: the previous
+    window's count is weighted by how much of it still overlaps the sliding
+    window. Constant memory, slightly approximate at window boundaries.
+    """
+
+    def __init__(self, limit: float, window: float = 1.0,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__(clock)
+        self.limit = limit
+        self.window = window
+        self.current_start = clock()
+        self.current = 0.0
+        self.previous = 0.0
+
+    def _roll(self, now: float) -> None:
+        elapsed_windows = int((now - self.current_start) // self.window)
+        if elapsed_windows >= 1:
+            self.previous = self.current if elapsed_windows == 1 else 0.0
+            self.current = 0.0
+            self.current_start += elapsed_windows * self.window
+
+    def _estimate(self, now: float) -> float:
+        overlap = 1.0 - (now - self.current_start) / self.window
+        return self.previous * overlap + self.current
+
+    def _max_weight(self) -> float:
+        return self.limit
+
+    def _try_acquire(self, weight: float, now: float) -> Optional[float]:
+        self._roll(now)
+        if self._estimate(now) + weight <= self.limit:
+            self.current += weight
+            return weight
+        return None
+
+    def _time_until(self, weight: float, now: float) -> float:
+        self._roll(now)
+        excess = self._estimate(now) + weight - self.limit
+        window_end = self.current_start + self.window - now
+        if self.previous <= 0:
+            return window_end
+        # The previous window's contribution decays linearly over the window
+        return min(window_end, excess * self.window / self.previous)
+
+    def _refund(self, grant: float, now: float) -> None:
+        self._roll(now)
+        self.current = max(0.0, self.current - grant)
@@ -0,0 +1,255 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+import logging
+
+from challenge import AsyncRateLimiter
+from metrics import Histogram
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CLASSES: Dict[str, float] = {"interactive": 8.0, "default": 4.0, "bulk": 1.0}
+
+
+@dataclass
+class _Job:
+    coro_fn: Callable
+    args: tuple
+    kwargs: dict
+    weight: float
+    enqueued: float
+    future: asyncio.Future
+    task: Optional[asyncio.Task] = None
+
+
+@dataclass
+class _PriorityClass:
+    name: str
+    share: float
+    queue: Deque[_Job] = field(default_factory=deque)
+    finish: float = 0.0
+    waits: Histogram = field(default_factory=Histogram)
+    dispatched: int = 0
+    cancelled: int = 0
+
+
+class PriorityScheduler:
+    """
+    Priority-aware scheduler in front of an AsyncRateLimiter
+
+    Work is queued per priority class and released to the rate limiter one
+    job at a time, so the limiter's FIFO queue never fills with bulk work
+    ahead of latency-sensitive requests:
+
+    - classes share the limiter by weighted fair queuing: each class gets
+      throughput proportional to its `share` while it has queued work
+    - aging: a job that has waited longer than `max_wait` is dispatched
+      ahead of the fair-queuing order (oldest first), so low-share classes
+      cannot starve
+    - queued jobs can be cancelled through the future returned by
+      `submit`; cancelling a started job cancels its task
+
+    Queue-wait times are recorded per class in `Histogram`s.
+    """
+
+    def __init__(self, limiter: AsyncRateLimiter, classes: Optional[Dict[str, float]] = None,
+                 max_wait: float = 2.0):
+        """
+        Args:
+            limiter: Rate limiter the scheduled work goes through
+            classes: Mapping of priority class name to its share
+            max_wait: Queue wait (seconds) after which a job is aged ahead
+        """
+        self.limiter = limiter
+        self.max_wait = max_wait
+        self.classes = {
+            name: _PriorityClass(name, share)
+            for name, share in (classes or DEFAULT_CLASSES).items()
+        }
+        self.virtual_time = 0.0
+        self.aged = 0
+        self._wakeup = asyncio.Event()
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._running: set = set()
+        self._current: Optional[_Job] = None
+        # Tokens acquired for jobs cancelled while waiting for the limiter,
+        # spent on the next jobs instead of being lost
+        self._credit = 0.0
+
+    async def __aenter__(self) -> "PriorityScheduler":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            await self.join()
+        await self.close()
+        return False
+
+    def start(self) -> None:
+        if self._dispatcher is None:
+            self._dispatcher = asyncio.create_task(self._dispatch_loop())
+
+    async def close(self) -> None:
+        """Stop dispatching and cancel queued and running jobs"""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            await asyncio.gather(self._dispatcher, return_exceptions=True)
+            self._dispatcher = None
+        if self._current is not None:
+            self._current.future.cancel()
+        for cls in self.classes.values():
+            while cls.queue:
+                cls.queue.popleft().future.cancel()
+        for task in list(self._running):
+            task.cancel()
+        await asyncio.gather(*self._running, return_exceptions=True)
+
+    async def join(self) -> None:
+        """Wait until every queued and running job has finished"""
+        while True:
+            pending = [
+                job.future for cls in self.classes.values()
+                for job in cls.queue if not job.future.done()
+            ]
+            if self._current is not None and not self._current.future.done():
+                pending.append(self._current.future)
+            if not pending and not self._running:
+                return
+            await asyncio.gather(*pending, *self._running, return_exceptions=True)
+
+    @property
+    def queued(self) -> int:
+        """Number of jobs waiting to be dispatched"""
+        return sum(
+            1 for cls in self.classes.values() for job in cls.queue if not job.future.done()
+        )
+
+    def submit(self, coro_fn: Callable, *args, priority: str = "default",
+               weight: float = 1, **kwargs) -> asyncio.Future:
+        """
+        Queue `coro_fn(*args, **kwargs)` in a priority class
+
+        Returns:
+            Future resolved with the coroutine's result. Cancelling it
+            removes the job from the queue, or cancels it if already running.
+        """
+        if priority not in self.classes:
+            raise ValueError(f"Unknown priority class: {priority}")
+        max_weight = self.limiter.max_weight
+        if weight <= 0 or weight > max_weight:
+            raise ValueError(f"Weight must be in (0, {max_weight}], got {weight}")
+        self.start()
+        loop = asyncio.get_running_loop()
+        job = _Job(coro_fn, args, kwargs, weight, loop.time(), loop.create_future())
+        job.future.add_done_callback(lambda future: self._on_done(job))
+        cls = self.classes[priority]
+        self._purge(cls)
+        if not cls.queue:
+            # The class becomes backlogged: it starts at the current virtual
+            # time instead of claiming credit for the time it was idle
+            cls.finish = max(cls.finish, self.virtual_time)
+        cls.queue.append(job)
+        self._wakeup.set()
+        return job.future
+
+    def _on_done(self, job: _Job) -> None:
+        if job.future.cancelled() and job.task is not None:
+            job.task.cancel()
+
+    def _purge(self, cls: _PriorityClass) -> None:
+        while cls.queue and cls.queue[0].future.done():
+            cls.queue.popleft()
+            cls.cancelled += 1
+
+    def _pick(self, now: float) -> Optional[_PriorityClass]:
+        """Choose the class to dispatch from: aged work first, then fair queuing"""
+        candidates = []
+        for cls in self.classes.values():
+            self._purge(cls)
+            if cls.queue:
+                candidates.append(cls)
+        if not candidates:
+            return None
+
+        oldest = min(candidates, key=lambda cls: cls.queue[0].enqueued)
+        if now - oldest.queue[0].enqueued >= self.max_wait:
+            self.aged += 1
+            return oldest
+
+        return min(candidates, key=lambda cls: cls.finish + cls.queue[0].weight / cls.share)
+
+    async def _dispatch_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            cls = self._pick(loop.time())
+            if cls is None:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            job = cls.queue.popleft()
+            self._current = job
+            from_credit = min(self._credit, job.weight)
+            try:
+                if job.weight > from_credit:
+                    await self.limiter.acquire(job.weight - from_credit)
+            except Exception as e:
+                # Fail this job only; the dispatcher keeps serving the others
+                logger.error(f"Rate limiter rejected a {cls.name} job: {e!r}")
+                if not job.future.done():
+                    job.future.set_exception(e)
+                continue
+            finally:
+                self._current = None
+            self._credit -= from_credit
+            if job.future.done():
+                # Cancelled while waiting for the limiter: its tokens go to
+                # the next job
+                self._credit = min(self._credit + job.weight, self.limiter.max_weight)
+                cls.cancelled += 1
+                continue
+
+            self.virtual_time = max(self.virtual_time, cls.finish)
+            cls.finish += job.weight / cls.share
+            cls.dispatched += 1
+            cls.waits.observe(loop.time() - job.enqueued)
+
+            job.task = asyncio.create_task(self._run(job))
+            self._running.add(job.task)
+            job.task.add_done_callback(self._running.discard)
+
+    async def _run(self, job: _Job) -> None:
+        try:
+            result = await job.coro_fn(*job.args, **job.kwargs)
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+        except Exception as e:
+            if not job.future.done():
+                job.future.set_exception(e)
+            return
+        if not job.future.done():
+            job.future.set_result(result)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-class counters and queue-wait percentiles"""
+        return {
+            name: {
+                "queued": sum(1 for job in cls.queue if not job.future.done()),
+                "dispatched": cls.dispatched,
+                "cancelled": cls.cancelled,
+                "wait_p50": cls.waits.quantile(0.5),
+                "wait_p99": cls.waits.quantile(0.99),
+            }
+            for name, cls in self.classes.items()
+        }
+
+    def to_prometheus(self) -> str:
+        """Per-class queue-wait histograms in Prometheus text format"""
+        name = "scheduler_queue_wait_seconds"
+        lines = [f"# HELP {name} Time jobs spent queued before dispatch", f"# TYPE {name} histogram"]
+        for cls in self.classes.values():
+            lines.extend(cls.waits.to_prometheus(name, f'class="{cls.name}"'))
+        return "\n".join(lines) + "\n"
@@ -0,0 +1,196 @@
+import asyncio
+import contextvars
+import math
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMPLETED = "completed"
+TIMED_OUT = "timed_out"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+# Absolute loop-time deadline inherited by tasks started inside a group, so
+# nested groups and helpers can never outlive the request that spawned them
+current_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "current_deadline", default=None
+)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the inherited deadline, or None if there is none"""
+    deadline = current_deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - asyncio.get_running_loop().time())
+
+
+@dataclass
+class TaskOutcome:
+    """Result of a single task run by a BoundedTaskGroup"""
+    name: str
+    status: str
+    result: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+
+@dataclass
+class TaskGroupSummary:
+    """Aggregate view of every task run by a BoundedTaskGroup"""
+    completed: List[TaskOutcome] = field(default_factory=list)
+    timed_out: List[TaskOutcome] = field(default_factory=list)
+    cancelled: List[TaskOutcome] = field(default_factory=list)
+    failed: List[TaskOutcome] = field(default_factory=list)
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    histogram: Dict[float, int] = field(default_factory=dict)
+
+    def record(self, outcome: TaskOutcome) -> None:
+        getattr(self, outcome.status).append(outcome)
+        for bound in self.buckets:
+            if outcome.latency <= bound:
+                self.histogram[bound] = self.histogram.get(bound, 0) + 1
+                break
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "completed": [outcome.result for outcome in self.completed],
+            "timed_out": [outcome.name for outcome in self.timed_out],
+            "cancelled": [outcome.name for outcome in self.cancelled],
+            "failed": {outcome.name: repr(outcome.error) for outcome in self.failed},
+            "latency_histogram": {
+                ("+Inf" if bound == math.inf else f"<={bound}s"): self.histogram.get(bound, 0)
+                for bound in self.buckets
+            },
+        }
+
+
+class BoundedTaskGroup:
+    """
+    asyncio.TaskGroup with a concurrency limit and deadlines
+
+    - at most `max_concurrency` tasks run at once; the rest wait for a slot
+    - each task is bounded by `task_timeout` and by the group `timeout`,
+      whichever expires first (tasks still waiting for a slot when the
+      group deadline passes are never started)
+    - the group deadline is propagated through `current_deadline`, so
+      nested groups inherit the tighter of the two deadlines
+    - a failing task is recorded instead of cancelling its siblings
+    - leaving the `async with` block waits for every task, so no task is
+      ever orphaned
+
+    Completions can be consumed while the group runs with `as_completed()`,
+    and `summary` holds the structured result afterwards.
+    """
+
+    def __init__(self, max_concurrency: int, task_timeout: Optional[float] = None,
+                 timeout: Optional[float] = None, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            max_concurrency: Maximum number of tasks running at the same time
+            task_timeout: Default deadline for each task, in seconds
+            timeout: Deadline for the whole group, in seconds
+            buckets: Upper bounds of the latency histogram buckets
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self.max_concurrency = max_concurrency
+        self.task_timeout = task_timeout
+        self.timeout = timeout
+        self.summary = TaskGroupSummary(buckets=buckets)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._group: Optional[asyncio.TaskGroup] = None
+        self._deadline: Optional[float] = None
+        self._completions: asyncio.Queue = asyncio.Queue()
+        self._outstanding = 0
+        self._counter = 0
+
+    async def __aenter__(self) -> "BoundedTaskGroup":
+        loop = asyncio.get_running_loop()
+        deadline = current_deadline.get()
+        if self.timeout is not None:
+            own = loop.time() + self.timeout
+            deadline = own if deadline is None else min(deadline, own)
+        self._deadline = deadline
+        self._group = asyncio.TaskGroup()
+        await self._group.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        return await self._group.__aexit__(exc_type, exc_val, exc_tb)
+
+    def create_task(self, coro: Awaitable, name: Optional[str] = None,
+                    timeout: Optional[float] = None) -> asyncio.Task:
+        """
+        Schedule `coro` in the group
+
+        Args:
+            coro: Coroutine to run
+            name: Name used in the summary (defaults to a sequence number)
+            timeout: Per-task deadline overriding `task_timeout`
+        """
+        if self._group is None:
+            raise RuntimeError("BoundedTaskGroup must be entered with 'async with'")
+        self._counter += 1
+        name = name or f"task-{self._counter}"
+        self._outstanding += 1
+        task_timeout = timeout if timeout is not None else self.task_timeout
+        return self._group.create_task(self._run(name, coro, task_timeout), name=name)
+
+    async def as_completed(self) -> AsyncIterator[TaskOutcome]:
+        """Yield outcomes as tasks finish, until no task is outstanding"""
+        while self._outstanding or not self._completions.empty():
+            yield await self._completions.get()
+
+    def _finish(self, outcome: TaskOutcome) -> None:
+        self._outstanding -= 1
+        self.summary.record(outcome)
+        self._completions.put_nowait(outcome)
+
+    async def _run(self, name: str, coro: Awaitable, task_timeout: Optional[float]) -> Any:
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        started = False
+        scope = None
+        try:
+            async with asyncio.timeout_at(self._deadline):
+                await self._semaphore.acquire()
+            try:
+                started = True
+                start = loop.time()
+                deadline = self._deadline
+                if task_timeout is not None:
+                    own = start + task_timeout
+                    deadline = own if deadline is None else min(deadline, own)
+                current_deadline.set(deadline)
+                async with asyncio.timeout_at(deadline) as scope:
+                    result = await coro
+            finally:
+                self._semaphore.release()
+        except TimeoutError as e:
+            if not started:
+                coro.close()
+            if scope is not None and not scope.expired():
+                # Raised by the task itself rather than by its deadline
+                logger.error(f"{name} failed: {e!r}")
+                self._finish(TaskOutcome(name, FAILED, error=e, latency=loop.time() - queued_at))
+                return None
+            logger.warning(f"{name} exceeded its deadline")
+            self._finish(TaskOutcome(name, TIMED_OUT, latency=loop.time() - queued_at))
+            return None
+        except asyncio.CancelledError:
+            if not started:
+                coro.close()
+            self._finish(TaskOutcome(name, CANCELLED, latency=loop.time() - queued_at))
+            raise
+        except Exception as e:
+            logger.error(f"{name} failed: {e}")
+            self._finish(TaskOutcome(name, FAILED, error=e, latency=loop.time() - queued_at))
+            return None
+
+        self._finish(TaskOutcome(name, COMPLETED, result=result, latency=loop.time() - queued_at))
+        return result
@@ -0,0 +1,68 @@
+"""
+Tests for LoopMonitor in instrumentation.py
+"""
+import asyncio
+import time
+import urllib.request
+
+from instrumentation import LoopMonitor
+
+
+async def mostly_waiting():
+    await asyncio.sleep(0.05)
+
+
+async def mostly_busy():
+    start = time.perf_counter()
+    while time.perf_counter() - start < 0.03:
+        pass
+
+
+def test_busy_and_await_time_per_coroutine():
+    """The task factory separates time spent running from time spent awaiting"""
+    async def scenario():
+        async with LoopMonitor(report_interval=None) as monitor:
+            await asyncio.gather(
+                asyncio.create_task(mostly_waiting()),
+                asyncio.create_task(mostly_busy()),
+            )
+        return monitor.coroutines
+
+    stats = asyncio.run(scenario())
+    waiting, busy = stats["mostly_waiting"], stats["mostly_busy"]
+    assert waiting.count == 1 and busy.count == 1
+    assert waiting.busy < 0.005 and waiting.awaiting >= 0.04
+    assert busy.busy >= 0.025 and busy.max_step >= 0.025
+
+
+def test_blocking_call_is_flagged_with_stack():
+    """Blocking the loop raises the lag and records where it was blocked"""
+    def blocking_helper():
+        time.sleep(0.3)
+
+    async def scenario():
+        async with LoopMonitor(interval=0.02, slow_callback_ms=50, report_interval=None) as monitor:
+            await asyncio.sleep(0.05)
+            blocking_helper()
+            await asyncio.sleep(0.05)
+        return monitor
+
+    monitor = asyncio.run(scenario())
+    assert monitor.slow_callbacks == 1
+    assert "blocking_helper" in monitor.last_slow_stack
+    assert monitor.lag.quantile(1.0) >= 0.25
+
+
+def test_prometheus_endpoint():
+    """The exporter serves metrics over HTTP in Prometheus text format"""
+    async def scenario():
+        async with LoopMonitor(interval=0.01, report_interval=None) as monitor:
+            port = monitor.serve(port=0)
+            await asyncio.sleep(0.05)
+            url = f"http://127.0.0.1:{port}/metrics"
+            return await asyncio.to_thread(lambda: urllib.request.urlopen(url).read().decode())
+
+    body = asyncio.run(scenario())
+    assert "# TYPE asyncio_loop_lag_seconds histogram" in body
+    assert 'asyncio_loop_lag_seconds_bucket{le="+Inf"}' in body
+    assert "asyncio_tasks_live " in body
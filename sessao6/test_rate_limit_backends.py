@@ -0,0 +1,150 @@
+"""
+Tests for the shared-state rate limit backends in rate_limit_backends.py
+"""
+import asyncio
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from challenge import AsyncRateLimiter
+from rate_limit_backends import (
+    DistributedRateLimiter,
+    InMemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+)
+
+
+def run_limited(limiter, total):
+    """Acquire `total` tokens one at a time and return the elapsed time"""
+    async def scenario():
+        start = time.monotonic()
+        await asyncio.gather(*(limiter.acquire() for _ in range(total)))
+        return time.monotonic() - start
+
+    return asyncio.run(scenario())
+
+
+def sqlite_worker(path, duration, counter):
+    """Acquire as many tokens as possible from the shared bucket for `duration` seconds"""
+    backend = SQLiteBackend(path)
+    limiter = DistributedRateLimiter(backend, "shared", rate=100, capacity=10, batch=2)
+
+    async def scenario():
+        deadline = time.monotonic() + duration
+        acquired = 0
+        while time.monotonic() < deadline:
+            await limiter.acquire()
+            acquired += 1
+        return acquired
+
+    acquired = asyncio.run(scenario())
+    with counter.get_lock():
+        counter.value += acquired
+    backend.close()
+
+
+def test_in_memory_backend_enforces_rate():
+    """Tokens beyond the burst are released at the configured rate"""
+    limiter = DistributedRateLimiter(InMemoryBackend(), "k", rate=100, capacity=10)
+    elapsed = run_limited(limiter, 60)
+    assert elapsed == pytest.approx(0.5, abs=0.1)
+
+
+def test_batch_prefetch_amortises_round_trips():
+    """Pre-fetching tokens reduces backend calls per acquire"""
+    single = DistributedRateLimiter(InMemoryBackend(), "k", rate=10_000, capacity=1000)
+    batched = DistributedRateLimiter(InMemoryBackend(), "k", rate=10_000, capacity=1000, batch=50)
+    run_limited(single, 500)
+    run_limited(batched, 500)
+    assert single.round_trips == 500
+    assert batched.round_trips == 10
+
+
+def test_sqlite_backend_shared_across_processes(tmp_path):
+    """Several processes sharing a SQLite file respect one collective quota"""
+    path = str(tmp_path / "limits.db")
+    SQLiteBackend(path).close()
+    counter = multiprocessing.Value("i", 0)
+    duration = 1.0
+    workers = [
+        multiprocessing.Process(target=sqlite_worker, args=(path, duration, counter))
+        for _ in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    # burst + rate * duration, with some slack for process start-up skew
+    assert 60 <= counter.value <= 10 + 100 * duration + 20
+
+
+def test_sqlite_backend_shares_one_connection(tmp_path):
+    """Calls from executor threads reuse one connection, which close() releases"""
+    backend = SQLiteBackend(str(tmp_path / "limits.db"))
+    limiter = DistributedRateLimiter(backend, "k", rate=1000, capacity=100)
+    run_limited(limiter, 20)
+    assert limiter.round_trips == 20
+    backend.close()
+    with pytest.raises(RuntimeError):
+        backend.take("k", 1000, 100, 1, 1)
+
+
+def test_cancelled_acquire_keeps_taken_tokens():
+    """Tokens taken by a backend call whose acquire was cancelled are not lost"""
+    entered, release = threading.Event(), threading.Event()
+
+    class BlockingBackend(InMemoryBackend):
+        def take(self, *args):
+            entered.set()
+            release.wait(timeout=5)
+            return super().take(*args)
+
+    async def scenario():
+        limiter = DistributedRateLimiter(BlockingBackend(), "k", rate=1, capacity=5, batch=5)
+        task = asyncio.create_task(limiter.acquire())
+        await asyncio.to_thread(entered.wait, 5)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        release.set()
+        for _ in range(500):
+            if limiter.local_tokens:
+                break
+            await asyncio.sleep(0.01)
+        return task.cancelled(), limiter.local_tokens
+
+    assert asyncio.run(scenario()) == (True, 5)
+
+
+def test_redis_backend_lua_token_bucket():
+    """The Lua script grants up to the capacity, then asks the caller to wait"""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    backend = RedisBackend(fakeredis.FakeRedis(server=server))
+    other = RedisBackend(fakeredis.FakeRedis(server=server))
+
+    granted, wait = backend.take("api", rate=1, capacity=5, min_tokens=1, max_tokens=3)
+    assert (granted, wait) == (3, 0)
+    granted, wait = other.take("api", rate=1, capacity=5, min_tokens=1, max_tokens=3)
+    assert granted == pytest.approx(2, abs=0.05)
+    granted, wait = backend.take("api", rate=1, capacity=5, min_tokens=1, max_tokens=1)
+    assert granted == 0
+    assert 0 < wait <= 1
+
+
+def test_async_rate_limiter_with_backend():
+    """AsyncRateLimiter uses the shared backend when one is given"""
+    async def scenario():
+        limiter = AsyncRateLimiter(tasks_per_second=100, burst=5, backend=InMemoryBackend(), batch=5)
+
+        async def work(i):
+            return i
+
+        return await asyncio.gather(*(limiter.execute(work, i) for i in range(10))), limiter
+
+    results, limiter = asyncio.run(scenario())
+    assert results == list(range(10))
+    assert isinstance(limiter.limiter, DistributedRateLimiter)
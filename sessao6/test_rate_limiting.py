@@ -0,0 +1,141 @@
+"""
+Tests for the rate limiters in rate_limiting.py
+"""
+import asyncio
+import time
+
+import pytest
+
+from challenge import AsyncRateLimiter
+from rate_limiting import SlidingWindowCounter, SlidingWindowLog, TokenBucket
+
+
+def measure_rate(limiter, total):
+    """Run `total` single-permit tasks and return the steady-state grant rate"""
+    async def scenario():
+        grants = []
+
+        async def task():
+            async with limiter:
+                grants.append(time.monotonic())
+
+        await asyncio.gather(*(task() for _ in range(total)))
+        return grants
+
+    grants = asyncio.run(scenario())
+    # Skip the initial burst and the time spent spawning the tasks
+    first = total // 10
+    return (total - 1 - first) / (grants[-1] - grants[first])
+
+
+def test_token_bucket_rate_within_2_percent_at_10k_per_second():
+    """The achieved rate matches the configured rate at 10k tasks/s"""
+    rate = measure_rate(TokenBucket(rate=10_000, capacity=100), total=30_000)
+    assert rate == pytest.approx(10_000, rel=0.02)
+
+
+def test_sliding_window_log_rate():
+    """The log limiter never exceeds its limit over a full window"""
+    rate = measure_rate(SlidingWindowLog(limit=500, window=0.1), total=15_000)
+    assert rate == pytest.approx(5_000, rel=0.05)
+
+
+def test_sliding_window_counter_rate():
+    """The counter limiter approximates the configured rate"""
+    rate = measure_rate(SlidingWindowCounter(limit=500, window=0.1), total=15_000)
+    assert rate == pytest.approx(5_000, rel=0.1)
+
+
+def test_waiters_are_served_fifo():
+    """A cheap request never overtakes an expensive one queued before it"""
+    async def scenario():
+        bucket = TokenBucket(rate=100, capacity=10)
+        await bucket.acquire(10)
+        order = []
+
+        async def worker(name, weight):
+            await bucket.acquire(weight)
+            order.append(name)
+
+        heavy = asyncio.create_task(worker("heavy", 8))
+        await asyncio.sleep(0)
+        light = asyncio.create_task(worker("light", 1))
+        await asyncio.gather(heavy, light)
+        return order
+
+    assert asyncio.run(scenario()) == ["heavy", "light"]
+
+
+def test_weighted_acquire_consumes_tokens():
+    """Weighted acquire takes several tokens at once"""
+    async def scenario():
+        bucket = TokenBucket(rate=1, capacity=5)
+        async with bucket.weighted(4):
+            pass
+        return bucket.try_acquire(2), bucket.try_acquire(1)
+
+    assert asyncio.run(scenario()) == (False, True)
+
+
+def test_weight_larger_than_capacity_is_rejected():
+    bucket = TokenBucket(rate=10, capacity=5)
+    with pytest.raises(ValueError):
+        asyncio.run(bucket.acquire(6))
+
+
+def test_cancelled_waiter_does_not_block_queue():
+    """Cancelling a queued acquire lets the next waiter through"""
+    async def scenario():
+        bucket = TokenBucket(rate=50, capacity=1)
+        await bucket.acquire()
+        blocked = asyncio.create_task(bucket.acquire())
+        await asyncio.sleep(0)
+        blocked.cancel()
+        start = time.monotonic()
+        await bucket.acquire()
+        return time.monotonic() - start, bucket.waiting
+
+    elapsed, waiting = asyncio.run(scenario())
+    assert elapsed < 0.1
+    assert waiting == 0
+
+
+def test_cancelled_grant_refunds_its_own_log_entry():
+    """A waiter cancelled after being granted removes its entry, not a later one"""
+    async def scenario():
+        now = [0.0]
+        limiter = SlidingWindowLog(limit=2, window=10, clock=lambda: now[0])
+        limiter.try_acquire()
+        now[0] = 1.0
+        limiter.try_acquire()
+        first = asyncio.create_task(limiter.acquire())
+        second = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+
+        # Grant both waiters at different times before either resumes
+        now[0] = 10.0
+        limiter._wake()
+        now[0] = 11.0
+        limiter._wake()
+        first.cancel()
+        await asyncio.gather(first, second, return_exceptions=True)
+        return list(limiter.log), limiter.used
+
+    assert asyncio.run(scenario()) == ([(11.0, 1)], 1)
+
+
+def test_async_rate_limiter_execute():
+    """AsyncRateLimiter spaces calls according to the configured rate"""
+    async def scenario():
+        limiter = AsyncRateLimiter(tasks_per_second=100, burst=1)
+
+        async def work(i):
+            return i
+
+        start = time.monotonic()
+        results = await asyncio.gather(*(limiter.execute(work, i) for i in range(21)))
+        return results, time.monotonic() - start
+
+    results, elapsed = asyncio.run(scenario())
+    assert results == list(range(21))
+    assert elapsed == pytest.approx(0.2, abs=0.05)
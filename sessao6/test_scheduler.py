@@ -0,0 +1,161 @@
+"""
+Tests for PriorityScheduler in scheduler.py
+"""
+import asyncio
+
+import pytest
+
+from challenge import AsyncRateLimiter
+from scheduler import PriorityScheduler
+
+
+async def record(order, name):
+    order.append(name)
+    return name
+
+
+def test_interactive_work_overtakes_queued_bulk_work():
+    """Latency-sensitive jobs don't wait behind bulk jobs queued earlier"""
+    async def scenario():
+        order = []
+        limiter = AsyncRateLimiter(tasks_per_second=500, burst=1)
+        async with PriorityScheduler(limiter, max_wait=10) as scheduler:
+            for i in range(40):
+                scheduler.submit(record, order, f"bulk-{i}", priority="bulk")
+            for i in range(5):
+                scheduler.submit(record, order, f"interactive-{i}", priority="interactive")
+        return order
+
+    order = asyncio.run(scenario())
+    positions = [order.index(f"interactive-{i}") for i in range(5)]
+    assert max(positions) < 10
+
+
+def test_classes_share_throughput_by_weight():
+    """Saturated classes are dispatched in proportion to their shares"""
+    async def scenario():
+        order = []
+        limiter = AsyncRateLimiter(tasks_per_second=2000, burst=1)
+        scheduler = PriorityScheduler(limiter, classes={"a": 3, "b": 1}, max_wait=10)
+        async with scheduler:
+            for i in range(100):
+                scheduler.submit(record, order, "a", priority="a")
+                scheduler.submit(record, order, "b", priority="b")
+        return order[:80]
+
+    first = asyncio.run(scenario())
+    assert first.count("a") == 60
+    assert first.count("b") == 20
+
+
+def test_aging_prevents_starvation():
+    """A low-share job is dispatched once it has waited longer than max_wait"""
+    async def scenario():
+        order = []
+        limiter = AsyncRateLimiter(tasks_per_second=1000, burst=1)
+        scheduler = PriorityScheduler(limiter, classes={"hot": 1_000_000, "cold": 1}, max_wait=0.02)
+        async with scheduler:
+            cold = scheduler.submit(record, order, "cold", priority="cold")
+            for _ in range(200):
+                scheduler.submit(record, order, "hot", priority="hot")
+            await cold
+            position = len(order)
+        return position, scheduler.aged
+
+    position, aged = asyncio.run(scenario())
+    assert position < 100
+    assert aged >= 1
+
+
+def test_cancel_queued_job():
+    """Cancelling a queued job removes it without running it"""
+    async def scenario():
+        order = []
+        limiter = AsyncRateLimiter(tasks_per_second=100, burst=1)
+        async with PriorityScheduler(limiter) as scheduler:
+            futures = [scheduler.submit(record, order, i) for i in range(5)]
+            futures[3].cancel()
+            queued = (scheduler.queued, scheduler.stats()["default"]["queued"])
+        return order, scheduler.stats()["default"], queued
+
+    order, stats, queued = asyncio.run(scenario())
+    assert queued == (4, 4)
+    assert order == [0, 1, 2, 4]
+    assert stats["cancelled"] == 1
+    assert stats["dispatched"] == 4
+
+
+def test_oversize_job_does_not_stall_the_queue():
+    """A job heavier than the limiter allows is rejected; later jobs still run"""
+    async def scenario():
+        limiter = AsyncRateLimiter(tasks_per_second=100, burst=5)
+        async with PriorityScheduler(limiter) as scheduler:
+            with pytest.raises(ValueError):
+                scheduler.submit(record, [], "heavy", weight=10)
+            return await asyncio.wait_for(scheduler.submit(record, [], "normal"), timeout=1)
+
+    assert asyncio.run(scenario()) == "normal"
+
+
+def test_limiter_errors_fail_only_their_job():
+    """An exception from the limiter is set on the job and dispatching goes on"""
+    class FlakyLimiter(AsyncRateLimiter):
+        async def acquire(self, weight=1):
+            if weight == 2:
+                raise RuntimeError("backend unavailable")
+            await super().acquire(weight)
+
+    async def scenario():
+        limiter = FlakyLimiter(tasks_per_second=100, burst=5)
+        async with PriorityScheduler(limiter) as scheduler:
+            failing = scheduler.submit(record, [], "flaky", weight=2)
+            normal = scheduler.submit(record, [], "normal")
+            results = await asyncio.wait_for(
+                asyncio.gather(failing, normal, return_exceptions=True), timeout=1
+            )
+        return results
+
+    error, result = asyncio.run(scenario())
+    assert isinstance(error, RuntimeError)
+    assert result == "normal"
+
+
+def test_cancelled_job_tokens_go_to_the_next_job():
+    """Tokens taken for a job cancelled at the limiter are not lost"""
+    class CountingLimiter(AsyncRateLimiter):
+        acquired = 0
+
+        async def acquire(self, weight=1):
+            await super().acquire(weight)
+            self.acquired += weight
+
+    async def scenario():
+        order = []
+        limiter = CountingLimiter(tasks_per_second=20, burst=1)
+        async with PriorityScheduler(limiter) as scheduler:
+            first = scheduler.submit(record, order, "first")
+            cancelled = scheduler.submit(record, order, "cancelled")
+            last = scheduler.submit(record, order, "last")
+            await first
+            cancelled.cancel()
+            await last
+        return order, limiter.acquired
+
+    order, acquired = asyncio.run(scenario())
+    assert order == ["first", "last"]
+    assert acquired == 2
+
+
+def test_queue_wait_histograms_export():
+    async def scenario():
+        limiter = AsyncRateLimiter(tasks_per_second=1000, burst=10)
+        async with PriorityScheduler(limiter) as scheduler:
+            results = await asyncio.gather(
+                *(scheduler.submit(record, [], i, priority="interactive") for i in range(10))
+            )
+        return results, scheduler.to_prometheus()
+
+    results, text = asyncio.run(scenario())
+    assert results == list(range(10))
+    assert 'scheduler_queue_wait_seconds_count{class="interactive"} 10' in text
+    assert 'scheduler_queue_wait_seconds_bucket{class="bulk",le="+Inf"} 0' in text
@@ -0,0 +1,154 @@
+"""
+Tests for BoundedTaskGroup in task_group.py
+"""
+import asyncio
+
+import pytest
+
+from exercise import run_tasks_with_timeout
+from task_group import BoundedTaskGroup, remaining_time
+
+
+async def sleeper(delay, result=None, running=None):
+    if running is not None:
+        running["now"] += 1
+        running["peak"] = max(running["peak"], running["now"])
+    try:
+        await asyncio.sleep(delay)
+        return result
+    finally:
+        if running is not None:
+            running["now"] -= 1
+
+
+async def boom():
+    raise ValueError("boom")
+
+
+def test_concurrency_is_bounded():
+    """Never more than max_concurrency tasks run at the same time"""
+    running = {"now": 0, "peak": 0}
+
+    async def scenario():
+        async with BoundedTaskGroup(max_concurrency=10) as group:
+            for i in range(200):
+                group.create_task(sleeper(0.001, i, running))
+        return group.summary
+
+    summary = asyncio.run(scenario())
+    assert running["peak"] == 10
+    assert sorted(o.result for o in summary.completed) == list(range(200))
+
+
+def test_per_task_and_overall_deadlines():
+    """Slow tasks time out individually; queued work past the group deadline never starts"""
+    async def scenario():
+        async with BoundedTaskGroup(max_concurrency=1, task_timeout=0.05, timeout=0.2) as group:
+            group.create_task(sleeper(0.01, "fast"), name="fast")
+            group.create_task(sleeper(1.0), name="slow")
+            for i in range(10):
+                group.create_task(sleeper(0.1), name=f"queued-{i}")
+        return group.summary.to_dict()
+
+    loop_result = asyncio.run(scenario())
+    assert loop_result["completed"] == ["fast"]
+    assert "slow" in loop_result["timed_out"]
+    assert len(loop_result["timed_out"]) == 11
+    assert sum(loop_result["latency_histogram"].values()) == 12
+
+
+def test_failures_are_recorded_without_cancelling_siblings():
+    async def scenario():
+        async with BoundedTaskGroup(max_concurrency=2) as group:
+            group.create_task(boom(), name="bad")
+            group.create_task(sleeper(0.05, "ok"), name="good")
+        return group.summary.to_dict()
+
+    result = asyncio.run(scenario())
+    assert result["completed"] == ["ok"]
+    assert "ValueError" in result["failed"]["bad"]
+
+
+def test_timeout_raised_by_the_task_is_a_failure():
+    """A TimeoutError from the task's own code is not mistaken for its deadline"""
+    async def own_timeout():
+        raise TimeoutError("upstream timed out")
+
+    async def scenario():
+        async with BoundedTaskGroup(max_concurrency=2, task_timeout=1.0) as group:
+            group.create_task(own_timeout(), name="own")
+            group.create_task(sleeper(5), name="slow", timeout=0.05)
+        return group.summary
+
+    summary = asyncio.run(scenario())
+    assert [o.name for o in summary.failed] == ["own"]
+    assert isinstance(summary.failed[0].error, TimeoutError)
+    assert [o.name for o in summary.timed_out] == ["slow"]
+
+
+def test_streams_completions_in_finish_order():
+    async def scenario():
+        names = []
+        async with BoundedTaskGroup(max_concurrency=3) as group:
+            group.create_task(sleeper(0.06), name="c")
+            group.create_task(sleeper(0.02), name="a")
+            group.create_task(sleeper(0.04), name="b")
+            async for outcome in group.as_completed():
+                names.append(outcome.name)
+        return names
+
+    assert asyncio.run(scenario()) == ["a", "b", "c"]
+
+
+def test_deadline_propagates_to_nested_groups():
+    """A nested group cannot outlive the deadline of the task that created it"""
+    seen = {}
+
+    async def child():
+        seen["remaining"] = remaining_time()
+        inner = BoundedTaskGroup(max_concurrency=2, timeout=10)
+        seen["inner"] = inner
+        async with inner:
+            inner.create_task(sleeper(1.0), name="inner")
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        async with BoundedTaskGroup(max_concurrency=1, timeout=0.1) as outer:
+            outer.create_task(child())
+        return loop.time() - start
+
+    elapsed = asyncio.run(scenario())
+    assert elapsed < 0.5
+    assert seen["remaining"] == pytest.approx(0.1, abs=0.05)
+    assert seen["inner"]._deadline is not None
+    assert len(seen["inner"].summary.completed) == 0
+
+
+def test_outer_cancellation_leaves_no_orphans():
+    """Cancelling the owner cancels and awaits every task in the group"""
+    async def scenario():
+        group = BoundedTaskGroup(max_concurrency=5)
+
+        async def owner():
+            async with group:
+                for i in range(20):
+                    group.create_task(sleeper(10))
+
+        task = asyncio.create_task(owner())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return group.summary, len(asyncio.all_tasks())
+
+    summary, live = asyncio.run(scenario())
+    assert len(summary.cancelled) == 20
+    assert live == 1
+
+
+def test_run_tasks_with_timeout_summary():
+    result = asyncio.run(run_tasks_with_timeout(timeout=0.2, num_tasks=3))
+    assert sorted(result["timed_out"]) == ["Task 1", "Task 2", "Task 3"]
+    assert result["completed"] == []
+    assert result["cancelled"] == 3
@@ -0,0 +1,113 @@
+"""
+Benchmark: direct file handlers vs. the queue-based logging pipeline
+
+16 threads log at an aggregate target of 100k records/s. For each setup the
+script reports the latency of a single logging call as seen by the caller
+(p50/p99/max), the achieved rate and the number of dropped records.
+
+Run with: python benchmark_logging.py [seconds] [records_per_second]
+"""
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+
+from queue_logging import BLOCK, DROP, BatchedFileHandler, configure_queue_logging
+
+THREADS = 16
+TARGET_RATE = 100_000
+FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+def worker(logger, duration, per_thread_rate, latencies, start_barrier):
+    interval = 1.0 / per_thread_rate
+    samples = []
+    start_barrier.wait()
+    start = time.perf_counter()
+    next_at = start
+    i = 0
+    while True:
+        now = time.perf_counter()
+        if now - start >= duration:
+            break
+        if now < next_at:
+            # Sleep instead of spinning so producers don't starve the listener of the GIL
+            time.sleep(next_at - now)
+            continue
+        t0 = time.perf_counter_ns()
+        logger.info("request %d handled by %s", i, "worker")
+        samples.append(time.perf_counter_ns() - t0)
+        i += 1
+        next_at += interval
+    latencies.append(samples)
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def run(name, setup, duration, rate):
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    pipeline = setup()
+    logger = logging.getLogger("bench")
+
+    latencies = []
+    barrier = threading.Barrier(THREADS)
+    threads = [
+        threading.Thread(target=worker, args=(logger, duration, rate / THREADS, latencies, barrier))
+        for _ in range(THREADS)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    dropped = 0
+    if pipeline is not None:
+        dropped = pipeline.dropped
+        pipeline.stop()
+    for handler in root.handlers[:]:
+        handler.close()
+        root.removeHandler(handler)
+
+    samples = sorted(sample for thread_samples in latencies for sample in thread_samples)
+    print(
+        f"{name:<18} records={len(samples):>8} rate={len(samples) / elapsed:>9.0f}/s "
+        f"p50={percentile(samples, 50) / 1000:7.1f}us p99={percentile(samples, 99) / 1000:8.1f}us "
+        f"max={samples[-1] / 1000:9.1f}us dropped={dropped}"
+    )
+
+
+def main(duration=2.0, rate=TARGET_RATE):
+    directory = tempfile.mkdtemp()
+    formatter = logging.Formatter(FORMAT)
+
+    def direct():
+        handler = logging.FileHandler(os.path.join(directory, 'direct.log'))
+        handler.setFormatter(formatter)
+        root = logging.getLogger()
+        root.setLevel(logging.INFO)
+        root.addHandler(handler)
+        return None
+
+    def queued(policy):
+        def setup():
+            handler = BatchedFileHandler(os.path.join(directory, f'queue_{policy}.log'))
+            handler.setFormatter(formatter)
+            return configure_queue_logging([handler], level=logging.INFO, policy=policy)
+        return setup
+
+    print(f"{THREADS} threads, target {rate:.0f} records/s for {duration}s, logs in {directory}")
+    run("FileHandler", direct, duration, rate)
+    run("queue (drop)", queued(DROP), duration, rate)
+    run("queue (block)", queued(BLOCK), duration, rate)
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:3]))
@@ -1,22 +1,32 @@
 import logging
-from logging.handlers import TimedRotatingFileHandler
 import time
 
-def configure_rotating_log():
-    """Configure logging with daily rotation and detailed timestamps"""
+from queue_logging import DROP, BatchedCompressingRotatingFileHandler, configure_queue_logging
+
+def configure_rotating_log(maxsize=10000, policy=DROP, max_bytes=50 * 1024 * 1024, compression='gzip'):
+    """
+    Configure logging with daily (or size-based) rotation and detailed timestamps
+    
+    Records are handed to a bounded queue and written by a background
+    listener, so callers never wait on disk I/O. Rotated files are
+    compressed on a separate thread and the 7 most recent are kept.
     
-    logging.basicConfig(handlers=[], level=logging.DEBUG)
+    Returns:
+        QueueLogging handle exposing the dropped record counter
+    """
     
     formatter = logging.Formatter(
         fmt='%(asctime)s.%(msecs)03d - %(levelname)-8s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    file_handler = TimedRotatingFileHandler(
+    file_handler = BatchedCompressingRotatingFileHandler(
         'application.log',
+        max_bytes=max_bytes,
         when='midnight',
         interval=1,
-        backupCount=7,
+        backup_count=7,
+        compression=compression,
         encoding='utf-8'
     )
     file_handler.setFormatter(formatter)
@@ -24,9 +34,12 @@ def configure_rotating_log():
     console_handler = logging.StreamHandler()
     console_handler.setFormatter(formatter)
     
-    logger = logging.getLogger()
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    return configure_queue_logging(
+        [file_handler, console_handler],
+        level=logging.DEBUG,
+        maxsize=maxsize,
+        policy=policy,
+    )
 
 def log_sample_messages():
     """Log messages at different levels"""
@@ -46,6 +59,7 @@ def log_sample_messages():
     logger.info("Operation completed")
 
 if __name__ == "__main__":
-    configure_rotating_log()
+    pipeline = configure_rotating_log()
     log_sample_messages()
+    pipeline.stop()
     print("Enhanced logging completed. Check application.log* files")
\ No newline at end of file
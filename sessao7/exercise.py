@@ -1,27 +1,40 @@
 import time
 from contextlib import contextmanager
 
-class Timer:
-    def __init__(self, name="Code block"):
-        self.name = name
+import profiling
+
+class Timer(profiling.Timer):
+    """
+    Print the elapsed time of a block and record it in the profiler
+
+    Nested timers build a call tree in `profiling.default_profiler` (or the
+    given profiler); see profiling.py for aggregation and exports.
+    """
+    def __init__(self, name="Code block", profiler=None, verbose=True):
+        super().__init__(name, profiler)
+        self.verbose = verbose
         
     def __enter__(self):
         self.start_time = time.perf_counter()
-        return self
+        return super().__enter__()
         
     def __exit__(self, exc_type, exc_val, exc_tb):
+        super().__exit__(exc_type, exc_val, exc_tb)
         elapsed = time.perf_counter() - self.start_time
-        print(f"'{self.name}' executed in {elapsed:.4f} seconds")
+        if self.verbose:
+            print(f"'{self.name}' executed in {elapsed:.4f} seconds")
         return False
 
 @contextmanager
-def timer(name="Code block"):
+def timer(name="Code block", profiler=None, verbose=True):
     start_time = time.perf_counter()
     try:
-        yield
+        with profiling.timer(name, profiler):
+            yield
     finally:
         elapsed = time.perf_counter() - start_time
-        print(f"'{name}' executed in {elapsed:.4f} seconds")
+        if verbose:
+            print(f"'{name}' executed in {elapsed:.4f} seconds")
 
 if __name__ == "__main__":
     print("Testing class-based Timer:")
@@ -32,4 +45,17 @@ if __name__ == "__main__":
     print("\nTesting function-based timer:")
     with timer("Function timer test"):
         time.sleep(1)
-        [x**2 for x in range(10_000)]
\ No newline at end of file
+        [x**2 for x in range(10_000)]
+
+    print("\nTesting nested timers:")
+    with Timer("pipeline"):
+        for _ in range(5):
+            with Timer("load", verbose=False):
+                time.sleep(0.01)
+            with Timer("transform", verbose=False):
+                [x**2 for x in range(100_000)]
+
+    print("\nAggregated call tree:")
+    print(profiling.default_profiler.report())
+    print("\nPrometheus exposition:")
+    print(profiling.default_profiler.to_prometheus())
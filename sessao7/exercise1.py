@@ -1,15 +1,22 @@
 import logging
 
+from queue_logging import BatchedFileHandler, configure_queue_logging
+
 def configure_logging():
-    """Configure the root logger with basic settings"""
-    logging.basicConfig(
-        level=logging.DEBUG, 
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('application.log'),  
-            logging.StreamHandler()                
-        ]
-    )
+    """
+    Configure the root logger with basic settings
+    
+    File and console output run on a background queue listener.
+    """
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    handlers = [
+        BatchedFileHandler('application.log'),
+        logging.StreamHandler()
+    ]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    return configure_queue_logging(handlers, level=logging.DEBUG)
 
 def log_messages():
     """Log messages at different severity levels"""
@@ -26,6 +33,7 @@ def log_messages():
         logger.exception("Exception message: Logging an exception with traceback")
 
 if __name__ == "__main__":
-    configure_logging()
+    pipeline = configure_logging()
     log_messages()
+    pipeline.stop()
     print("Logging completed. Check application.log and console output.")
\ No newline at end of file
@@ -0,0 +1,450 @@
+"""
+Query rotated application logs
+
+Examples:
+    python log_query.py --level ERROR --since "2024-05-01 10:00" --until "2024-05-01 11:00" --group-by logger
+    python log_query.py logs/app.log* --grep "timeout" --limit 20
+
+Plain files are memory-mapped, rotated `.gz`/`.zst` segments are
+decompressed on the fly. Each file gets a sidecar `<file>.idx` listing
+blocks of records with their time range and the levels they contain, so
+time and level filters skip whole blocks without parsing them. Files and
+blocks are scanned in parallel worker processes.
+"""
+import argparse
+import glob
+import gzip
+import json
+import mmap
+import os
+import re
+import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_PATTERNS = ['application.log*', 'security.log', 'agent.log', 'logs/app.log*']
+
+LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
+LEVEL_BITS = {name: 1 << i for i, name in enumerate(LEVELS)}
+GROUP_KEYS = ('logger', 'level', 'file', 'minute', 'hour')
+
+INDEX_VERSION = 1
+BLOCK_SIZE = 256 * 1024
+
+_LEVEL_RE = '(DEBUG|INFO|WARNING|ERROR|CRITICAL)'
+_TIME_RE = r'(\d{4}-\d\d-\d\d[ T]\d\d:\d\d:\d\d)[,.](\d{3})'
+
+# Formats produced by the logging configs in this repository, most specific first
+FORMATS = {
+    # sessao7 challenge/exercise1: '%(asctime)s[.%(msecs)03d] - %(levelname)-8s - %(message)s'
+    'level': re.compile(_TIME_RE + r' - ' + _LEVEL_RE + r' *- (.*)'),
+    # sessao10/13/15: '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    'standard': re.compile(_TIME_RE + r' - (.+?) - ' + _LEVEL_RE + r' - (.*)'),
+    # sessao10 Django 'verbose': '{asctime} {levelname} {module} {message}'
+    'django': re.compile(_TIME_RE + r' ' + _LEVEL_RE + r' (\S+) ?(.*)'),
+}
+JSON_FORMAT = 'json'
+
+
+class Query:
+    """Filters and aggregation applied to every record"""
+
+    def __init__(self, level=None, since=None, until=None, logger=None, grep=None,
+                 group_by=None, limit=None):
+        self.min_level = LEVELS[level] if level else 0
+        self.since = since
+        self.until = until
+        self.logger = logger
+        self.grep = re.compile(grep) if grep else None
+        self.group_by = group_by
+        self.limit = limit
+        self.level_mask = sum(bit for name, bit in LEVEL_BITS.items() if LEVELS[name] >= self.min_level)
+
+    def block_matches(self, block):
+        _, _, min_ts, max_ts, mask, _ = block
+        if not mask & self.level_mask:
+            return False
+        if self.since is not None and max_ts < self.since:
+            return False
+        if self.until is not None and min_ts >= self.until:
+            return False
+        return True
+
+    def matches(self, record):
+        ts, level, logger, message = record
+        if LEVELS.get(level, 0) < self.min_level:
+            return False
+        if self.since is not None and ts < self.since:
+            return False
+        if self.until is not None and ts >= self.until:
+            return False
+        if self.logger and not (logger == self.logger or logger.startswith(self.logger + '.')):
+            return False
+        if self.grep and not self.grep.search(message):
+            return False
+        return True
+
+    def group_key(self, record, path):
+        ts, level, logger, _ = record
+        if self.group_by == 'logger':
+            return logger
+        if self.group_by == 'level':
+            return level
+        if self.group_by == 'file':
+            return os.path.basename(path)
+        if self.group_by == 'minute':
+            return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:%M')
+        return datetime.fromtimestamp(ts).strftime('%Y-%m-%d %H:00')
+
+
+class _TimestampCache:
+    """Convert 'YYYY-MM-DD HH:MM:SS' to epoch seconds, once per distinct second"""
+
+    def __init__(self):
+        self._cache = {}
+
+    def __call__(self, text, millis):
+        seconds = self._cache.get(text)
+        if seconds is None:
+            seconds = datetime(
+                int(text[0:4]), int(text[5:7]), int(text[8:10]),
+                int(text[11:13]), int(text[14:16]), int(text[17:19]),
+            ).timestamp()
+            if len(self._cache) > 100_000:
+                self._cache.clear()
+            self._cache[text] = seconds
+        return seconds + millis / 1000
+
+
+def detect_format(data):
+    """Return the name of the format of the first parseable line in `data`"""
+    for line in data[:64 * 1024].decode('utf-8', 'replace').splitlines():
+        if line.startswith('{'):
+            try:
+                payload = json.loads(line)
+            except ValueError:
+                continue
+            if 'timestamp' in payload and 'level' in payload:
+                return JSON_FORMAT
+            continue
+        for name, pattern in FORMATS.items():
+            if pattern.match(line):
+                return name
+    return None
+
+
+def make_parser(fmt):
+    """Return a function parsing one line into (ts, level, logger, message), or None"""
+    to_epoch = _TimestampCache()
+
+    if fmt == JSON_FORMAT:
+        def parse_json(line):
+            if not line.startswith('{'):
+                return None
+            try:
+                payload = json.loads(line)
+                stamp = payload['timestamp']
+                ts = to_epoch(stamp[:19], int(stamp[20:23] or 0))
+                message = payload.get('message', '')
+                if 'exc_info' in payload:
+                    message += '\n' + payload['exc_info']
+                return ts, payload['level'], payload.get('logger', 'root'), message
+            except (ValueError, KeyError, TypeError):
+                return None
+        return parse_json
+
+    match = FORMATS[fmt].match
+    if fmt == 'level':
+        def parse_level(line):
+            m = match(line)
+            if m is None:
+                return None
+            return to_epoch(m.group(1), int(m.group(2))), m.group(3), 'root', m.group(4)
+        return parse_level
+
+    if fmt == 'standard':
+        def parse_standard(line):
+            m = match(line)
+            if m is None:
+                return None
+            return to_epoch(m.group(1), int(m.group(2))), m.group(4), m.group(3), m.group(5)
+        return parse_standard
+
+    def parse_django(line):
+        m = match(line)
+        if m is None:
+            return None
+        return to_epoch(m.group(1), int(m.group(2))), m.group(3), m.group(4), m.group(5)
+    return parse_django
+
+
+def scan(data, start, end, parse):
+    """
+    Yield (offset, record) for the records starting in data[start:end]
+
+    Lines that do not parse (tracebacks, wrapped messages) are appended to
+    the message of the record before them.
+    """
+    offset = None
+    current = None
+    extra = []
+    pos = start
+    while pos < end:
+        newline = data.find(b'\n', pos, end)
+        line_end = end if newline == -1 else newline
+        line = data[pos:line_end].decode('utf-8', 'replace').rstrip('\r')
+        record = parse(line) if line else None
+        if record is not None:
+            if current is not None:
+                yield offset, _with_extra(current, extra)
+            offset, current, extra = pos, record, []
+        elif current is not None:
+            extra.append(line)
+        pos = line_end + 1
+    if current is not None:
+        yield offset, _with_extra(current, extra)
+
+
+def _with_extra(record, extra):
+    if not extra:
+        return record
+    ts, level, logger, message = record
+    return ts, level, logger, '\n'.join([message, *extra]).rstrip('\n')
+
+
+def read_log(path):
+    """Return the contents of a log as a bytes-like object"""
+    if path.endswith('.gz'):
+        with gzip.open(path, 'rb') as f:
+            return f.read()
+    if path.endswith('.zst'):
+        if zstandard is None:
+            raise RuntimeError(f"{path}: install the 'zstandard' package to read .zst logs")
+        with open(path, 'rb') as f:
+            return zstandard.ZstdDecompressor().stream_reader(f).read()
+    if os.path.getsize(path) == 0:
+        return b''
+    with open(path, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def index_path(path, index_dir=None):
+    if index_dir is None:
+        return path + '.idx'
+    return os.path.join(index_dir, path.replace(os.sep, '_').lstrip('_') + '.idx')
+
+
+def _identity(path):
+    stat = os.stat(path)
+    return {'inode': stat.st_ino, 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def build_index(path, index_dir=None):
+    """
+    Load the sidecar index of `path`, building or extending it when stale
+
+    A plain file that only grew since the index was written (same inode)
+    is indexed incrementally from the start of its last block.
+
+    Returns:
+        Index dict with the detected format and the block list
+        [offset, end, min_ts, max_ts, level_mask, count]
+    """
+    identity = _identity(path)
+    sidecar = index_path(path, index_dir)
+    index = None
+    try:
+        with open(sidecar) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        pass
+
+    if index and index.get('version') == INDEX_VERSION:
+        same_file = index['inode'] == identity['inode']
+        if same_file and index['size'] == identity['size'] and index['mtime'] == identity['mtime']:
+            return index
+        compressed = path.endswith(('.gz', '.zst'))
+        if not (same_file and not compressed and identity['size'] > index['size'] and index['blocks']):
+            index = None
+    else:
+        index = None
+
+    data = read_log(path)
+    try:
+        if index is None:
+            index = {'version': INDEX_VERSION, 'format': detect_format(data), 'blocks': []}
+            start = 0
+        else:
+            start = index['blocks'].pop()[0]
+        if index['format'] is None:
+            index['format'] = detect_format(data)
+        if index['format'] is not None:
+            index['blocks'].extend(_index_blocks(data, start, len(data), make_parser(index['format'])))
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    index.update(identity)
+    try:
+        tmp = sidecar + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(index, f)
+        os.replace(tmp, sidecar)
+    except OSError:
+        pass  # read-only location: the index is still used for this run
+    return index
+
+
+def _index_blocks(data, start, end, parse):
+    block = None
+    for offset, (ts, level, _, _) in scan(data, start, end, parse):
+        if block is not None and offset - block[0] >= BLOCK_SIZE:
+            block[1] = offset
+            yield block
+            block = None
+        if block is None:
+            block = [offset, end, ts, ts, 0, 0]
+        block[2] = min(block[2], ts)
+        block[3] = max(block[3], ts)
+        block[4] |= LEVEL_BITS.get(level, 0)
+        block[5] += 1
+    if block is not None:
+        block[1] = end
+        yield block
+
+
+def _run_task(task):
+    """Scan a list of block ranges of one file; runs in a worker process"""
+    path, fmt, ranges, query = task
+    data = read_log(path)
+    parse = make_parser(fmt)
+    counts = Counter()
+    records = []
+    try:
+        for start, end in ranges:
+            for _, record in scan(data, start, end, parse):
+                if not query.matches(record):
+                    continue
+                if query.group_by:
+                    counts[query.group_key(record, path)] += 1
+                else:
+                    records.append((*record, path))
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    if query.limit is not None and not query.group_by:
+        records.sort()
+        del records[query.limit:]
+    return counts, records
+
+
+def _index_task(args):
+    path, index_dir = args
+    return build_index(path, index_dir)
+
+
+def _map(fn, items, jobs):
+    if jobs <= 1 or len(items) <= 1:
+        return [fn(item) for item in items]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(items))) as pool:
+        return list(pool.map(fn, items))
+
+
+def run_query(paths, query, jobs=None, index_dir=None):
+    """
+    Run `query` over `paths`
+
+    Returns:
+        Counter of group keys when `query.group_by` is set, otherwise the
+        matching (ts, level, logger, message, path) records in time order
+    """
+    jobs = jobs or os.cpu_count() or 1
+    indexes = _map(_index_task, [(path, index_dir) for path in paths], jobs)
+
+    tasks = []
+    for path, index in zip(paths, indexes):
+        if index['format'] is None:
+            continue
+        ranges = [(block[0], block[1]) for block in index['blocks'] if query.block_matches(block)]
+        if not ranges:
+            continue
+        # Compressed logs are decompressed once per task: keep them whole
+        chunks = 1 if path.endswith(('.gz', '.zst')) else max(1, min(len(ranges), jobs * 2))
+        size = -(-len(ranges) // chunks)
+        for i in range(0, len(ranges), size):
+            tasks.append((path, index['format'], ranges[i:i + size], query))
+
+    counts = Counter()
+    records = []
+    for task_counts, task_records in _map(_run_task, tasks, jobs):
+        counts.update(task_counts)
+        records.extend(task_records)
+    if query.group_by:
+        return counts
+    records.sort()
+    return records[:query.limit] if query.limit is not None else records
+
+
+def expand_paths(patterns):
+    paths = []
+    for pattern in patterns:
+        matches = glob.glob(pattern) if glob.has_magic(pattern) else [pattern] if os.path.exists(pattern) else []
+        for path in sorted(matches):
+            if os.path.isfile(path) and not path.endswith(('.idx', '.tmp')) and path not in paths:
+                paths.append(path)
+    return paths
+
+
+def parse_time(text):
+    """Parse '2024-05-01 10:00[:00]' or ISO 8601 into local epoch seconds"""
+    return datetime.fromisoformat(text).timestamp()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Search and aggregate application logs')
+    parser.add_argument('paths', nargs='*', help=f'Files or globs (default: {" ".join(DEFAULT_PATTERNS)})')
+    parser.add_argument('--level', choices=list(LEVELS), help='Minimum level')
+    parser.add_argument('--since', type=parse_time, help='Start time (inclusive)')
+    parser.add_argument('--until', type=parse_time, help='End time (exclusive)')
+    parser.add_argument('--logger', help='Logger name, children included')
+    parser.add_argument('--grep', help='Regular expression matched against the message')
+    parser.add_argument('--group-by', choices=GROUP_KEYS, help='Count matches per key')
+    parser.add_argument('--limit', type=int, help='Maximum records printed')
+    parser.add_argument('--json', action='store_true', help='Output JSON')
+    parser.add_argument('--jobs', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--index-dir', help='Directory for sidecar indexes (default: next to each file)')
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths or DEFAULT_PATTERNS)
+    if not paths:
+        parser.error('no log files found')
+
+    query = Query(args.level, args.since, args.until, args.logger, args.grep, args.group_by, args.limit)
+    result = run_query(paths, query, jobs=args.jobs, index_dir=args.index_dir)
+
+    if args.group_by:
+        if args.json:
+            print(json.dumps(dict(result.most_common())))
+        else:
+            for key, count in result.most_common():
+                print(f'{count:>10}  {key}')
+        return 0
+
+    for ts, level, logger, message, path in result:
+        stamp = datetime.fromtimestamp(ts).isoformat(sep=' ', timespec='milliseconds')
+        if args.json:
+            print(json.dumps({'timestamp': stamp, 'level': level, 'logger': logger,
+                              'message': message, 'file': path}))
+        else:
+            print(f'{stamp} {level:<8} {logger} - {message}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,355 @@
+import contextvars
+import functools
+import inspect
+import json
+import random
+import threading
+import time
+import tracemalloc
+
+_enabled = True
+
+
+def enable():
+    """Turn profiling on globally"""
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """Turn profiling off globally; timers then cost a single flag check"""
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    return _enabled
+
+
+def _percentile(sorted_values, q):
+    if not sorted_values:
+        return 0
+    index = min(len(sorted_values) - 1, int(q * len(sorted_values)))
+    return sorted_values[index]
+
+
+class Node:
+    """
+    One block in the call tree, aggregated over all of its executions
+
+    Durations are kept in a bounded reservoir sample, so percentiles stay
+    representative without the memory growing with the call count.
+    """
+
+    def __init__(self, name, parent=None, max_samples=1000):
+        self.name = name
+        self.parent = parent
+        self.children = {}
+        self.max_samples = max_samples
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.cpu_ns = 0
+        self.memory_bytes = 0
+        self.samples = []
+
+    @property
+    def path(self):
+        names = []
+        node = self
+        while node.parent is not None:
+            names.append(node.name)
+            node = node.parent
+        return '/'.join(reversed(names))
+
+    def child(self, name):
+        node = self.children.get(name)
+        if node is None:
+            node = self.children[name] = Node(name, self, self.max_samples)
+        return node
+
+    def record(self, elapsed_ns, cpu_ns=0, memory_bytes=0):
+        self.count += 1
+        self.total_ns += elapsed_ns
+        self.cpu_ns += cpu_ns
+        self.memory_bytes += memory_bytes
+        if self.min_ns is None or elapsed_ns < self.min_ns:
+            self.min_ns = elapsed_ns
+        if elapsed_ns > self.max_ns:
+            self.max_ns = elapsed_ns
+        if len(self.samples) < self.max_samples:
+            self.samples.append(elapsed_ns)
+        else:
+            slot = random.randrange(self.count)
+            if slot < self.max_samples:
+                self.samples[slot] = elapsed_ns
+
+    @property
+    def self_ns(self):
+        """Time spent in this block outside of its timed children"""
+        return max(0, self.total_ns - sum(child.total_ns for child in self.children.values()))
+
+    def stats(self):
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'total': self.total_ns / 1e9,
+            'min': (self.min_ns or 0) / 1e9,
+            'mean': self.total_ns / self.count / 1e9 if self.count else 0,
+            'p50': _percentile(ordered, 0.50) / 1e9,
+            'p99': _percentile(ordered, 0.99) / 1e9,
+            'max': self.max_ns / 1e9,
+            'cpu': self.cpu_ns / 1e9,
+            'memory_bytes': self.memory_bytes,
+        }
+
+    def walk(self):
+        """Yield this node's descendants depth-first"""
+        for child in self.children.values():
+            yield child
+            yield from child.walk()
+
+
+class Profiler:
+    """
+    Collects nested timings into an aggregated call tree
+
+    The current position in the tree is kept in a ContextVar. Every thread
+    starts from its own empty context and every asyncio task runs in a copy
+    of its creator's, so concurrent threads and tasks nest their blocks
+    correctly without sharing a stack.
+    """
+
+    def __init__(self, cpu=False, memory=False, max_samples=1000):
+        """
+        Args:
+            cpu: Also record thread CPU time for each block
+            memory: Also record the traced memory delta (starts tracemalloc)
+            max_samples: Reservoir size per block used for percentiles
+        """
+        self.cpu = cpu
+        self.memory = memory
+        self.root = Node('<root>', max_samples=max_samples)
+        self._current = contextvars.ContextVar(f'profiler_{id(self)}', default=self.root)
+        self._lock = threading.Lock()
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def timer(self, name):
+        """Context manager timing a block under the current block"""
+        if not _enabled:
+            return _NULL_TIMER
+        return Timer(name, profiler=self)
+
+    def profile(self, name=None):
+        """Decorator timing every call of a sync or async function"""
+        def decorator(fn):
+            label = name or fn.__qualname__
+            if inspect.iscoroutinefunction(fn):
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    if not _enabled:
+                        return await fn(*args, **kwargs)
+                    with Timer(label, profiler=self):
+                        return await fn(*args, **kwargs)
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if not _enabled:
+                    return fn(*args, **kwargs)
+                with Timer(label, profiler=self):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def reset(self):
+        with self._lock:
+            self.root.children.clear()
+
+    def find(self, path):
+        """Return the node at 'a/b/c', or None"""
+        node = self.root
+        for name in path.split('/'):
+            node = node.children.get(name)
+            if node is None:
+                return None
+        return node
+
+    def _enter(self, name):
+        parent = self._current.get()
+        node = parent.children.get(name)
+        if node is None:
+            with self._lock:
+                node = parent.child(name)
+        return node, self._current.set(node)
+
+    def _exit(self, node, token, elapsed_ns, cpu_ns, memory_bytes):
+        self._current.reset(token)
+        with self._lock:
+            node.record(elapsed_ns, cpu_ns, memory_bytes)
+
+    def to_dict(self):
+        def convert(node):
+            return {
+                'name': node.name,
+                **node.stats(),
+                'children': [convert(child) for child in node.children.values()],
+            }
+        with self._lock:
+            return [convert(child) for child in self.root.children.values()]
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent)
+
+    def to_speedscope(self, name='profile'):
+        """
+        Export the aggregated tree as a speedscope 'sampled' profile
+
+        Each block becomes one sample whose weight is its self time, which
+        speedscope renders as a flame graph of the aggregated tree.
+        """
+        frames = []
+        frame_index = {}
+        samples = []
+        weights = []
+
+        def visit(node, stack):
+            if node.name not in frame_index:
+                frame_index[node.name] = len(frames)
+                frames.append({'name': node.name})
+            stack = stack + [frame_index[node.name]]
+            if node.self_ns:
+                samples.append(stack)
+                weights.append(node.self_ns)
+            for child in node.children.values():
+                visit(child, stack)
+
+        with self._lock:
+            for child in self.root.children.values():
+                visit(child, [])
+        total = sum(weights)
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'nanoseconds',
+                'startValue': 0,
+                'endValue': total,
+                'samples': samples,
+                'weights': weights,
+            }],
+            'name': name,
+            'exporter': 'sessao7.profiling',
+        }
+
+    def to_prometheus(self, metric='profile_block_seconds'):
+        """Render each block as a Prometheus summary labelled with its path"""
+        lines = [
+            f'# HELP {metric} Time spent in profiled blocks',
+            f'# TYPE {metric} summary',
+        ]
+        cpu_lines = ['# TYPE profile_block_cpu_seconds_total counter']
+        memory_lines = ['# TYPE profile_block_memory_bytes_total counter']
+        with self._lock:
+            for node in self.root.walk():
+                stats = node.stats()
+                label = node.path.replace('\\', '\\\\').replace('"', '\\"')
+                lines.append(f'{metric}{{path="{label}",quantile="0.5"}} {stats["p50"]:.9f}')
+                lines.append(f'{metric}{{path="{label}",quantile="0.99"}} {stats["p99"]:.9f}')
+                lines.append(f'{metric}_sum{{path="{label}"}} {stats["total"]:.9f}')
+                lines.append(f'{metric}_count{{path="{label}"}} {stats["count"]}')
+                cpu_lines.append(f'profile_block_cpu_seconds_total{{path="{label}"}} {stats["cpu"]:.9f}')
+                memory_lines.append(f'profile_block_memory_bytes_total{{path="{label}"}} {stats["memory_bytes"]}')
+        if self.cpu:
+            lines += cpu_lines
+        if self.memory:
+            lines += memory_lines
+        return '\n'.join(lines) + '\n'
+
+    def report(self):
+        """Human-readable indented tree"""
+        lines = []
+
+        def visit(node, depth):
+            stats = node.stats()
+            lines.append(
+                f"{'  ' * depth}{node.name}: count={stats['count']} total={stats['total']:.4f}s "
+                f"mean={stats['mean']:.6f}s p50={stats['p50']:.6f}s p99={stats['p99']:.6f}s"
+            )
+            for child in node.children.values():
+                visit(child, depth + 1)
+
+        with self._lock:
+            for child in self.root.children.values():
+                visit(child, 0)
+        return '\n'.join(lines)
+
+
+class Timer:
+    """
+    Time a block and record it in a profiler's call tree
+
+    Usable as a context manager; `elapsed` holds the duration in seconds
+    once the block has finished.
+    """
+
+    def __init__(self, name='Code block', profiler=None):
+        self.name = name
+        self.profiler = profiler if profiler is not None else default_profiler
+        self.elapsed = None
+
+    def __enter__(self):
+        if not _enabled:
+            self._node = None
+            return self
+        profiler = self.profiler
+        self._node, self._token = profiler._enter(self.name)
+        if profiler.memory:
+            self._memory = tracemalloc.get_traced_memory()[0]
+        if profiler.cpu:
+            self._cpu = time.thread_time_ns()
+        self._start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._node is None:
+            return False
+        elapsed_ns = time.perf_counter_ns() - self._start
+        profiler = self.profiler
+        cpu_ns = time.thread_time_ns() - self._cpu if profiler.cpu else 0
+        memory_bytes = tracemalloc.get_traced_memory()[0] - self._memory if profiler.memory else 0
+        profiler._exit(self._node, self._token, elapsed_ns, cpu_ns, memory_bytes)
+        self.elapsed = elapsed_ns / 1e9
+        return False
+
+
+class _NullTimer:
+    """Shared no-op context manager handed out while profiling is disabled"""
+
+    elapsed = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+default_profiler = Profiler()
+
+
+def timer(name='Code block', profiler=None):
+    """Context manager recording a block in `profiler` (the default profiler if None)"""
+    return (profiler or default_profiler).timer(name)
+
+
+def profile(name=None, profiler=None):
+    """Decorator recording every call of a function in `profiler`"""
+    return (profiler or default_profiler).profile(name)
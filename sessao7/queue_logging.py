@@ -0,0 +1,251 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+
+from compressed_rotation import CompressingRotatingFileHandler
+
+DROP = 'drop'
+BLOCK = 'block'
+
+_exception_formatter = logging.Formatter()
+
+
+class DeferredFlushMixin:
+    """
+    Make a stream handler flush only when asked to
+
+    StreamHandler flushes after every record; mixed into a file handler this
+    turns `flush()` into a no-op so the queue listener can write a whole
+    batch and flush once via `force_flush()`.
+    """
+
+    def flush(self):
+        pass
+
+    def force_flush(self):
+        super().flush()
+
+    def close(self):
+        self.force_flush()
+        super().close()
+
+    def emit_batch(self, records):
+        """Format `records` and write them with a single write call"""
+        records = [record for record in records if record.levelno >= self.level and self.filter(record)]
+        if not records:
+            return
+        self.acquire()
+        try:
+            if getattr(self, 'shouldRollover', None) and self.shouldRollover(records[0]):
+                self.doRollover()
+            if self.stream is None:
+                if self.mode != 'w' or not self._closed:
+                    self.stream = self._open()
+            terminator = self.terminator
+            self.stream.write(''.join(self.format(record) + terminator for record in records))
+        except Exception:
+            for record in records:
+                self.handleError(record)
+        finally:
+            self.release()
+
+
+class BatchedFileHandler(DeferredFlushMixin, logging.FileHandler):
+    """FileHandler that leaves flushing to the queue listener"""
+
+
+class BatchedTimedRotatingFileHandler(DeferredFlushMixin, TimedRotatingFileHandler):
+    """TimedRotatingFileHandler that leaves flushing to the queue listener"""
+
+
+class BatchedCompressingRotatingFileHandler(DeferredFlushMixin, CompressingRotatingFileHandler):
+    """CompressingRotatingFileHandler that leaves flushing to the queue listener"""
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler for a bounded queue with a drop or block policy
+
+    The calling thread only resolves the message and enqueues the record;
+    formatting and I/O happen on the listener thread.
+    """
+
+    def __init__(self, log_queue, policy=DROP, block_timeout=None):
+        """
+        Args:
+            log_queue: Bounded queue.Queue shared with the listener
+            policy: 'drop' discards records when the queue is full,
+                'block' waits for space (up to `block_timeout` seconds)
+            block_timeout: Maximum wait with the 'block' policy, None waits forever
+        """
+        super().__init__(log_queue)
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"Unknown queue policy: {policy}")
+        self.policy = policy
+        self.block_timeout = block_timeout
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def prepare(self, record):
+        # Much cheaper than QueueHandler.prepare, which copies the record and
+        # runs the full formatter on the calling thread. Merging the args in
+        # place is safe for other handlers (getMessage() gives the same text),
+        # and the traceback is rendered now so the listener only reuses it.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+        return record
+
+    def handle(self, record):
+        # The queue is already thread-safe: skip the per-handler lock
+        if self.filter(record):
+            self.emit(record)
+            return True
+        return False
+
+    def enqueue(self, record):
+        try:
+            if self.policy == DROP:
+                self.queue.put_nowait(record)
+            else:
+                self.queue.put(record, timeout=self.block_timeout)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class BatchingQueueListener(QueueListener):
+    """
+    QueueListener that drains records in batches
+
+    Up to `batch_size` records are handled per wake-up, then handlers that
+    support it are flushed once. An idle listener still flushes at least
+    every `flush_interval` seconds so records never linger in buffers.
+    """
+
+    def __init__(self, log_queue, *handlers, batch_size=512, flush_interval=0.5,
+                 respect_handler_level=True):
+        super().__init__(log_queue, *handlers, respect_handler_level=respect_handler_level)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.batches = 0
+
+    def enqueue_sentinel(self):
+        # Wait for room: a full queue must not prevent shutdown
+        self.queue.put(self._sentinel)
+
+    def handle_batch(self, records):
+        """Hand a batch to each handler, in one call where the handler supports it"""
+        for handler in self.handlers:
+            emit_batch = getattr(handler, 'emit_batch', None)
+            if emit_batch is not None:
+                emit_batch(records)
+                continue
+            for record in records:
+                if not self.respect_handler_level or record.levelno >= handler.level:
+                    handler.handle(record)
+
+    def _flush(self):
+        for handler in self.handlers:
+            flush = getattr(handler, 'force_flush', handler.flush)
+            flush()
+
+    def _monitor(self):
+        q = self.queue
+        has_task_done = hasattr(q, 'task_done')
+        last_flush = time.monotonic()
+        while True:
+            try:
+                record = q.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._flush()
+                last_flush = time.monotonic()
+                continue
+
+            batch = [record]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = batch[-1] is self._sentinel
+            if stop:
+                batch.pop()
+            self.handle_batch(batch)
+            if has_task_done:
+                for _ in range(len(batch) + stop):
+                    q.task_done()
+            self.batches += 1
+
+            now = time.monotonic()
+            if stop or len(batch) < self.batch_size or now - last_flush >= self.flush_interval:
+                self._flush()
+                last_flush = now
+            if stop:
+                break
+
+
+class QueueLogging:
+    """Handle on a running queue-based logging pipeline"""
+
+    def __init__(self, handler, listener):
+        self.handler = handler
+        self.listener = listener
+        self._stopped = False
+
+    @property
+    def dropped(self):
+        """Number of records discarded because the queue was full"""
+        return self.handler.dropped
+
+    def stop(self):
+        """Flush pending records, stop the listener and detach the handler"""
+        if self._stopped:
+            return
+        self._stopped = True
+        self.listener.stop()
+        logging.getLogger().removeHandler(self.handler)
+        for handler in self.listener.handlers:
+            handler.close()
+        if self.handler.dropped:
+            logging.getLogger(__name__).warning(
+                "%d log records were dropped because the queue was full", self.handler.dropped
+            )
+
+
+def configure_queue_logging(handlers, level=logging.DEBUG, maxsize=10000, policy=DROP,
+                            block_timeout=None, batch_size=512, flush_interval=0.5):
+    """
+    Route root logging through a bounded queue to a background listener
+
+    Args:
+        handlers: Handlers doing the actual I/O; they run on the listener thread
+        level: Root logger level
+        maxsize: Maximum number of queued records
+        policy: 'drop' or 'block' when the queue is full
+        block_timeout: Maximum wait with the 'block' policy
+        batch_size: Maximum records handled between flushes
+        flush_interval: Maximum seconds between flushes
+
+    Returns:
+        QueueLogging handle exposing the dropped counter and `stop()`
+    """
+    log_queue = queue.Queue(maxsize=maxsize)
+    queue_handler = BoundedQueueHandler(log_queue, policy=policy, block_timeout=block_timeout)
+    listener = BatchingQueueListener(
+        log_queue, *handlers, batch_size=batch_size, flush_interval=flush_interval
+    )
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    root.addHandler(queue_handler)
+    listener.start()
+
+    pipeline = QueueLogging(queue_handler, listener)
+    atexit.register(pipeline.stop)
+    return pipeline
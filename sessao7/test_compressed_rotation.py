@@ -0,0 +1,95 @@
+"""
+Tests for the compressing size/time rotating handler in compressed_rotation.py
+"""
+import gzip
+import logging
+import threading
+import time
+
+import pytest
+
+import compressed_rotation
+from compressed_rotation import CompressingRotatingFileHandler
+
+
+@pytest.fixture
+def make_logger(tmp_path):
+    handlers = []
+
+    def make(**kwargs):
+        handler = CompressingRotatingFileHandler(tmp_path / "app.log", **kwargs)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(handler)
+        logger = logging.getLogger(f"test.rotation.{len(handlers)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        logger.handlers = [handler]
+        return logger, handler
+
+    yield make
+    for handler in handlers:
+        handler.close()
+
+
+def read_segments(handler):
+    lines = []
+    for path in reversed(handler.segments()):
+        with gzip.open(path, 'rt') as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+def test_size_rotation_compresses_segments(make_logger, tmp_path):
+    logger, handler = make_logger(max_bytes=1000, when=None, backup_count=100)
+    for i in range(200):
+        logger.info("record %04d %s", i, "x" * 20)
+    handler.wait_for_compression()
+
+    segments = handler.segments()
+    assert len(segments) > 5
+    assert all(path.endswith(".gz") for path in segments)
+    current = (tmp_path / "app.log").read_text().splitlines()
+    assert read_segments(handler) + current == [f"record {i:04d} {'x' * 20}" for i in range(200)]
+
+
+def test_only_most_recent_segments_are_kept(make_logger):
+    logger, handler = make_logger(max_bytes=100, when=None, backup_count=3)
+    for i in range(100):
+        logger.info("record %04d %s", i, "x" * 20)
+    handler.wait_for_compression()
+
+    assert len(handler.segments()) == 3
+    assert read_segments(handler)[-1].startswith("record 009")
+
+
+def test_time_rotation(make_logger):
+    logger, handler = make_logger(max_bytes=0, when="S", interval=3600)
+    logger.info("before")
+    handler.rollover_at = time.time() - 1
+    logger.info("after")
+    handler.wait_for_compression()
+
+    assert read_segments(handler) == ["before"]
+    assert handler.rollover_at > time.time() + 3000
+
+
+def test_emit_does_not_wait_for_compression(make_logger, monkeypatch):
+    release = threading.Event()
+    compress = compressed_rotation.compress_file
+
+    def slow_compress(path, compression):
+        release.wait(5)
+        return compress(path, compression)
+
+    monkeypatch.setattr(compressed_rotation, "compress_file", slow_compress)
+    logger, handler = make_logger(max_bytes=100, when=None)
+
+    start = time.perf_counter()
+    for i in range(50):
+        logger.info("record %04d %s", i, "x" * 20)
+    elapsed = time.perf_counter() - start
+    release.set()
+    handler.wait_for_compression()
+
+    assert elapsed < 1
+    assert len(handler.segments()) == 7
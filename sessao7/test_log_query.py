@@ -0,0 +1,107 @@
+"""
+Tests for the log query tool in log_query.py
+"""
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+import log_query
+from log_query import Query, build_index, main, run_query
+
+START = datetime(2024, 5, 1, 10, 0, 0)
+
+
+def standard_line(i, level, logger):
+    stamp = (START + timedelta(seconds=i)).strftime('%Y-%m-%d %H:%M:%S')
+    return f'{stamp},{i % 1000:03d} - {logger} - {level} - event {i}\n'
+
+
+@pytest.fixture
+def logs(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_query, 'BLOCK_SIZE', 2048)
+    levels = ['INFO', 'INFO', 'WARNING', 'ERROR']
+    loggers = ['app.api', 'app.db', 'security']
+
+    rotated = tmp_path / 'app.log.20240501-100000.gz'
+    with gzip.open(rotated, 'wt') as f:
+        for i in range(0, 600):
+            f.write(standard_line(i, levels[i % 4], loggers[i % 3]))
+
+    current = tmp_path / 'app.log'
+    with open(current, 'w') as f:
+        for i in range(600, 1200):
+            f.write(standard_line(i, levels[i % 4], loggers[i % 3]))
+            if i == 603:
+                f.write('Traceback (most recent call last):\nZeroDivisionError: division by zero\n')
+
+    sessao7 = tmp_path / 'application.log'
+    sessao7.write_text(
+        '2024-05-01 10:00:05.120 - INFO     - System is operating normally\n'
+        '2024-05-01 10:00:06.250 - ERROR    - Error in processing request\n'
+    )
+
+    structured = tmp_path / 'json.log'
+    structured.write_text(json.dumps({
+        'timestamp': '2024-05-01T10:00:07.000', 'level': 'ERROR', 'logger': 'app.json', 'message': 'boom',
+    }) + '\n')
+    return [str(rotated), str(current), str(sessao7), str(structured)]
+
+
+def expected_errors(since, until):
+    counts = {}
+    for i in range(1200):
+        if i % 4 == 3 and since <= i < until:
+            logger = ['app.api', 'app.db', 'security'][i % 3]
+            counts[logger] = counts.get(logger, 0) + 1
+    return counts
+
+
+def test_errors_between_times_grouped_by_logger(logs):
+    since = (START + timedelta(seconds=300)).timestamp()
+    until = (START + timedelta(seconds=900)).timestamp()
+    query = Query(level='ERROR', since=since, until=until, group_by='logger')
+
+    assert dict(run_query(logs, query, jobs=1)) == expected_errors(300, 900)
+
+
+def test_parallel_scan_matches_serial(logs):
+    query = Query(level='WARNING', group_by='logger')
+    assert run_query(logs, query, jobs=3) == run_query(logs, query, jobs=1)
+
+
+def test_formats_and_multiline_records(logs):
+    records = run_query(logs, Query(level='ERROR', until=(START + timedelta(seconds=8)).timestamp()), jobs=1)
+    assert [(level, logger, message) for _, level, logger, message, _ in records] == [
+        ('ERROR', 'app.api', 'event 3'),
+        ('ERROR', 'root', 'Error in processing request'),
+        ('ERROR', 'app.json', 'boom'),
+        ('ERROR', 'app.db', 'event 7'),
+    ]
+
+    traceback = run_query(logs, Query(grep='ZeroDivisionError'), jobs=1)
+    assert traceback[0][3].startswith('event 603\nTraceback')
+
+
+def test_index_skips_blocks_and_grows_incrementally(logs):
+    path = logs[1]
+    index = build_index(path)
+    assert os.path.exists(path + '.idx')
+    assert len(index['blocks']) > 5
+
+    narrow = Query(since=(START + timedelta(seconds=1150)).timestamp())
+    assert sum(narrow.block_matches(block) for block in index["blocks"]) <= 2
+
+    with open(path, 'a') as f:
+        f.write(standard_line(1200, 'CRITICAL', 'app.api'))
+    grown = build_index(path)
+    assert grown['blocks'][:-1] == index['blocks'][:-1]
+    assert sum(block[5] for block in grown['blocks']) == 601
+
+
+def test_cli_group_by(logs, capsys):
+    main([*logs, '--level', 'ERROR', '--since', '2024-05-01 10:05', '--until', '2024-05-01 10:15',
+          '--group-by', 'logger', '--json', '--jobs', '1'])
+    assert json.loads(capsys.readouterr().out) == expected_errors(300, 900)
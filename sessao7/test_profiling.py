@@ -0,0 +1,110 @@
+"""
+Tests for the hierarchical profiler in profiling.py
+"""
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+import profiling
+from profiling import Profiler
+
+
+@pytest.fixture
+def profiler():
+    return Profiler()
+
+
+def test_nested_blocks_build_an_aggregated_tree(profiler):
+    with profiler.timer("outer"):
+        for i in range(10):
+            with profiler.timer("inner"):
+                time.sleep(0.001 * (i % 2))
+
+    outer = profiler.find("outer")
+    inner = profiler.find("outer/inner")
+    assert outer.count == 1
+    assert inner.count == 10 and inner.path == "outer/inner"
+    stats = inner.stats()
+    assert stats["min"] <= stats["p50"] <= stats["p99"] <= stats["max"]
+    assert stats["mean"] == pytest.approx(stats["total"] / 10)
+    assert outer.total_ns >= inner.total_ns
+
+
+def test_async_tasks_and_threads_keep_separate_stacks(profiler):
+    @profiler.profile("step")
+    async def step():
+        await asyncio.sleep(0.01)
+
+    async def worker(name):
+        with profiler.timer(name):
+            await step()
+
+    async def main():
+        with profiler.timer("main"):
+            await asyncio.gather(worker("a"), worker("b"))
+
+    asyncio.run(main())
+
+    def thread_body():
+        with profiler.timer("thread"):
+            with profiler.timer("work"):
+                pass
+
+    threads = [threading.Thread(target=thread_body) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert profiler.find("main/a/step").count == 1
+    assert profiler.find("main/b/step").count == 1
+    assert profiler.find("main/a/b") is None
+    assert profiler.find("thread/work").count == 4
+    assert set(profiler.root.children) == {"main", "thread"}
+
+
+def test_cpu_and_memory_deltas():
+    profiler = Profiler(cpu=True, memory=True)
+    with profiler.timer("alloc"):
+        data = [bytes(1000) for _ in range(1000)]
+        sum(i * i for i in range(200_000))
+
+    stats = profiler.find("alloc").stats()
+    assert stats["cpu"] > 0
+    assert stats["memory_bytes"] >= 1_000_000
+    del data
+
+
+def test_exports(profiler):
+    with profiler.timer("request"):
+        with profiler.timer('db "query"'):
+            time.sleep(0.002)
+
+    tree = json.loads(profiler.to_json())
+    assert tree[0]["name"] == "request"
+    assert tree[0]["children"][0]["count"] == 1
+
+    speedscope = profiler.to_speedscope()
+    profile = speedscope["profiles"][0]
+    names = [frame["name"] for frame in speedscope["shared"]["frames"]]
+    assert [[names[i] for i in stack] for stack in profile["samples"]][-1] == ["request", 'db "query"']
+    assert sum(profile["weights"]) == profiler.find("request").total_ns
+
+    text = profiler.to_prometheus()
+    assert 'profile_block_seconds_count{path="request/db \\"query\\""} 1' in text
+    assert 'profile_block_seconds{path="request",quantile="0.99"}' in text
+
+
+def test_global_switch(profiler):
+    profiling.disable()
+    try:
+        with profiler.timer("skipped") as block:
+            pass
+        assert block.elapsed is None
+    finally:
+        profiling.enable()
+
+    assert profiler.find("skipped") is None
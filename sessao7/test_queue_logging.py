@@ -0,0 +1,85 @@
+"""
+Tests for the queue-based logging pipeline in queue_logging.py
+"""
+import logging
+import queue
+
+import pytest
+
+from queue_logging import (
+    BLOCK,
+    BatchedFileHandler,
+    BatchingQueueListener,
+    BoundedQueueHandler,
+    configure_queue_logging,
+)
+
+
+@pytest.fixture
+def clean_root():
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level
+    root.handlers = []
+    yield root
+    root.handlers, level = saved
+    root.setLevel(level)
+
+
+def test_records_are_written_in_order(tmp_path, clean_root):
+    path = tmp_path / "app.log"
+    handler = BatchedFileHandler(path)
+    handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    pipeline = configure_queue_logging([handler], batch_size=7, policy=BLOCK)
+
+    logger = logging.getLogger("test")
+    for i in range(100):
+        logger.info("record %d", i)
+    try:
+        1 / 0
+    except ZeroDivisionError:
+        logger.exception("failed")
+    pipeline.stop()
+
+    lines = path.read_text().splitlines()
+    assert lines[:100] == [f"INFO record {i}" for i in range(100)]
+    assert lines[100] == "ERROR failed"
+    assert "ZeroDivisionError" in lines[-1]
+    assert pipeline.dropped == 0
+
+
+def test_full_queue_drops_and_counts(monkeypatch):
+    log_queue = queue.Queue(maxsize=5)
+    handler = BoundedQueueHandler(log_queue)
+    logger = logging.getLogger("test.drop")
+    monkeypatch.setattr(logger, "propagate", False)
+    logger.addHandler(handler)
+    try:
+        for i in range(12):
+            logger.warning("record %d", i)
+    finally:
+        logger.removeHandler(handler)
+
+    assert log_queue.qsize() == 5
+    assert handler.dropped == 7
+
+
+def test_listener_flushes_once_per_batch(tmp_path):
+    flushes = []
+
+    class CountingHandler(BatchedFileHandler):
+        def force_flush(self):
+            flushes.append(1)
+            super().force_flush()
+
+    log_queue = queue.Queue()
+    handler = CountingHandler(tmp_path / "batched.log")
+    for i in range(1000):
+        log_queue.put(logging.makeLogRecord({"msg": f"record {i}", "levelno": logging.INFO}))
+    listener = BatchingQueueListener(log_queue, handler, batch_size=250)
+    listener.start()
+    listener.stop()
+    handler.close()
+
+    assert listener.batches == 5
+    assert len(flushes) <= 3
+    assert len((tmp_path / "batched.log").read_text().splitlines()) == 1000
@@ -0,0 +1,98 @@
+import json
+import os
+import timeit
+
+import pytest
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+
+
+# Timings of a few microseconds easily vary by half between runs of an
+# unchanged tree, so only flag a benchmark that is clearly slower
+DEFAULT_THRESHOLD = 1.0
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-baseline", action="store_true",
+        help="Record the benchmark timings of this run as the new baseline",
+    )
+    parser.addoption(
+        "--check-regressions", action="store_true",
+        help="Fail benchmarks that are slower than their baseline (off by default)",
+    )
+    parser.addoption(
+        "--regression-threshold", type=float, default=None,
+        help=f"Fraction slower than the baseline that fails a benchmark; implies "
+             f"--check-regressions (default {DEFAULT_THRESHOLD})",
+    )
+
+
+def _calibrate():
+    """Time a fixed pure-Python workload, used to compare timings across machines"""
+    return min(timeit.repeat("sum(i * i for i in range(10_000))", number=20, repeat=7)) / 20
+
+
+@pytest.fixture(scope="session")
+def benchmark_baseline(request):
+    """
+    Stored baseline timings, and the timings recorded by this run
+
+    The baseline stores each benchmark's fastest round, normalised to a
+    calibration timing from the machine that recorded it, so a committed
+    baseline stays meaningful on faster or slower CI runners.
+    """
+    try:
+        with open(BASELINE_FILE) as f:
+            stored = json.load(f)
+    except FileNotFoundError:
+        stored = {"calibration": None, "benchmarks": {}}
+
+    recorded = {}
+    yield {"stored": stored, "recorded": recorded}
+
+    if request.config.getoption("--update-baseline") and recorded:
+        stored["benchmarks"].update(recorded)
+        with open(BASELINE_FILE, "w") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+
+@pytest.fixture
+def assert_no_regression(request, benchmark_baseline):
+    """
+    Compare the fastest round of a finished benchmark with its baseline
+
+    Only with --check-regressions or --regression-threshold; the default run
+    just checks that the benchmarks work. The machine is calibrated right
+    after each benchmark, so load changing during the session does not skew
+    the comparison.
+    """
+    threshold = request.config.getoption("--regression-threshold")
+    check_regressions = request.config.getoption("--check-regressions") or threshold is not None
+    update = request.config.getoption("--update-baseline")
+    threshold = DEFAULT_THRESHOLD if threshold is None else threshold
+
+    def check(benchmark):
+        if benchmark.stats is None:
+            pytest.skip("benchmarks are disabled")
+        if not (check_regressions or update):
+            return
+        name = benchmark.name
+        fastest = benchmark.stats.stats.min
+        calibration = _calibrate()
+        stored = benchmark_baseline["stored"]
+        if stored["calibration"] is None:
+            stored["calibration"] = calibration
+        scale = calibration / stored["calibration"]
+        benchmark_baseline["recorded"][name] = fastest / scale
+        baseline = stored["benchmarks"].get(name)
+        if baseline is None or update:
+            return
+        expected = baseline * scale
+        assert fastest <= expected * (1 + threshold), (
+            f"{name} regressed: {fastest * 1e6:.1f}us vs baseline {expected * 1e6:.1f}us "
+            f"(threshold {threshold:.0%})"
+        )
+
+    return check
@@ -0,0 +1,40 @@
+"""
+Performance regression tests for factorial and multiply
+
+By default the benchmarks only run. With --check-regressions each one is
+compared with benchmark_baseline.json (rescaled to the speed of the
+current machine) and fails when it is more than --regression-threshold
+slower:
+
+    pytest test_benchmarks.py --check-regressions
+
+After an intended performance change, record a new baseline with:
+
+    pytest test_benchmarks.py --update-baseline
+"""
+import pytest
+
+from challenge import factorial
+from exercise import multiply
+
+BIG_A = 7 ** 20_000
+BIG_B = 3 ** 30_000
+
+
+@pytest.mark.parametrize("n", [100, 500, 900])
+def test_factorial_speed(benchmark, assert_no_regression, n):
+    result = benchmark(factorial, n)
+    assert result % n == 0
+    assert_no_regression(benchmark)
+
+
+def test_multiply_huge_integers_speed(benchmark, assert_no_regression):
+    result = benchmark(multiply, BIG_A, BIG_B)
+    assert result == BIG_A * BIG_B
+    assert_no_regression(benchmark)
+
+
+def test_multiply_floats_speed(benchmark, assert_no_regression):
+    result = benchmark(multiply, 1.5e150, -2.25e-75)
+    assert result == pytest.approx(-3.375e75)
+    assert_no_regression(benchmark)
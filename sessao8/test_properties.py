@@ -0,0 +1,81 @@
+"""
+Property-based tests for factorial and multiply
+"""
+import math
+import sys
+from fractions import Fraction
+
+import pytest
+from hypothesis import given, strategies as st
+
+from challenge import factorial
+from exercise import multiply
+
+# The recursive factorial needs one stack frame per step
+factorial_inputs = st.integers(min_value=0, max_value=800)
+huge_integers = st.integers(min_value=-(10 ** 400), max_value=10 ** 400) | st.integers()
+finite_floats = st.floats(allow_nan=False, allow_infinity=False)
+
+
+@given(factorial_inputs)
+def test_factorial_matches_math_factorial(n):
+    assert factorial(n) == math.factorial(n)
+
+
+@given(st.integers(min_value=1, max_value=800))
+def test_factorial_recurrence(n):
+    assert factorial(n) == n * factorial(n - 1)
+
+
+@given(st.integers(max_value=-1) | st.integers(max_value=-(10 ** 100)))
+def test_factorial_rejects_negative_integers(n):
+    with pytest.raises(ValueError):
+        factorial(n)
+
+
+@given(st.floats() | st.text() | st.decimals(allow_nan=False))
+def test_factorial_rejects_non_integers(value):
+    with pytest.raises(TypeError):
+        factorial(value)
+
+
+@given(huge_integers, huge_integers)
+def test_multiply_integers_is_commutative_and_exact(a, b):
+    assert multiply(a, b) == multiply(b, a) == int(Fraction(a) * Fraction(b))
+
+
+@given(huge_integers, huge_integers, huge_integers)
+def test_multiply_integers_is_associative_and_distributive(a, b, c):
+    assert multiply(multiply(a, b), c) == multiply(a, multiply(b, c))
+    assert multiply(a, b + c) == multiply(a, b) + multiply(a, c)
+
+
+@given(finite_floats, finite_floats)
+def test_multiply_floats_is_correctly_rounded(a, b):
+    exact = Fraction(a) * Fraction(b)
+    result = multiply(a, b)
+    assert result == multiply(b, a)
+    if math.isfinite(result):
+        assert result == float(exact)
+    else:
+        assert abs(exact) > Fraction(sys.float_info.max)
+
+
+@given(st.floats())
+def test_multiply_identity_and_nan(x):
+    if math.isnan(x):
+        assert math.isnan(multiply(x, 1.0))
+    else:
+        assert multiply(x, 1) == x
+        assert math.copysign(1, multiply(x, -1.0)) == -math.copysign(1, x)
+
+
+@given(huge_integers, finite_floats)
+def test_multiply_mixed_int_and_float(a, x):
+    try:
+        expected = float(a) * x
+    except OverflowError:
+        with pytest.raises(OverflowError):
+            multiply(a, x)
+        return
+    assert multiply(a, x) == expected
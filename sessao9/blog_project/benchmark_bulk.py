@@ -0,0 +1,79 @@
+"""
+Benchmark importing and publishing posts one by one vs the bulk endpoints.
+
+Builds a temporary SQLite database and times, for N posts (5,000 by
+default):
+  - one POST /api/posts/ per post, then one POST /api/posts/<id>/publish/ per post
+  - POST /api/posts/bulk/ and POST /api/posts/publish_many/, BULK_MAX_ITEMS posts
+    per request
+
+Run with: python benchmark_bulk.py [posts]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
+
+import django
+from django.conf import settings
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIRequestFactory
+
+from blog_app.models import BlogPost
+from blog_app.serializers import BULK_MAX_ITEMS
+from blog_app.views import BlogPostViewSet
+
+factory = APIRequestFactory()
+
+
+def payload(count):
+    content = 'lorem ipsum dolor sit amet ' * 40
+    return [{'title': f'Imported {i}', 'content': content, 'author': f'author{i % 50}'}
+            for i in range(count)]
+
+
+def one_by_one(posts):
+    create = BlogPostViewSet.as_view({'post': 'create'})
+    publish = BlogPostViewSet.as_view({'post': 'publish'})
+    ids = [create(factory.post('/api/posts/', post, format='json')).data['id'] for post in posts]
+    for pk in ids:
+        publish(factory.post(f'/api/posts/{pk}/publish/'), pk=pk)
+
+
+def in_bulk(posts):
+    create = BlogPostViewSet.as_view({'post': 'bulk'})
+    publish = BlogPostViewSet.as_view({'post': 'publish_many'})
+    for start in range(0, len(posts), BULK_MAX_ITEMS):
+        chunk = posts[start:start + BULK_MAX_ITEMS]
+        created = create(factory.post('/api/posts/bulk/', chunk, format='json')).data
+        ids = [post['id'] for post in created]
+        publish(factory.post('/api/posts/publish_many/', {'ids': ids}, format='json'))
+
+
+def main(count=5_000):
+    call_command('migrate', verbosity=0)
+    posts = payload(count)
+    print(f'{"import + publish":<20} {f"{count:,} posts":>12}')
+    for name, run in (('one by one', one_by_one), ('bulk endpoints', in_bulk)):
+        BlogPost.objects.all().delete()
+        started = time.perf_counter()
+        run(posts)
+        elapsed = time.perf_counter() - started
+        assert BlogPost.objects.filter(is_published=True).count() == count
+        print(f'{name:<20} {elapsed:>10.2f}s')
+    connection.close()
+    shutil.rmtree(os.path.dirname(DB_PATH))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5_000)
@@ -0,0 +1,101 @@
+"""
+Benchmark the by_author action before and after pagination and sparse fieldsets.
+
+Builds a temporary SQLite database where each of 10 authors has N/10 long
+posts (20,000 posts of ~600 words by default) and measures response size
+and time for:
+  - the old behaviour: every post of the author, all fields
+  - the paginated action: one page, all fields
+  - the paginated action with ?fields=id,title,published_date
+
+Run with: python benchmark_by_author.py [rows]
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
+
+import django
+from django.conf import settings
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from blog_app.models import BlogPost
+from blog_app.serializers import BlogPostSerializer
+from blog_app.views import BlogPostViewSet
+
+AUTHOR = 'author0'
+REPEAT = 5
+
+
+def populate(rows):
+    call_command('migrate', verbosity=0)
+    start = datetime(2020, 1, 1)
+    sql = (
+        f'INSERT INTO {BlogPost._meta.db_table} '
+        '(title, content, published_date, is_published, author, category, word_count) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)'
+    )
+    content = 'lorem ipsum dolor sit amet consectetur ' * 100
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, [
+            (f'Post {i}', content, (start + timedelta(minutes=i)).isoformat(sep=' '),
+             True, f'author{i % 10}', f'cat{i % 5}', 600)
+            for i in range(rows)
+        ])
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def old_by_author(request):
+    """by_author as it was: every post of the author, every field"""
+    posts = BlogPost.objects.filter(author=request.GET['author'])
+    return Response(BlogPostSerializer(posts, many=True).data)
+
+
+def measure(view, url):
+    request = APIRequestFactory().get(url)
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        response = view(request)
+        body = JSONRenderer().render(response.data)
+        samples.append(time.perf_counter() - start)
+    return len(body), statistics.median(samples) * 1000
+
+
+def main(rows=20_000):
+    print(f'Populating {rows:,} posts in {DB_PATH} ...')
+    populate(rows)
+
+    view = BlogPostViewSet.as_view({'get': 'by_author'})
+    url = f'/api/posts/by_author/?author={AUTHOR}'
+    cases = [
+        ('before: all posts, all fields', old_by_author, url),
+        ('paginated, all fields', view, url),
+        ('paginated, ?fields=id,title,published_date', view, f'{url}&fields=id,title,published_date'),
+    ]
+    print(f"\n{'by_author':<44} {'payload':>12} {'time':>10}")
+    for name, handler, case_url in cases:
+        size, elapsed = measure(handler, case_url)
+        print(f'{name:<44} {size:>10,} B {elapsed:>8.2f}ms')
+    connection.close()
+    shutil.rmtree(os.path.dirname(DB_PATH))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20_000)
@@ -0,0 +1,89 @@
+"""
+Benchmark the streaming export: time and peak memory against export size.
+
+Builds a temporary SQLite database with N posts (1,000,000 by default) and
+streams /api/posts/export/ as NDJSON and CSV for a tenth of the posts
+(?category=cat0) and for all of them, measuring peak Python memory with
+tracemalloc. Peak memory should not grow with the number of posts.
+
+Run with: python benchmark_export.py [rows]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
+
+import django
+from django.conf import settings
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+
+from blog_app.models import BlogPost
+from blog_app.views import BlogPostViewSet
+
+
+def populate(rows):
+    call_command('migrate', verbosity=0)
+    # SQLite stores aware datetimes as naive UTC text
+    start = datetime(2020, 1, 1)
+    sql = (
+        f'INSERT INTO {BlogPost._meta.db_table} '
+        '(title, content, published_date, is_published, author, category, word_count) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)'
+    )
+    content = 'lorem ipsum dolor sit amet ' * 20
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(0, rows, 50_000):
+            cursor.executemany(sql, [
+                (f'Post {i}', content, (start + timedelta(seconds=i)).isoformat(sep=' '),
+                 i % 2 == 0, f'author{i % 1000}', f'cat{i % 10}', 100)
+                for i in range(offset, min(rows, offset + 50_000))
+            ])
+
+
+def export(url):
+    """Stream an export to nowhere; return (posts, bytes, seconds, peak MiB)"""
+    # The router passes the action's options (its renderer classes) the same way
+    view = BlogPostViewSet.as_view({'get': 'export'}, **BlogPostViewSet.export.kwargs)
+    tracemalloc.start()
+    started = time.perf_counter()
+    response = view(APIRequestFactory().get(url))
+    lines = size = 0
+    for chunk in response.streaming_content:
+        lines += chunk.count(b'\n')
+        size += len(chunk)
+    elapsed = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1] / 2**20
+    tracemalloc.stop()
+    return lines, size, elapsed, peak
+
+
+def main(rows=1_000_000):
+    print(f'Populating {rows:,} posts in {DB_PATH} ...')
+    populate(rows)
+
+    print(f"\n{'export':<26} {'posts':>10} {'size':>10} {'time':>8} {'peak memory':>12}")
+    for fmt in ('ndjson', 'csv'):
+        for label, query in (('cat0', '&category=cat0'), ('all', '')):
+            lines, size, elapsed, peak = export(f'/api/posts/export/?format={fmt}{query}')
+            posts = lines - (fmt == 'csv')
+            print(f'{fmt + " " + label:<26} {posts:>10,} {size / 2**20:>7.1f}MiB '
+                  f'{elapsed:>7.1f}s {peak:>9.2f}MiB')
+    connection.close()
+    shutil.rmtree(os.path.dirname(DB_PATH))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
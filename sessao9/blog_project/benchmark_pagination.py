@@ -0,0 +1,105 @@
+"""
+Benchmark page-number vs cursor pagination on a large posts table.
+
+Builds a temporary SQLite database with N posts (1,000,000 by default) and
+times page 1 and page 10,000 of /api/posts/ with:
+  - page numbers (COUNT(*) + OFFSET)
+  - page numbers with ?count=false (OFFSET only)
+  - cursor pagination (keyset on published_date, id)
+
+Run with: python benchmark_pagination.py [rows]
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
+
+import django
+from django.conf import settings
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+settings.DATABASES['default']['NAME'] = DB_PATH
+settings.ALLOWED_HOSTS = ['*']
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection, transaction
+from rest_framework.test import APIRequestFactory
+
+from blog_app.models import BlogPost
+from blog_app.pagination import KeysetPagination
+from blog_app.views import BlogPostViewSet
+
+PAGE = 10_000
+REPEAT = 5
+
+
+def populate(rows):
+    call_command('migrate', verbosity=0)
+    # SQLite stores aware datetimes as naive UTC text
+    start = datetime(2020, 1, 1)
+    sql = (
+        f'INSERT INTO {BlogPost._meta.db_table} '
+        '(title, content, published_date, is_published, author, category, word_count) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?)'
+    )
+    content = 'lorem ipsum dolor sit amet ' * 20
+    with transaction.atomic(), connection.cursor() as cursor:
+        for offset in range(0, rows, 50_000):
+            cursor.executemany(sql, [
+                (f'Post {i}', content, (start + timedelta(seconds=i // 2)).isoformat(sep=' '),
+                 i % 3 != 0, f'author{i % 1000}', f'cat{i % 10}', 100)
+                for i in range(offset, min(rows, offset + 50_000))
+            ])
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def timed(view, url):
+    request = APIRequestFactory().get(url)
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        response = view(request)
+        samples.append(time.perf_counter() - start)
+        assert response.status_code == 200, response.data
+        assert len(response.data['results']) == KeysetPagination.page_size
+    return statistics.median(samples) * 1000
+
+
+def cursor_for_page(page, page_size):
+    """The cursor a client holds after following `page - 1` next links"""
+    last = BlogPost.objects.order_by('-published_date', '-id')[(page - 1) * page_size - 1]
+    paginator = KeysetPagination()
+    paginator.base_url = '/api/posts/'
+    return paginator.encode_cursor(last, reverse=False).split('cursor=')[1]
+
+
+def main(rows=1_000_000):
+    print(f'Populating {rows:,} posts in {DB_PATH} ...')
+    started = time.perf_counter()
+    populate(rows)
+    print(f'  done in {time.perf_counter() - started:.1f}s\n')
+
+    view = BlogPostViewSet.as_view({'get': 'list'})
+    page_size = KeysetPagination.page_size
+    deep_cursor = cursor_for_page(PAGE, page_size)
+    cases = [
+        ('page numbers', '/api/posts/', f'/api/posts/?page={PAGE}'),
+        ('page numbers, count=false', '/api/posts/?count=false', f'/api/posts/?count=false&page={PAGE}'),
+        ('cursor', '/api/posts/?pagination=cursor', f'/api/posts/?cursor={deep_cursor}'),
+    ]
+    print(f"{'pagination':<28} {'page 1':>10} {f'page {PAGE:,}':>12}")
+    for name, first, deep in cases:
+        print(f'{name:<28} {timed(view, first):>8.2f}ms {timed(view, deep):>10.2f}ms')
+    connection.close()
+    shutil.rmtree(os.path.dirname(DB_PATH))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
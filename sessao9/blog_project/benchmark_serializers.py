@@ -0,0 +1,90 @@
+"""
+Microbenchmark of the two read serialization paths, per 1,000 posts.
+
+Builds a temporary SQLite database with 1,000 posts and times:
+  - ModelSerializer: model instances -> BlogPostSerializer(many=True) -> JSONRenderer
+  - fast path: .values() rows -> FieldPlan.render -> ORJSONRenderer
+both end to end (query included) and for serialization + rendering alone.
+
+Run with: python benchmark_serializers.py [repeat]
+"""
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
+
+import django
+from django.conf import settings
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), 'benchmark.sqlite3')
+settings.DATABASES['default']['NAME'] = DB_PATH
+django.setup()
+
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+
+from blog_app.fast_serializers import get_field_plan
+from blog_app.models import BlogPost
+from blog_app.renderers import ORJSONRenderer
+from blog_app.serializers import BlogPostSerializer
+
+POSTS = 1_000
+
+
+def populate():
+    call_command('migrate', verbosity=0)
+    start = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    content = 'lorem ipsum dolor sit amet ' * 40
+    posts = [
+        BlogPost(title=f'Post {i}', content=content, published_date=start + timedelta(minutes=i),
+                 author=f'author{i % 20}', category=f'cat{i % 5}', cached_word_count=200)
+        for i in range(POSTS)
+    ]
+    BlogPost.objects.bulk_create(posts)
+
+
+def model_serializer(rows=None):
+    posts = rows if rows is not None else list(BlogPost.objects.all())
+    return JSONRenderer().render(BlogPostSerializer(posts, many=True).data)
+
+
+def fast_path(rows=None):
+    plan = get_field_plan(BlogPostSerializer)
+    rows = rows if rows is not None else list(plan.values(BlogPost.objects.all()))
+    return ORJSONRenderer().render(plan.render(rows))
+
+
+def timed(func, *args, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main(repeat=20):
+    populate()
+    assert model_serializer() == fast_path()
+    instances = list(BlogPost.objects.all())
+    rows = list(get_field_plan(BlogPostSerializer).values(BlogPost.objects.all()))
+
+    print(f"{'per 1,000 posts':<32} {'ModelSerializer':>16} {'fast path':>12} {'speedup':>8}")
+    for name, slow, fast in (
+        ('query + serialize + render', (model_serializer,), (fast_path,)),
+        ('serialize + render', (model_serializer, instances), (fast_path, rows)),
+    ):
+        slow_ms, fast_ms = timed(*slow, repeat=repeat), timed(*fast, repeat=repeat)
+        print(f'{name:<32} {slow_ms:>14.2f}ms {fast_ms:>10.2f}ms {slow_ms / fast_ms:>7.1f}x')
+    connection.close()
+    shutil.rmtree(os.path.dirname(DB_PATH))
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
@@ -2,7 +2,9 @@
 Blog app admin configuration
 """
 from django.contrib import admin
+from django.db.models import Q
 from .models import BlogPost
+from .search import get_backend, parse_terms
 
 
 @admin.register(BlogPost)
@@ -20,3 +22,14 @@ class BlogPostAdmin(admin.ModelAdmin):
             'fields': ('author', 'category', 'is_published', 'published_date')
         }),
     )
+    
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Search title and content through the full-text index instead of
+        LIKE '%term%'; author is still matched as a substring
+        """
+        terms = parse_terms(search_term)
+        if not terms:
+            return queryset, False
+        matches = get_backend().search(queryset, terms).values('pk')
+        return queryset.filter(Q(pk__in=matches) | Q(author__icontains=search_term)), False
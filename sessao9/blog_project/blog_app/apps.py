@@ -2,9 +2,35 @@
 Blog app configuration
 """
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def install_search_index(sender, using, **kwargs):
+    """
+    Create the full-text index on databases built without migrations
+
+    Migration 0005 creates it normally; when migrations are disabled (e.g.
+    pytest --nomigrations) the tables come from the models and the index is
+    created here instead. Replicas get it through replication.
+    """
+    from django.db import connections, router
+    from django.db.migrations.loader import MigrationLoader
+    from .search import get_backend
+    module_name, _ = MigrationLoader.migrations_module(sender.label)
+    if module_name is not None or not router.allow_migrate(using, sender.label):
+        return
+    try:
+        backend = get_backend(connections[using])
+    except NotImplementedError:
+        return
+    backend.install()
 
 
 class BlogAppConfig(AppConfig):
     """Configuration for the blog app"""
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        post_migrate.connect(install_search_index, sender=self)
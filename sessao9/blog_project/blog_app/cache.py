@@ -0,0 +1,173 @@
+"""
+Response caching for the blog API
+
+Read actions are cached under keys built from the normalised query
+parameters and the current version of every scope the response depends
+on:
+
+    posts            any post (unfiltered lists, search)
+    post:<pk>        a single post (detail)
+    category:<name>  posts in a category
+    author:<name>    posts by an author
+
+Writes bump the versions of the scopes they touch (see signals.py and the
+bulk serializer), so stale
+entries are never read again and simply expire. A version is the time of
+the last change in nanoseconds; it doubles as Last-Modified (once its
+second is over), and ETags are derived from the key, so conditional requests are answered with 304 before
+the database or the serializer is touched.
+
+A response read from a replica within the read-your-writes window after a
+change may predate that change, so it is served without being cached or
+given validators.
+"""
+import functools
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from .routers import get_sticky_window, reading_from_replica
+
+CACHE_ALIAS = getattr(settings, 'BLOG_CACHE_ALIAS', 'default')
+CACHE_TIMEOUT = getattr(settings, 'BLOG_CACHE_TIMEOUT', 300)
+
+# Query parameters that change the response; anything else is left out of
+# the key so it cannot be used to bypass the cache
+CACHE_PARAMS = (
+    'published', 'category', 'author', 'min_words', 'ordering', 'fields',
+    'page', 'count', 'pagination', 'cursor', 'q',
+)
+
+
+def _digest(value):
+    return hashlib.sha1(value.encode()).hexdigest()
+
+
+def _version_key(scope):
+    return f'blog:version:{_digest(scope)}'
+
+
+def get_versions(scopes):
+    """Return the current version of each scope, starting missing ones now"""
+    cache = caches[CACHE_ALIAS]
+    keys = {scope: _version_key(scope) for scope in scopes}
+    found = cache.get_many(keys.values())
+    versions = {}
+    for scope, key in keys.items():
+        if key not in found:
+            # add() keeps a version set concurrently by another process
+            cache.add(key, time.time_ns(), timeout=None)
+            found[key] = cache.get(key, time.time_ns())
+        versions[scope] = found[key]
+    return versions
+
+
+def bump_versions(scopes):
+    """Invalidate every cached response that depends on one of the scopes"""
+    now = time.time_ns()
+    cache = caches[CACHE_ALIAS]
+    keys = [_version_key(scope) for scope in set(scopes)]
+    current = cache.get_many(keys)
+    cache.set_many({key: max(now, current.get(key, 0) + 1) for key in keys}, timeout=None)
+
+
+def invalidate(scopes):
+    """
+    Bump scopes now and again once the current transaction commits, so a
+    response cached from a read made before the commit does not survive it
+    """
+    scopes = list(scopes)
+    bump_versions(scopes)
+    transaction.on_commit(lambda: bump_versions(scopes))
+
+
+def post_scopes(category, author, pk=None):
+    """Scopes touched by a change to a post"""
+    scopes = ['posts', f'category:{category}', f'author:{author}']
+    if pk is not None:
+        scopes.append(f'post:{pk}')
+    return scopes
+
+
+def normalise_params(query_params):
+    """The query parameters that affect a response, in a canonical form"""
+    params = {}
+    for name in CACHE_PARAMS:
+        value = query_params.get(name)
+        if value in (None, ''):
+            continue
+        if name == 'published':
+            value = str(value.lower() == 'true').lower()
+        if name == 'page' and value == '1':
+            continue
+        params[name] = value
+    return '&'.join(f'{name}={value}' for name, value in sorted(params.items()))
+
+
+def _with_headers(response, headers):
+    for name, value in headers.items():
+        response[name] = value
+    return response
+
+
+def _may_be_stale(versions):
+    # Read from a replica that may not have caught up with the last change
+    changed_ns_ago = time.time_ns() - max(versions.values())
+    return reading_from_replica() and changed_ns_ago <= get_sticky_window() * 1_000_000_000
+
+
+def cache_response(method):
+    """
+    Serve a read action from the cache
+
+    The view's get_cache_scopes() names the scopes the response depends on.
+    Only the response data is cached, so content negotiation still happens
+    per request; 200 responses carry ETag and Last-Modified and matching
+    conditional requests get a 304.
+    """
+    @functools.wraps(method)
+    def wrapper(view, request, *args, **kwargs):
+        versions = get_versions(view.get_cache_scopes())
+        key = 'blog:response:' + _digest('|'.join([
+            view.action,
+            request.get_host(),
+            str(kwargs.get(view.lookup_url_kwarg or view.lookup_field, '')),
+            normalise_params(request.query_params),
+            *(f'{scope}={version}' for scope, version in sorted(versions.items())),
+        ]))
+        etag = quote_etag(key[-32:])
+        headers = {'ETag': etag}
+        # HTTP dates have whole seconds: until the second of the last change
+        # is over, a later change could share its Last-Modified, so only the
+        # ETag is used
+        last_modified = max(versions.values()) // 1_000_000_000
+        if last_modified < time.time_ns() // 1_000_000_000:
+            headers['Last-Modified'] = http_date(last_modified)
+        else:
+            last_modified = None
+
+        not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if not_modified is not None:
+            return _with_headers(not_modified, headers)
+
+        cache = caches[CACHE_ALIAS]
+        data = cache.get(key)
+        if data is not None:
+            response = Response(data)
+        else:
+            response = method(view, request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            if _may_be_stale(versions):
+                return response
+            cache.set(key, response.data, CACHE_TIMEOUT)
+
+        return _with_headers(response, headers)
+    return wrapper
@@ -0,0 +1,38 @@
+"""
+Streaming export of blog posts
+
+Rows are read with .values().iterator(chunk_size=...), turned into the
+serializer's output by the list FieldPlan a chunk at a time and encoded by a
+streaming renderer (NDJSON or CSV), so memory use does not grow with the
+number of posts exported.
+"""
+import itertools
+
+# Rows fetched from the database per round trip
+EXPORT_CHUNK_SIZE = 2000
+# Bytes handed to the server per write
+EXPORT_BUFFER_SIZE = 64 * 1024
+
+
+def iter_rows(queryset, plan, chunk_size=None):
+    """Yield the plan's output for every post of queryset, chunk_size rows at a time"""
+    chunk_size = chunk_size or EXPORT_CHUNK_SIZE
+    rows = plan.values(queryset).iterator(chunk_size=chunk_size)
+    while True:
+        chunk = list(itertools.islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield from plan.render(chunk)
+
+
+def export_posts(queryset, plan, renderer, chunk_size=None):
+    """Yield the encoded export of queryset in blocks of about EXPORT_BUFFER_SIZE bytes"""
+    buffer, size = [], 0
+    for line in renderer.stream(iter_rows(queryset, plan, chunk_size), plan.names):
+        buffer.append(line)
+        size += len(line)
+        if size >= EXPORT_BUFFER_SIZE:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
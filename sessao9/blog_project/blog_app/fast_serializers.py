@@ -0,0 +1,106 @@
+"""
+Read-only fast path for serializing lists of posts
+
+A ModelSerializer builds a model instance per row and then walks its fields
+for every instance, through get_attribute, to_representation and an
+OrderedDict per post. For lists that work is the same for every row, so a
+FieldPlan does it once: it reads the serializer's fields, fetches just their
+columns with .values() and turns each row dict into the serializer's output
+with a precompiled list of (output name, column, converter) steps.
+
+The output is identical to the serializer's. Writes keep using the
+ModelSerializer and its validation.
+"""
+import functools
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.settings import api_settings
+
+# Fields whose representation of a database value is the value itself
+PASSTHROUGH_FIELDS = (
+    serializers.BooleanField, serializers.CharField, serializers.IntegerField,
+)
+
+
+def _iso_datetime(tz):
+    # DateTimeField.to_representation for ISO 8601 output in timezone tz
+    def convert(value):
+        if tz is not None:
+            value = value.astimezone(tz)
+        value = value.isoformat()
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+        return value
+    return convert
+
+
+def _converter(field):
+    """
+    A factory taking the current timezone and returning how the field turns
+    a column value into output, or None when the value is output as is
+    """
+    if isinstance(field, serializers.DateTimeField):
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is not None and output_format.lower() == ISO_8601:
+            return _iso_datetime
+        return lambda tz: field.to_representation
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return None
+    return lambda tz: field.to_representation
+
+
+class FieldPlan:
+    """
+    Columns to fetch and conversion steps for a serializer's fields
+
+    Only fields backed by a single model column are supported (no
+    SerializerMethodField, source='*' or related fields).
+    """
+
+    def __init__(self, serializer_class, fields=None):
+        kwargs = {} if fields is None else {'fields': fields}
+        serializer = serializer_class(**kwargs)
+        self.steps = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField) or '.' in field.source \
+                    or field.source == '*':
+                raise ValueError(f"Field '{name}' is not a plain column")
+            self.steps.append((name, field.source, _converter(field)))
+        self.names = [name for name, _, _ in self.steps]
+        self.columns = [column for _, column, _ in self.steps]
+
+    def values(self, queryset, *extra_columns):
+        """The queryset as row dicts holding the plan's columns (and extra_columns)"""
+        columns = dict.fromkeys([*self.columns, *extra_columns])
+        return queryset.values(*columns)
+
+    def render(self, rows):
+        """Serializer output for a list of row dicts"""
+        # Looked up once per list rather than once per datetime
+        tz = timezone.get_current_timezone() if settings.USE_TZ else None
+        steps = [
+            (name, column, None if converter is None else converter(tz))
+            for name, column, converter in self.steps
+        ]
+        output = []
+        for row in rows:
+            item = {}
+            for name, column, convert in steps:
+                value = row[column]
+                item[name] = value if convert is None or value is None else convert(value)
+            output.append(item)
+        return output
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_plan(serializer_class, fields):
+    return FieldPlan(serializer_class, None if fields is None else list(fields))
+
+
+def get_field_plan(serializer_class, fields=None):
+    """The FieldPlan for a serializer and sparse fieldset, compiled once"""
+    return _cached_plan(serializer_class, None if fields is None else tuple(fields))
@@ -0,0 +1,65 @@
+"""
+Export blog posts as NDJSON or CSV
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.http import HttpRequest, QueryDict
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+
+from blog_app.export import EXPORT_CHUNK_SIZE, export_posts
+from blog_app.fast_serializers import get_field_plan
+from blog_app.renderers import CSVRenderer, NDJSONRenderer
+from blog_app.views import BlogPostViewSet
+
+RENDERERS = {renderer.format: renderer for renderer in (NDJSONRenderer, CSVRenderer)}
+
+# Options passed to the viewset as the query parameters of the same name
+FILTER_OPTIONS = ('published', 'category', 'author', 'min_words', 'ordering', 'fields')
+
+
+class Command(BaseCommand):
+    """Stream posts to a file or stdout with the API's export filters"""
+    help = 'Export blog posts as NDJSON or CSV, filtered like /api/posts/export/'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=sorted(RENDERERS), default='ndjson')
+        parser.add_argument('--output', '-o', default='-',
+                            help='File to write (default: stdout)')
+        parser.add_argument('--chunk-size', type=int, default=EXPORT_CHUNK_SIZE,
+                            help=f'Rows fetched per database round trip (default {EXPORT_CHUNK_SIZE})')
+        parser.add_argument('--published', choices=['true', 'false'])
+        parser.add_argument('--category')
+        parser.add_argument('--author')
+        parser.add_argument('--min-words', dest='min_words')
+        parser.add_argument('--ordering', help='e.g. -word_count,title')
+        parser.add_argument('--fields', help='e.g. id,title,published_date')
+
+    def handle(self, *args, **options):
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+
+        params = QueryDict(mutable=True)
+        for name in FILTER_OPTIONS:
+            if options[name] is not None:
+                params[name] = options[name]
+        http_request = HttpRequest()
+        http_request.method = 'GET'
+        http_request.GET = params
+        view = BlogPostViewSet(request=Request(http_request), action='export',
+                               format_kwarg=None, args=(), kwargs={})
+
+        try:
+            queryset = view.get_export_queryset()
+            plan = get_field_plan(view.get_serializer_class(), view.get_sparse_fields())
+        except ValidationError as exc:
+            raise CommandError(f'Invalid filter: {exc.detail}')
+
+        chunks = export_posts(queryset, plan, RENDERERS[options['format']](), options['chunk_size'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending='')
+            return
+        with open(options['output'], 'wb') as output:
+            for chunk in chunks:
+                output.write(chunk)
+        self.stderr.write(self.style.SUCCESS(f"Exported posts to {options['output']}"))
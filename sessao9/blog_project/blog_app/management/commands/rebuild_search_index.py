@@ -0,0 +1,36 @@
+"""
+Rebuild the blog post full-text search index
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from blog_app.search import BATCH_SIZE, get_backend
+
+
+class Command(BaseCommand):
+    """Re-index every blog post in one transaction, in batches"""
+    help = 'Rebuild the full-text search index of blog posts in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE,
+                            help=f'Posts indexed per statement (default {BATCH_SIZE})')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS,
+                            help='Database to rebuild the index on')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+        try:
+            backend = get_backend(connections[options['database']])
+        except NotImplementedError as exc:
+            raise CommandError(str(exc))
+
+        # Create a missing index without filling it: the rebuild below does
+        backend.install(rebuild=False)
+
+        def progress(indexed):
+            if options['verbosity'] > 1:
+                self.stdout.write(f'  {indexed} posts indexed')
+
+        indexed = backend.rebuild(batch_size=options['batch_size'], progress=progress)
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} posts'))
@@ -0,0 +1,27 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BlogPost',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('content', models.TextField()),
+                ('published_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('is_published', models.BooleanField(default=False)),
+                ('author', models.CharField(default='Anonymous', max_length=100)),
+                ('category', models.CharField(default='General', max_length=50)),
+            ],
+        ),
+    ]
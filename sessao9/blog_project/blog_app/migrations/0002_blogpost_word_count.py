@@ -0,0 +1,18 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blogpost',
+            name='cached_word_count',
+            field=models.PositiveIntegerField(db_column='word_count', db_index=True, default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations, transaction
+
+BATCH_SIZE = 1000
+
+
+def backfill_word_count(apps, schema_editor):
+    """
+    Fill word_count for existing posts, BATCH_SIZE rows at a time.
+
+    Rows are walked by primary key so each batch is an indexed range scan,
+    and only the content column is loaded. Each batch commits on its own,
+    so a large table is never locked for the whole backfill.
+    """
+    BlogPost = apps.get_model('blog_app', 'BlogPost')
+    db_alias = schema_editor.connection.alias
+    posts = BlogPost.objects.using(db_alias).order_by('pk')
+    last_pk = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_pk).only('pk', 'content')[:BATCH_SIZE])
+        if not batch:
+            break
+        for post in batch:
+            post.cached_word_count = len(post.content.split())
+        with transaction.atomic(using=db_alias):
+            BlogPost.objects.using(db_alias).bulk_update(batch, ['cached_word_count'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('blog_app', '0002_blogpost_word_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_word_count, migrations.RunPython.noop, elidable=True),
+    ]
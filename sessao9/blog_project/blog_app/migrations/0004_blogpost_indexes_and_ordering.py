@@ -0,0 +1,33 @@
+# Generated by Django 5.0.1 on 2026-10-19 10:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0003_backfill_word_count'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='blogpost',
+            options={'ordering': ['-published_date', '-id']},
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['published_date', 'id'], name='blogpost_pubdate_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['is_published', 'category', 'published_date'], name='blogpost_pub_cat_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['category', 'published_date'], name='blogpost_cat_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='blogpost',
+            index=models.Index(fields=['author', 'published_date'], name='blogpost_author_date_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    """Create the full-text index (FTS5 table or GIN index) and fill it"""
+    from blog_app.search import get_backend
+    try:
+        get_backend(schema_editor.connection).install()
+    except NotImplementedError:
+        pass
+
+
+def uninstall_search_index(apps, schema_editor):
+    from blog_app.search import get_backend
+    try:
+        get_backend(schema_editor.connection).uninstall()
+    except NotImplementedError:
+        pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog_app', '0004_blogpost_indexes_and_ordering'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -16,6 +16,8 @@ class BlogPost(models.Model):
         is_published: Indica se o post está publicado
         author: Autor do post
         category: Categoria do post
+        cached_word_count: Número de palavras do conteúdo, mantido em save()
+            (coluna `word_count`, indexada para filtros e ordenação)
     """
     title = models.CharField(max_length=200)
     content = models.TextField()
@@ -23,7 +25,40 @@ class BlogPost(models.Model):
     is_published = models.BooleanField(default=False)
     author = models.CharField(max_length=100, default="Anonymous")
     category = models.CharField(max_length=50, default="General")
+    cached_word_count = models.PositiveIntegerField(
+        default=0, db_index=True, editable=False, db_column="word_count"
+    )
     
+    class Meta:
+        # Ordem estável: published_date pode repetir-se, id desempata
+        ordering = ["-published_date", "-id"]
+        indexes = [
+            # Listagem sem filtros e paginação por (published_date, id)
+            models.Index(fields=["published_date", "id"], name="blogpost_pubdate_id_idx"),
+            # ?published= e ?published=&category=, já pela ordem da listagem
+            models.Index(
+                fields=["is_published", "category", "published_date"],
+                name="blogpost_pub_cat_date_idx",
+            ),
+            # ?category= sozinho não usa o índice acima (não é prefixo)
+            models.Index(fields=["category", "published_date"], name="blogpost_cat_date_idx"),
+            # by_author
+            models.Index(fields=["author", "published_date"], name="blogpost_author_date_idx"),
+        ]
+    
+    def save(self, *args, **kwargs):
+        """
+        Guarda o post, recalculando o número de palavras do conteúdo.
+
+        Operações que não passam por save() (bulk_create, bulk_update,
+        QuerySet.update) têm de definir cached_word_count explicitamente.
+        """
+        self.cached_word_count = self.word_count()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "content" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "cached_word_count"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         """Retorna uma representação em string do BlogPost."""
         return self.title
@@ -0,0 +1,172 @@
+"""
+Blog app pagination classes
+"""
+import base64
+import binascii
+from collections import OrderedDict
+from datetime import datetime
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _wants_count(request, default):
+    value = request.query_params.get('count', None)
+    if value is None:
+        return default
+    return value.lower() not in ('false', '0', 'no')
+
+
+class BlogPostPageNumberPagination(PageNumberPagination):
+    """
+    Page number pagination whose COUNT(*) can be skipped with ?count=false
+
+    Without the count, one extra row is fetched to know whether there is a
+    next page, and the response has no 'count' key.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if _wants_count(request, default=True):
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.page = None
+        page_size = self.get_page_size(request)
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound('Invalid page.')
+        if self.page_number < 1:
+            raise NotFound('Invalid page.')
+
+        offset = (self.page_number - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        if not rows and self.page_number != 1:
+            raise NotFound('Invalid page.')
+        self.has_next = len(rows) > page_size
+        return rows[:page_size]
+
+    def get_next_link(self):
+        if self.page is not None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page is not None:
+            return super().get_previous_link()
+        if self.page_number == 1:
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        if self.page is not None:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination on (published_date, id), newest first
+
+    Each page continues from the key of the previous page's last row, so
+    the database walks the (published_date, id) index from that point
+    instead of counting and skipping OFFSET rows: deep pages cost the same
+    as the first one. Cursors are opaque; the total count is only computed
+    when asked for with ?count=true.
+    """
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = 'cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if 'ordering' in request.query_params:
+            raise ValidationError({'ordering': 'Cursor pagination always orders by -published_date, -id'})
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.count = queryset.count() if _wants_count(request, default=False) else None
+        cursor = self.decode_cursor(request)
+
+        if cursor is None:
+            reverse = False
+            queryset = queryset.order_by('-published_date', '-id')
+        else:
+            published_date, pk, reverse = cursor
+            if reverse:
+                queryset = (
+                    queryset.filter(published_date__gte=published_date)
+                    .exclude(published_date=published_date, id__lte=pk)
+                    .order_by('published_date', 'id')
+                )
+            else:
+                queryset = (
+                    queryset.filter(published_date__lte=published_date)
+                    .exclude(published_date=published_date, id__gte=pk)
+                    .order_by('-published_date', '-id')
+                )
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.page = rows
+        return rows
+
+    def encode_cursor(self, post, reverse):
+        """Cursor after (or before, if reverse) a post instance or .values() row"""
+        if isinstance(post, dict):
+            published_date, pk = post['published_date'], post['id']
+        else:
+            published_date, pk = post.published_date, post.pk
+        raw = f"{'p' if reverse else 'n'}|{published_date.isoformat()}|{pk}"
+        token = base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+            direction, published_date, pk = raw.split('|')
+            if direction not in ('n', 'p'):
+                raise ValueError(direction)
+            return datetime.fromisoformat(published_date), int(pk), direction == 'p'
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound('Invalid cursor')
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        fields = [
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]
+        if self.count is not None:
+            fields.insert(0, ('count', self.count))
+        return Response(OrderedDict(fields))
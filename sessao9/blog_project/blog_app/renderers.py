@@ -0,0 +1,97 @@
+"""
+Blog app renderers
+"""
+import csv
+import itertools
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer that encodes with orjson when it is installed
+
+    The output matches JSONRenderer's compact form. Indented output
+    (Accept: application/json; indent=4) and installs without orjson use
+    the standard encoder.
+    """
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Datetimes, decimals, lazy strings etc. go through DRF's encoder so
+        # they are formatted exactly as JSONRenderer formats them
+        ret = orjson.dumps(
+            data,
+            default=self.encoder_class().default,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        )
+        # Escaped by JSONRenderer too: valid JSON, but not valid JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON: one object per line
+
+    stream() encodes an iterable of rows lazily, for StreamingHttpResponse;
+    render() is used for whole responses such as errors.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+    
+    def __init__(self):
+        self.json_renderer = ORJSONRenderer()
+    
+    def stream(self, rows, fields=None):
+        for row in rows:
+            yield self.json_renderer.render(row) + b'\n'
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.stream(rows))
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV with a header row; fields are the column names, in order
+
+    stream() encodes an iterable of rows lazily, for StreamingHttpResponse;
+    render() is used for whole responses such as errors.
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+    
+    def stream(self, rows, fields=None):
+        rows = iter(rows)
+        if fields is None:
+            first = next(rows, None)
+            if first is None:
+                return
+            fields = list(first)
+            rows = itertools.chain([first], rows)
+        # The writer returns each formatted line instead of buffering it
+        writer = csv.DictWriter(_Echo(), fieldnames=fields)
+        yield writer.writeheader().encode()
+        for row in rows:
+            yield writer.writerow(row).encode()
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        rows = data if isinstance(data, list) else [data]
+        return b''.join(self.stream(rows))
+
+
+class _Echo:
+    """File-like object whose write() returns what it was given"""
+    
+    def write(self, value):
+        return value
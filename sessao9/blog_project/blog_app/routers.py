@@ -0,0 +1,112 @@
+"""
+Primary / replica database routing
+
+Writes always go to the primary ('default'). Reads go to the primary too,
+unless the current request enabled replica reads: the API does that for
+its plain read actions (list, retrieve, by_author), which then pick one of
+settings.DATABASE_REPLICAS at random.
+
+A client that has just written keeps reading from the primary for
+settings.READ_YOUR_WRITES_SECONDS, so it sees its own change even while
+the replicas lag behind. The window is carried in a signed cookie set by
+ReadYourWritesMiddleware after every successful unsafe request.
+"""
+import contextlib
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core import signing
+
+PRIMARY = 'default'
+
+STICKY_COOKIE = 'blog_read_primary'
+STICKY_SALT = 'blog_app.routers.read_your_writes'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS', 'TRACE')
+
+_replica_reads = ContextVar('blog_replica_reads', default=False)
+
+
+def get_replicas():
+    """Database aliases serving replica reads"""
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def get_sticky_window():
+    """Seconds a client reads from the primary after a write"""
+    return getattr(settings, 'READ_YOUR_WRITES_SECONDS', 5)
+
+
+def reading_from_replica():
+    """Whether reads in the current context go to a replica"""
+    return _replica_reads.get() and bool(get_replicas())
+
+
+@contextlib.contextmanager
+def replica_reads(enabled=True):
+    """Let reads inside the block use a replica (or force the primary)"""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def reads_own_writes(request):
+    """Whether the request comes from a client that wrote within the window"""
+    try:
+        request.get_signed_cookie(STICKY_COOKIE, salt=STICKY_SALT, max_age=get_sticky_window())
+    except (KeyError, signing.BadSignature):
+        return False
+    return True
+
+
+class PrimaryReplicaRouter:
+    """
+    Route writes to the primary and, where enabled, reads to a replica
+
+    Replicas get their schema and data from the primary through
+    replication, so migrations only run on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get():
+            return PRIMARY
+        replicas = get_replicas()
+        return random.choice(replicas) if replicas else PRIMARY
+
+    def db_for_write(self, model, **hints):
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Every alias holds the same data
+        databases = {PRIMARY, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pin a client to the primary for a while after it writes
+
+    A successful POST, PUT, PATCH or DELETE sets a signed cookie that
+    expires with the read-your-writes window; reads carrying it skip the
+    replicas (see reads_own_writes).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            response.set_signed_cookie(
+                STICKY_COOKIE, '1', salt=STICKY_SALT, max_age=get_sticky_window(),
+                httponly=True, samesite='Lax',
+            )
+        return response
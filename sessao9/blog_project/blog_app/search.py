@@ -0,0 +1,261 @@
+"""
+Full-text search over blog posts
+
+Two backends sit behind the same interface, chosen by database vendor:
+
+- SQLite: an external-content FTS5 table over title and content, kept in
+  sync with the posts table by triggers (so bulk_create, bulk_update and
+  QuerySet.update are indexed too) and ranked with bm25().
+- PostgreSQL: a weighted SearchVector over title and content backed by a
+  GIN expression index, ranked with SearchRank.
+
+Both weight title matches above content matches, accept prefix terms
+(`djan*`) and wrap matches in snippets with <mark> tags. The engines mark
+matches with private-use sentinels; the stored text is HTML-escaped before
+the sentinels become <mark> tags, so snippets are safe to render as HTML.
+"""
+import re
+
+from django.db import connection as default_connection
+from django.db import transaction
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+# No stemming on either backend, so both return the same posts
+SEARCH_CONFIG = 'simple'
+TITLE_WEIGHT = 10.0
+SNIPPET_WORDS = 16
+BATCH_SIZE = 1000
+
+# Match delimiters handed to the engines, replaced after escaping
+MARK_START = '\ue000'
+MARK_END = '\ue001'
+
+_TERM = re.compile(r'(\w+)(\*?)')
+
+
+def parse_terms(text):
+    """
+    Split a user query into (word, is_prefix) pairs
+
+    Anything but words and a trailing `*` is dropped, so user input can
+    never reach the engine's query syntax.
+    """
+    return [(word.lower(), bool(star)) for word, star in _TERM.findall(text)]
+
+
+def highlight(snippet):
+    """HTML-escape a snippet and turn its match sentinels into <mark> tags"""
+    if snippet is None:
+        return None
+    return str(escape(snippet)).replace(MARK_START, '<mark>').replace(MARK_END, '</mark>')
+
+
+def get_backend(connection=None):
+    """Return the search backend for a database connection"""
+    connection = connection or default_connection
+    try:
+        backend_class = BACKENDS[connection.vendor]
+    except KeyError:
+        raise NotImplementedError(f"Full-text search is not supported on {connection.vendor}")
+    return backend_class(connection)
+
+
+class SQLiteSearchBackend:
+    """FTS5 table and triggers, bm25() ranking"""
+    table = 'blog_app_blogpost_fts'
+    source = 'blog_app_blogpost'
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def install(self, rebuild=True):
+        """
+        Create the FTS5 table and its triggers; when the table is new and
+        rebuild is true, index the existing posts
+        """
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [self.table]
+            )
+            created = cursor.fetchone() is None
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE IF NOT EXISTS {self.table} USING fts5(
+                    title, content,
+                    content='{self.source}', content_rowid='id',
+                    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+                )
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {self.table}_insert AFTER INSERT ON {self.source}
+                BEGIN
+                    INSERT INTO {self.table} (rowid, title, content)
+                    VALUES (new.id, new.title, new.content);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {self.table}_delete AFTER DELETE ON {self.source}
+                BEGIN
+                    INSERT INTO {self.table} ({self.table}, rowid, title, content)
+                    VALUES ('delete', old.id, old.title, old.content);
+                END
+            """)
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {self.table}_update
+                AFTER UPDATE OF title, content ON {self.source}
+                BEGIN
+                    INSERT INTO {self.table} ({self.table}, rowid, title, content)
+                    VALUES ('delete', old.id, old.title, old.content);
+                    INSERT INTO {self.table} (rowid, title, content)
+                    VALUES (new.id, new.title, new.content);
+                END
+            """)
+        if created and rebuild:
+            self.rebuild()
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            for trigger in ('insert', 'delete', 'update'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {self.table}_{trigger}")
+            cursor.execute(f"DROP TABLE IF EXISTS {self.table}")
+
+    def rebuild(self, batch_size=BATCH_SIZE, progress=None):
+        """
+        Re-index every post, batch_size posts per statement
+
+        The whole rebuild is one transaction: searches keep seeing the old
+        index until it commits, and writers wait for it, so their triggers
+        cannot index a post twice. progress, if given, is called with the
+        number of posts indexed so far after each batch. Returns the total.
+        """
+        last_id, indexed = 0, 0
+        with transaction.atomic(using=self.connection.alias), self.connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table} ({self.table}) VALUES ('delete-all')")
+            while True:
+                cursor.execute(
+                    f"SELECT max(id), count(*) FROM (SELECT id FROM {self.source} "
+                    f"WHERE id > %s ORDER BY id LIMIT %s)", [last_id, batch_size]
+                )
+                batch_last_id, count = cursor.fetchone()
+                if not count:
+                    return indexed
+                cursor.execute(
+                    f"INSERT INTO {self.table} (rowid, title, content) "
+                    f"SELECT id, title, content FROM {self.source} WHERE id > %s AND id <= %s",
+                    [last_id, batch_last_id]
+                )
+                last_id, indexed = batch_last_id, indexed + count
+                if progress is not None:
+                    progress(indexed)
+
+    def match_expression(self, terms):
+        # Every term is quoted, so FTS5 operators in the input are inert
+        return ' '.join(f'"{word}"*' if prefix else f'"{word}"' for word, prefix in terms)
+
+    def search(self, queryset, terms):
+        """Filter queryset to the posts matching terms, annotated with search_rank"""
+        match = self.match_expression(terms)
+        table = queryset.model._meta.db_table
+        matching = RawSQL(f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s", [match])
+        # bm25() is lower for better matches
+        rank = RawSQL(
+            f"SELECT -bm25({self.table}, {TITLE_WEIGHT}, 1.0) FROM {self.table} "
+            f"WHERE {self.table} MATCH %s AND rowid = {table}.id", [match]
+        )
+        return queryset.filter(id__in=matching).annotate(search_rank=rank)
+
+    def snippets(self, ids, terms):
+        """Map each post id to a highlighted excerpt of its best column"""
+        if not ids:
+            return {}
+        placeholders = ', '.join(['%s'] * len(ids))
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, snippet({self.table}, -1, %s, %s, '…', {SNIPPET_WORDS}) "
+                f"FROM {self.table} WHERE {self.table} MATCH %s AND rowid IN ({placeholders})",
+                [MARK_START, MARK_END, self.match_expression(terms), *ids]
+            )
+            return {pk: highlight(snippet) for pk, snippet in cursor.fetchall()}
+
+
+class PostgresSearchBackend:
+    """Weighted SearchVector with a GIN expression index, SearchRank ranking"""
+    index_name = 'blogpost_search_gin'
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def vector(self):
+        # Must stay identical to the indexed expression for the index to be used
+        from django.contrib.postgres.search import SearchVector
+        return (
+            SearchVector('title', weight='A', config=SEARCH_CONFIG)
+            + SearchVector('content', weight='B', config=SEARCH_CONFIG)
+        )
+
+    def query(self, terms):
+        from django.contrib.postgres.search import SearchQuery
+        raw = ' & '.join(f'{word}:*' if prefix else word for word, prefix in terms)
+        return SearchQuery(raw, config=SEARCH_CONFIG, search_type='raw')
+
+    def install(self, rebuild=True):
+        """
+        Create the GIN index on the search vector expression; PostgreSQL
+        indexes the existing posts as it builds it, whatever rebuild says
+        """
+        from django.contrib.postgres.indexes import GinIndex
+        from .models import BlogPost
+        table = BlogPost._meta.db_table
+        with self.connection.cursor() as cursor:
+            constraints = self.connection.introspection.get_constraints(cursor, table)
+        if self.index_name in constraints:
+            return
+        with self.connection.schema_editor() as schema_editor:
+            schema_editor.add_index(BlogPost, GinIndex(self.vector(), name=self.index_name))
+
+    def uninstall(self):
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX IF EXISTS {self.index_name}")
+
+    def rebuild(self, batch_size=BATCH_SIZE, progress=None):
+        """
+        PostgreSQL maintains the index itself, so rebuilding is a REINDEX;
+        batch_size does not apply. Returns the number of posts covered.
+        """
+        from .models import BlogPost
+        with self.connection.cursor() as cursor:
+            cursor.execute(f"REINDEX INDEX {self.index_name}")
+        indexed = BlogPost.objects.using(self.connection.alias).count()
+        if progress is not None:
+            progress(indexed)
+        return indexed
+
+    def search(self, queryset, terms):
+        """Filter queryset to the posts matching terms, annotated with search_rank"""
+        from django.contrib.postgres.search import SearchRank
+        vector, query = self.vector(), self.query(terms)
+        return (
+            queryset.annotate(search_document=vector)
+            .filter(search_document=query)
+            .annotate(search_rank=SearchRank(vector, query))
+        )
+
+    def snippets(self, ids, terms):
+        """Map each post id to a highlighted excerpt of its content"""
+        from django.contrib.postgres.search import SearchHeadline
+        from .models import BlogPost
+        headline = SearchHeadline(
+            'content', self.query(terms), config=SEARCH_CONFIG,
+            start_sel=MARK_START, stop_sel=MARK_END, max_words=SNIPPET_WORDS,
+        )
+        posts = BlogPost.objects.using(self.connection.alias).filter(id__in=ids)
+        return {
+            pk: highlight(snippet)
+            for pk, snippet in posts.annotate(snippet=headline).values_list('id', 'snippet')
+        }
+
+
+BACKENDS = {
+    'sqlite': SQLiteSearchBackend,
+    'postgresql': PostgresSearchBackend,
+}
@@ -2,18 +2,110 @@
 Blog app serializers
 """
 from rest_framework import serializers
+from .cache import invalidate, post_scopes
 from .models import BlogPost
 
+# Rows per INSERT / UPDATE statement of the bulk endpoints, and the most
+# posts one request may carry
+BULK_BATCH_SIZE = 500
+BULK_MAX_ITEMS = 10_000
+
+
+class BlogPostListSerializer(serializers.ListSerializer):
+    """
+    Create or update many posts with bulk_create / bulk_update, in batches
+    of BULK_BATCH_SIZE rows per statement
+
+    The bulk queries skip BlogPost.save() and its signals, so the word count
+    is set and the response cache invalidated here.
+    """
+    
+    def create(self, validated_data):
+        posts = [BlogPost(**attrs) for attrs in validated_data]
+        for post in posts:
+            post.cached_word_count = post.word_count()
+        posts = BlogPost.objects.bulk_create(posts, batch_size=BULK_BATCH_SIZE)
+        invalidate(scope for post in posts for scope in post_scopes(post.category, post.author, post.pk))
+        return posts
+    
+    def validate(self, attrs):
+        if self.instance is not None:
+            ids = [item.get('id') for item in attrs]
+            if None in ids:
+                raise serializers.ValidationError('Each post needs its id')
+            if len(set(ids)) != len(ids):
+                raise serializers.ValidationError('Each post can only be updated once')
+            missing = set(ids) - {post.pk for post in self.instance}
+            if missing:
+                raise serializers.ValidationError(f"Unknown ids: {sorted(missing)}")
+        return attrs
+    
+    def update(self, instance, validated_data):
+        posts = {post.pk: post for post in instance}
+        scopes, fields, updated = [], set(), []
+        for attrs in validated_data:
+            post = posts[attrs.pop('id')]
+            scopes += post_scopes(post.category, post.author, post.pk)
+            for name, value in attrs.items():
+                setattr(post, name, value)
+            if 'content' in attrs:
+                post.cached_word_count = post.word_count()
+                fields.add('cached_word_count')
+            scopes += post_scopes(post.category, post.author)
+            fields.update(attrs)
+            updated.append(post)
+        if fields:
+            BlogPost.objects.bulk_update(updated, fields, batch_size=BULK_BATCH_SIZE)
+            invalidate(scopes)
+        return updated
+
 
 class BlogPostSerializer(serializers.ModelSerializer):
-    """Serializer for the BlogPost model"""
-    word_count = serializers.SerializerMethodField()
+    """
+    Serializer for the BlogPost model
+
+    Takes an optional `fields` argument with the subset of fields to
+    serialize (sparse fieldsets, e.g. ?fields=id,title).
+    """
+    word_count = serializers.IntegerField(source='cached_word_count', read_only=True)
     
     class Meta:
         model = BlogPost
         fields = ['id', 'title', 'content', 'published_date', 
                   'is_published', 'author', 'category', 'word_count']
+        list_serializer_class = BlogPostListSerializer
+    
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class BlogPostBulkUpdateSerializer(BlogPostSerializer):
+    """Bulk PATCH item: the post's id plus the fields to change"""
+    id = serializers.IntegerField()
+
+
+class BlogPostPublishManySerializer(serializers.Serializer):
+    """Ids of the posts to publish"""
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=BULK_MAX_ITEMS
+    )
+
+
+class BlogPostSearchSerializer(BlogPostSerializer):
+    """
+    Search result: a post without its content, with the match rank and a
+    highlighted snippet (looked up in the `snippets` context by post id)
+    """
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+    snippet = serializers.SerializerMethodField()
+    
+    class Meta(BlogPostSerializer.Meta):
+        fields = ['id', 'title', 'published_date', 'is_published', 
+                  'author', 'category', 'word_count', 'rank', 'snippet']
     
-    def get_word_count(self, obj):
-        """Get the word count from the BlogPost instance"""
-        return obj.word_count()
+    def get_snippet(self, post):
+        return self.context.get('snippets', {}).get(post.pk)
@@ -0,0 +1,39 @@
+"""
+Blog app signal handlers
+
+Keep the response cache consistent with BlogPost writes. Saves (including
+the publish action) and deletes bump the versions of the post, its category
+and author, and the old category and author when they changed.
+
+bulk_create, bulk_update and QuerySet.update send no signals; callers
+invalidate the affected scopes themselves with cache.invalidate().
+"""
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .cache import invalidate, post_scopes
+from .models import BlogPost
+
+
+@receiver(pre_save, sender=BlogPost)
+def remember_scopes(sender, instance, update_fields=None, **kwargs):
+    """Note the category and author a post had before this save"""
+    instance._previous_scopes = []
+    if instance.pk is None:
+        return
+    if update_fields is not None and not {'category', 'author'} & set(update_fields):
+        return
+    previous = sender.objects.filter(pk=instance.pk).values_list('category', 'author').first()
+    if previous is not None:
+        instance._previous_scopes = post_scopes(*previous)
+
+
+@receiver(post_save, sender=BlogPost)
+def invalidate_saved_post(sender, instance, **kwargs):
+    scopes = post_scopes(instance.category, instance.author, instance.pk)
+    invalidate(scopes + getattr(instance, '_previous_scopes', []))
+
+
+@receiver(post_delete, sender=BlogPost)
+def invalidate_deleted_post(sender, instance, **kwargs):
+    invalidate(post_scopes(instance.category, instance.author, instance.pk))
@@ -172,12 +172,63 @@ class TestBlogPostAPI:
         response = api_client.get(f"{url}?author=John Doe")
         
         assert response.status_code == status.HTTP_200_OK
-        assert len(response.data) == 2  
+        assert response.data['count'] == 2
         
-        for post in response.data:
+        for post in response.data['results']:
             assert post['author'] == 'John Doe'
         
         response = api_client.get(url)
         
         assert response.status_code == status.HTTP_400_BAD_REQUEST
         assert 'error' in response.data
+    
+    def test_min_words_filter_and_word_count_ordering(self, api_client, sample_posts):
+        """Test filtering and ordering by the stored word count"""
+        BlogPost.objects.create(title="Long", content="word " * 50, author="Long Writer")
+        url = reverse('blogpost-list')
+        
+        response = api_client.get(f"{url}?min_words=7")
+        assert response.status_code == status.HTTP_200_OK
+        assert [post['title'] for post in response.data['results']] == ["Long"]
+        assert response.data['results'][0]['word_count'] == 50
+        
+        response = api_client.get(f"{url}?ordering=-word_count")
+        counts = [post['word_count'] for post in response.data['results']]
+        assert counts == sorted(counts, reverse=True)
+        
+        assert api_client.get(f"{url}?min_words=many").status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(f"{url}?min_words=%C2%B2").status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(f"{url}?ordering=content").status_code == status.HTTP_400_BAD_REQUEST
+    
+    def test_by_author_is_paginated(self, api_client):
+        """Test that by_author returns pages instead of every post"""
+        BlogPost.objects.bulk_create(
+            BlogPost(title=f"Post {i}", content="text", author="Prolific") for i in range(25)
+        )
+        url = reverse('blogpost-by-author')
+        
+        response = api_client.get(f"{url}?author=Prolific")
+        assert response.data['count'] == 25
+        assert len(response.data['results']) == 10
+        
+        response = api_client.get(response.data['next'])
+        assert len(response.data['results']) == 10
+    
+    def test_sparse_fieldsets(self, api_client, sample_posts, django_assert_num_queries):
+        """Test that ?fields= trims the payload and skips the content column"""
+        url = reverse('blogpost-by-author')
+        
+        with django_assert_num_queries(2) as context:
+            response = api_client.get(f"{url}?author=John Doe&fields=id,title,published_date")
+        
+        assert response.status_code == status.HTTP_200_OK
+        for post in response.data['results']:
+            assert set(post) == {'id', 'title', 'published_date'}
+        select = context.captured_queries[-1]['sql']
+        assert '"content"' not in select
+        
+        response = api_client.get(f"{reverse('blogpost-list')}?fields=title,word_count")
+        assert set(response.data['results'][0]) == {'title', 'word_count'}
+        
+        response = api_client.get(f"{url}?author=John Doe&fields=title,secret")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
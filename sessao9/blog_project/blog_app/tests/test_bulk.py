@@ -0,0 +1,152 @@
+"""
+Tests for the bulk create/update/publish endpoints
+"""
+import math
+
+import pytest
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog_app.models import BlogPost
+from blog_app.serializers import BULK_BATCH_SIZE
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client"""
+    return APIClient()
+
+
+@pytest.fixture
+def posts():
+    """Create three unpublished posts"""
+    return [
+        BlogPost.objects.create(title=f"Post {i}", content="one two", category="Tech")
+        for i in range(3)
+    ]
+
+
+def statements(context, verb):
+    return [q['sql'] for q in context.captured_queries if q['sql'].startswith(verb)]
+
+
+@pytest.mark.django_db
+class TestBulkCreate:
+    """Test suite for POST /posts/bulk/"""
+
+    def test_creates_in_batches(self, api_client):
+        """Test that posts are inserted up to BULK_BATCH_SIZE rows per INSERT"""
+        payload = [
+            {"title": f"Imported {i}", "content": "end " + "word " * (i % 7), "author": "Importer"}
+            for i in range(BULK_BATCH_SIZE + 1)
+        ]
+        # The backend may cap rows per statement below BULK_BATCH_SIZE (SQLite
+        # allows 999 parameters)
+        fields = [f for f in BlogPost._meta.concrete_fields if not f.primary_key]
+        batch_size = min(BULK_BATCH_SIZE, connection.ops.bulk_batch_size(fields, payload))
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(reverse('blogpost-bulk'), payload, format='json')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.data) == BULK_BATCH_SIZE + 1
+        assert all(post['id'] for post in response.data)
+        assert len(statements(context, 'INSERT')) == math.ceil(len(payload) / batch_size)
+        assert [post['word_count'] for post in response.data[:8]] == [1, 2, 3, 4, 5, 6, 7, 1]
+        assert BlogPost.objects.filter(author="Importer").count() == BULK_BATCH_SIZE + 1
+
+    def test_invalid_item_creates_nothing(self, api_client):
+        """Test that one invalid post rejects the whole request"""
+        payload = [{"title": "Fine", "content": "ok"}, {"content": "no title"}]
+        response = api_client.post(reverse('blogpost-bulk'), payload, format='json')
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[1]['title']
+        assert not BlogPost.objects.exists()
+
+    def test_requires_a_list(self, api_client):
+        """Test that a single object and an empty list are rejected"""
+        url = reverse('blogpost-bulk')
+        assert api_client.post(url, {"title": "x"}, format='json').status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.post(url, [], format='json').status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestBulkUpdate:
+    """Test suite for PATCH /posts/bulk/"""
+
+    def test_updates_only_given_fields(self, api_client, posts):
+        """Test a partial bulk update, including the stored word count"""
+        payload = [
+            {"id": posts[0].pk, "title": "Renamed"},
+            {"id": posts[1].pk, "content": "now four words here"},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.patch(reverse('blogpost-bulk'), payload, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [post['id'] for post in response.data] == [posts[0].pk, posts[1].pk]
+        assert len(statements(context, 'UPDATE')) == 1
+        first, second, third = (BlogPost.objects.get(pk=post.pk) for post in posts)
+        assert (first.title, first.content) == ("Renamed", "one two")
+        assert (second.title, second.cached_word_count) == ("Post 1", 4)
+        assert third.title == "Post 2"
+
+    def test_unknown_or_missing_ids(self, api_client, posts):
+        """Test that bad ids reject the whole request"""
+        url = reverse('blogpost-bulk')
+        for payload in (
+            [{"id": posts[0].pk, "title": "Renamed"}, {"id": 999, "title": "Ghost"}],
+            [{"id": posts[0].pk, "title": "Renamed"}, {"title": "No id"}],
+            [{"id": posts[0].pk, "title": "A"}, {"id": posts[0].pk, "title": "B"}],
+        ):
+            response = api_client.patch(url, payload, format='json')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert BlogPost.objects.get(pk=posts[0].pk).title == "Post 0"
+
+    def test_ids_are_parsed_like_the_serializer(self, api_client, posts):
+        """Test that numeric string ids are found and malformed ones rejected"""
+        url = reverse('blogpost-bulk')
+        response = api_client.patch(url, [{"id": str(posts[0].pk), "title": "Renamed"}], format='json')
+        assert response.status_code == status.HTTP_200_OK
+        assert BlogPost.objects.get(pk=posts[0].pk).title == "Renamed"
+
+        payload = [{"id": posts[1].pk, "title": "A"}, {"id": "five", "title": "B"}]
+        response = api_client.patch(url, payload, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data[0] == {} and 'id' in response.data[1]
+        assert BlogPost.objects.get(pk=posts[1].pk).title == "Post 1"
+
+    def test_invalidates_cached_lists(self, api_client, posts):
+        """Test that bulk writes are visible through the response cache"""
+        url = f"{reverse('blogpost-list')}?category=Tech"
+        api_client.get(url)
+        api_client.patch(reverse('blogpost-bulk'), [{"id": posts[0].pk, "category": "Food"}], format='json')
+        assert len(api_client.get(url).data['results']) == 2
+
+
+@pytest.mark.django_db
+class TestPublishMany:
+    """Test suite for POST /posts/publish_many/"""
+
+    def test_single_update(self, api_client, posts):
+        """Test that the listed posts are published with one UPDATE"""
+        ids = [posts[0].pk, posts[2].pk]
+        with CaptureQueriesContext(connection) as context:
+            response = api_client.post(reverse('blogpost-publish-many'), {"ids": ids}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data == {'published': 2}
+        updates = statements(context, 'UPDATE')
+        assert len(updates) == 1 and ' IN (' in updates[0]
+        assert set(BlogPost.objects.filter(is_published=True).values_list('id', flat=True)) == set(ids)
+
+    def test_rejects_unknown_ids(self, api_client, posts):
+        """Test that nothing is published when an id does not exist"""
+        url = reverse('blogpost-publish-many')
+        response = api_client.post(url, {"ids": [posts[0].pk, 999]}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.post(url, {"ids": []}, format='json').status_code == status.HTTP_400_BAD_REQUEST
+        assert not BlogPost.objects.filter(is_published=True).exists()
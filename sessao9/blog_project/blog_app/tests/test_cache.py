@@ -0,0 +1,147 @@
+"""
+Tests for the blog API response cache
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog_app.models import BlogPost
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client"""
+    return APIClient()
+
+
+@pytest.fixture
+def posts():
+    """Create posts in two categories and by two authors"""
+    return [
+        BlogPost.objects.create(title="Tech 1", content="a b c", category="Tech", author="Ann"),
+        BlogPost.objects.create(title="Tech 2", content="a b", category="Tech", author="Bob"),
+        BlogPost.objects.create(title="Food 1", content="a", category="Food", author="Bob"),
+    ]
+
+
+def titles(response):
+    return sorted(post['title'] for post in response.data['results'])
+
+
+@pytest.mark.django_db
+class TestResponseCache:
+    """Test suite for cached reads and their invalidation"""
+
+    def test_repeated_reads_skip_the_database(self, api_client, posts, django_assert_num_queries):
+        """Test that list, detail and by_author are served from the cache"""
+        urls = [
+            reverse('blogpost-list'),
+            reverse('blogpost-detail', args=[posts[0].pk]),
+            f"{reverse('blogpost-by-author')}?author=Bob",
+        ]
+        first = [api_client.get(url).data for url in urls]
+        with django_assert_num_queries(0):
+            assert [api_client.get(url).data for url in urls] == first
+
+    def test_params_are_normalised(self, api_client, posts, django_assert_num_queries):
+        """Test that equivalent query strings share one entry"""
+        url = reverse('blogpost-list')
+        api_client.get(f"{url}?published=false&category=Tech")
+        with django_assert_num_queries(0):
+            api_client.get(f"{url}?category=Tech&published=FALSE&page=1&utm_source=mail")
+
+    def test_writes_invalidate_detail_and_lists(self, api_client, posts):
+        """Test that update, publish and delete are visible on the next read"""
+        detail = reverse('blogpost-detail', args=[posts[0].pk])
+        url = reverse('blogpost-list')
+        api_client.get(detail)
+        api_client.get(url)
+
+        api_client.patch(detail, {'title': "Tech 1 edited"}, format='json')
+        assert api_client.get(detail).data['title'] == "Tech 1 edited"
+        assert "Tech 1 edited" in titles(api_client.get(url))
+
+        api_client.post(reverse('blogpost-publish', args=[posts[0].pk]))
+        assert api_client.get(detail).data['is_published'] is True
+
+        api_client.delete(detail)
+        assert api_client.get(detail).status_code == status.HTTP_404_NOT_FOUND
+        assert "Tech 1 edited" not in titles(api_client.get(url))
+
+    def test_invalidation_is_scoped(self, api_client, posts, django_assert_num_queries):
+        """Test that a change only drops the entries that could contain it"""
+        url = reverse('blogpost-list')
+        tech = f"{url}?category=Tech"
+        ann = f"{reverse('blogpost-by-author')}?author=Ann"
+        for cached in (tech, ann, url):
+            api_client.get(cached)
+
+        posts[2].title = "Food 1 edited"
+        posts[2].save()
+        with django_assert_num_queries(0):
+            api_client.get(tech)
+            api_client.get(ann)
+        assert "Food 1 edited" in titles(api_client.get(url))
+
+        # Moving a post out of a category or away from an author updates
+        # the lists it left as well as those it joined
+        posts[0].category, posts[0].author = "Food", "Bob"
+        posts[0].save()
+        assert titles(api_client.get(tech)) == ["Tech 2"]
+        assert titles(api_client.get(ann)) == []
+
+
+@pytest.mark.django_db
+class TestConditionalRequests:
+    """Test suite for ETag and Last-Modified"""
+
+    def test_etag_answers_304_without_queries(self, api_client, posts, django_assert_num_queries):
+        """Test If-None-Match with the current and a stale ETag"""
+        url = reverse('blogpost-detail', args=[posts[0].pk])
+        etag = api_client.get(url)['ETag']
+
+        with django_assert_num_queries(0):
+            response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+        posts[0].save()
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+
+    def test_last_modified(self, api_client, posts):
+        """Test If-Modified-Since against Last-Modified"""
+        url = reverse('blogpost-list')
+        with freeze_time(timezone.now() + timedelta(seconds=1)):
+            last_modified = api_client.get(url)['Last-Modified']
+
+            response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+            response = api_client.get(url, HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2001 00:00:00 GMT")
+            assert response.status_code == status.HTTP_200_OK
+
+    def test_change_within_the_same_second(self, api_client, posts):
+        """Test that a write in the second of a cached read is not hidden by a 304"""
+        url = reverse('blogpost-list')
+        second = datetime(2030, 1, 1, 12, 0, tzinfo=dt_timezone.utc)
+        with freeze_time(second + timedelta(milliseconds=100)) as frozen:
+            api_client.get(url)
+            posts[0].save()
+            frozen.tick(0.5)
+            response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=http_date(second.timestamp()))
+            assert response.status_code == status.HTTP_200_OK
+            assert 'Last-Modified' not in response
+
+            frozen.tick(1)
+            last_modified = api_client.get(url)['Last-Modified']
+            assert last_modified == http_date(second.timestamp())
+            response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified)
+            assert response.status_code == status.HTTP_304_NOT_MODIFIED
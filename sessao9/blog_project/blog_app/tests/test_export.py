@@ -0,0 +1,111 @@
+"""
+Tests for the streaming export endpoint and command
+"""
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog_app.models import BlogPost
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client"""
+    return APIClient()
+
+
+@pytest.fixture
+def posts():
+    """Create 25 posts, more than two pages of the list endpoint"""
+    BlogPost.objects.bulk_create(
+        BlogPost(
+            title=f"Post {i}", content="word " * (i + 1), category="Tech" if i % 2 else "Food",
+            author="Ann" if i % 5 == 0 else "Bob", is_published=i % 3 == 0,
+            cached_word_count=i + 1,
+        )
+        for i in range(25)
+    )
+    return list(BlogPost.objects.all())
+
+
+def export(client, query=""):
+    response = client.get(f"{reverse('blogpost-export')}{query}")
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return response, b"".join(response.streaming_content).decode()
+
+
+@pytest.mark.django_db
+class TestExportEndpoint:
+    """Test suite for GET /posts/export/"""
+
+    def test_ndjson_exports_every_post(self, api_client, posts):
+        """Test that NDJSON holds one serialized post per line, unpaginated"""
+        response, body = export(api_client)
+        assert response['Content-Type'] == 'application/x-ndjson'
+        assert response['Content-Disposition'] == 'attachment; filename="posts.ndjson"'
+
+        rows = [json.loads(line) for line in body.splitlines()]
+        assert [row['id'] for row in rows] == [post.id for post in posts]
+        detail = api_client.get(reverse('blogpost-detail', args=[posts[0].pk])).data
+        assert rows[0] == dict(detail)
+
+    def test_csv_with_filters_and_fields(self, api_client, posts):
+        """Test CSV output with the list filters and a sparse fieldset"""
+        response, body = export(api_client, "?format=csv&category=Tech&min_words=10&fields=id,title,word_count")
+        assert response['Content-Type'] == 'text/csv; charset=utf-8'
+
+        rows = list(csv.DictReader(io.StringIO(body)))
+        expected = [p for p in posts if p.category == "Tech" and p.cached_word_count >= 10]
+        assert list(rows[0]) == ['id', 'title', 'word_count']
+        assert [row['title'] for row in rows] == [p.title for p in expected]
+
+    def test_accept_header_and_author(self, api_client, posts):
+        """Test choosing CSV through Accept and filtering by author"""
+        response = api_client.get(f"{reverse('blogpost-export')}?author=Ann", HTTP_ACCEPT='text/csv')
+        rows = list(csv.DictReader(io.StringIO(b"".join(response.streaming_content).decode())))
+        assert {row['author'] for row in rows} == {"Ann"}
+        assert len(rows) == 5
+
+    def test_invalid_filter(self, api_client, posts):
+        """Test that filter errors are reported before streaming starts"""
+        response = api_client.get(f"{reverse('blogpost-export')}?min_words=lots")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not response.streaming
+
+    def test_reads_in_chunks(self, api_client, posts, django_assert_num_queries, monkeypatch):
+        """Test that a small chunk size still exports every row in one query"""
+        monkeypatch.setattr("blog_app.export.EXPORT_CHUNK_SIZE", 4)
+        with django_assert_num_queries(1):
+            _, body = export(api_client, "?fields=id")
+        assert len(body.splitlines()) == 25
+
+
+@pytest.mark.django_db
+class TestExportCommand:
+    """Test suite for manage.py export_posts"""
+
+    def test_matches_the_endpoint(self, api_client, posts, tmp_path):
+        """Test that the command writes what the endpoint streams"""
+        output = tmp_path / "posts.csv"
+        call_command('export_posts', format='csv', published='true', chunk_size=3,
+                     output=str(output), stderr=io.StringIO())
+        _, body = export(api_client, "?format=csv&published=true")
+        assert output.read_bytes().decode() == body
+
+    def test_stdout_and_errors(self, posts):
+        """Test writing NDJSON to stdout and rejecting bad filters"""
+        stdout = io.StringIO()
+        call_command('export_posts', author='Ann', fields='title', stdout=stdout)
+        assert [json.loads(line) for line in stdout.getvalue().splitlines()] == [
+            {'title': post.title} for post in posts if post.author == "Ann"
+        ]
+        with pytest.raises(CommandError):
+            call_command('export_posts', ordering='content')
@@ -0,0 +1,94 @@
+"""
+Tests for the read-only fast serialization path and the orjson renderer
+"""
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+
+from blog_app.fast_serializers import get_field_plan
+from blog_app.models import BlogPost
+from blog_app.renderers import ORJSONRenderer
+from blog_app.serializers import BlogPostSearchSerializer, BlogPostSerializer
+
+
+@pytest.fixture
+def posts():
+    """Create posts with microseconds, unicode and line separators"""
+    return [
+        BlogPost.objects.create(
+            title="Olá, mundo", content="Conteúdo\u2028com separador",
+            published_date=datetime(2024, 3, 1, 12, 30, 15, 123456, tzinfo=dt_timezone.utc),
+            is_published=True, author="Zé", category="Notícias",
+        ),
+        BlogPost.objects.create(
+            title="Plain", content="one two three",
+            published_date=datetime(2024, 3, 2, tzinfo=dt_timezone.utc),
+        ),
+    ]
+
+
+def serializer_output(queryset, fields=None):
+    kwargs = {} if fields is None else {'fields': fields}
+    return [dict(item) for item in BlogPostSerializer(queryset, many=True, **kwargs).data]
+
+
+@pytest.mark.django_db
+class TestFieldPlan:
+    """Test suite for FieldPlan parity with BlogPostSerializer"""
+
+    @pytest.mark.parametrize("fields", [None, ['id', 'title', 'published_date'], ['word_count']])
+    def test_matches_model_serializer(self, posts, fields):
+        """Test that the plan renders exactly what the serializer does"""
+        queryset = BlogPost.objects.all()
+        plan = get_field_plan(BlogPostSerializer, fields)
+        assert plan.render(plan.values(queryset)) == serializer_output(queryset, fields)
+
+    def test_matches_in_another_timezone(self, posts):
+        """Test datetime output when the current timezone is not UTC"""
+        queryset = BlogPost.objects.all()
+        plan = get_field_plan(BlogPostSerializer)
+        with timezone.override("America/Sao_Paulo"):
+            rendered = plan.render(plan.values(queryset))
+            assert rendered == serializer_output(queryset)
+        assert rendered[1]['published_date'] == "2024-03-01T09:30:15.123456-03:00"
+
+    def test_fetches_only_plan_columns(self, posts, django_assert_num_queries):
+        """Test that a sparse plan does not read the content column"""
+        plan = get_field_plan(BlogPostSerializer, ['id', 'title'])
+        with django_assert_num_queries(1) as context:
+            plan.render(plan.values(BlogPost.objects.all()))
+        assert '"content"' not in context.captured_queries[0]['sql']
+
+    def test_plan_is_compiled_once(self):
+        """Test that plans are cached per serializer and fieldset"""
+        assert get_field_plan(BlogPostSerializer, ['id']) is get_field_plan(BlogPostSerializer, ['id'])
+        assert get_field_plan(BlogPostSerializer) is not get_field_plan(BlogPostSerializer, ['id'])
+
+    def test_rejects_computed_fields(self):
+        """Test that fields not backed by a column cannot be planned"""
+        with pytest.raises(ValueError):
+            get_field_plan(BlogPostSearchSerializer)
+
+
+class TestORJSONRenderer:
+    """Test suite for byte-for-byte parity with JSONRenderer"""
+
+    def test_same_bytes_as_json_renderer(self):
+        """Test unicode, separators, datetimes, decimals and lazy strings"""
+        data = {
+            'results': [{'title': "Olá\u2028mundo\u2029", 'rank': 1.5, 'ok': True, 'none': None}],
+            'when': datetime(2024, 3, 1, 12, 0, tzinfo=dt_timezone.utc),
+            'price': Decimal("1.10"),
+            'label': gettext_lazy("Published"),
+        }
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_falls_back_to_json_renderer(self):
+        """Test that an indent requested in the media type is honoured"""
+        data = {'a': [1, 2]}
+        media_type = 'application/json; indent=2'
+        assert ORJSONRenderer().render(data, media_type) == JSONRenderer().render(data, media_type)
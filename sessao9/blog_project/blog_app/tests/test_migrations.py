@@ -0,0 +1,37 @@
+"""
+Tests for the blog_app data migrations
+"""
+import importlib
+
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+
+BEFORE_BACKFILL = [('blog_app', '0002_blogpost_word_count')]
+
+
+def migrate(targets):
+    """Migrate to `targets` and return the app registry at that state"""
+    executor = MigrationExecutor(connection)
+    executor.migrate(targets)
+    executor.loader.build_graph()
+    return executor.loader.project_state(targets).apps
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backfill_word_count(monkeypatch):
+    """Test that 0003 fills the stored word count of existing rows in batches"""
+    backfill = importlib.import_module('blog_app.migrations.0003_backfill_word_count')
+    monkeypatch.setattr(backfill, 'BATCH_SIZE', 2)
+    latest = MigrationExecutor(connection).loader.graph.leaf_nodes('blog_app')
+
+    BlogPost = migrate(BEFORE_BACKFILL).get_model('blog_app', 'BlogPost')
+    contents = ["", "one", "one two", "one  two\nthree", "a b c d e"]
+    BlogPost.objects.bulk_create(
+        BlogPost(title=f"Post {i}", content=content) for i, content in enumerate(contents)
+    )
+    assert set(BlogPost.objects.values_list('cached_word_count', flat=True)) == {0}
+
+    BlogPost = migrate(latest).get_model('blog_app', 'BlogPost')
+    counts = BlogPost.objects.order_by('pk').values_list('cached_word_count', flat=True)
+    assert list(counts) == [0, 1, 2, 3, 5]
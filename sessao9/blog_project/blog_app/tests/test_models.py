@@ -1,6 +1,8 @@
 """
 Tests for the BlogPost model
 """
+import importlib
+
 import pytest
 from django.utils import timezone
 from datetime import timedelta
@@ -80,3 +82,29 @@ class TestBlogPostModel:
         """Parametrized test for word_count with various inputs"""
         post = BlogPost(title=title, content=content)
         assert post.word_count() == expected_count
+    
+    def test_word_count_is_persisted_on_save(self):
+        """Test that save() keeps the stored word count in sync with content"""
+        post = BlogPost.objects.create(title="Counted", content="one two three")
+        assert BlogPost.objects.get(id=post.id).cached_word_count == 3
+        
+        post.content = "one two three four five"
+        post.save(update_fields=["content"])
+        assert BlogPost.objects.get(id=post.id).cached_word_count == 5
+    
+    def test_backfill_migration_counts_existing_rows(self, monkeypatch):
+        """Test the batched data migration filling word_count for old rows"""
+        from types import SimpleNamespace
+        from django.apps import apps
+        from django.db import connection
+        backfill = importlib.import_module("blog_app.migrations.0003_backfill_word_count")
+        monkeypatch.setattr(backfill, "BATCH_SIZE", 2)
+        
+        for words in range(1, 6):
+            BlogPost.objects.create(title=f"Post {words}", content="word " * words)
+        BlogPost.objects.update(cached_word_count=0)
+        
+        backfill.backfill_word_count(apps, SimpleNamespace(connection=connection))
+        
+        counts = list(BlogPost.objects.order_by("id").values_list("cached_word_count", flat=True))
+        assert counts == [1, 2, 3, 4, 5]
@@ -0,0 +1,127 @@
+"""
+Tests for the blog API pagination
+"""
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog_app.models import BlogPost
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client"""
+    return APIClient()
+
+
+@pytest.fixture
+def many_posts():
+    """Create 35 posts, several sharing the same published_date"""
+    start = timezone.now()
+    posts = [
+        BlogPost(
+            title=f"Post {i}",
+            content="word " * i,
+            author="Prolific" if i % 2 else "Occasional",
+            published_date=start - timedelta(minutes=i // 3),
+        )
+        for i in range(35)
+    ]
+    BlogPost.objects.bulk_create(posts)
+    return list(BlogPost.objects.order_by('-published_date', '-id'))
+
+
+def follow(client, url, key='next'):
+    """Collect the titles of every page reachable through `key` links"""
+    titles = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        titles.extend(post['title'] for post in response.data['results'])
+        url = response.data[key]
+    return titles, response
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Test suite for the opt-in cursor pagination"""
+
+    def test_cursor_walks_every_post_once_in_order(self, api_client, many_posts):
+        """Test following next cursors across ties in published_date"""
+        titles, _ = follow(api_client, f"{reverse('blogpost-list')}?pagination=cursor")
+        assert titles == [post.title for post in many_posts]
+
+    def test_previous_cursor_walks_back(self, api_client, many_posts):
+        """Test that previous cursors return the same pages backwards"""
+        url = f"{reverse('blogpost-list')}?pagination=cursor"
+        pages = []
+        while url:
+            response = api_client.get(url)
+            pages.append([post['title'] for post in response.data['results']])
+            url = response.data['next']
+
+        url = response.data['previous']
+        for expected in reversed(pages[:-1]):
+            response = api_client.get(url)
+            assert [post['title'] for post in response.data['results']] == expected
+            url = response.data['previous']
+        assert url is None
+
+    def test_count_is_opt_in(self, api_client, many_posts, django_assert_num_queries):
+        """Test that a cursor page is a single query unless a count is asked for"""
+        url = reverse('blogpost-list')
+        with django_assert_num_queries(1):
+            response = api_client.get(f"{url}?pagination=cursor")
+        assert 'count' not in response.data
+
+        response = api_client.get(f"{url}?pagination=cursor&count=true")
+        assert response.data['count'] == 35
+
+    def test_cursor_with_filters_and_by_author(self, api_client, many_posts):
+        """Test cursor pagination combined with by_author"""
+        url = f"{reverse('blogpost-by-author')}?author=Prolific&pagination=cursor"
+        titles, _ = follow(api_client, url)
+        assert titles == [post.title for post in many_posts if post.author == "Prolific"]
+
+    def test_cursor_with_sparse_fields(self, api_client, many_posts, django_assert_num_queries):
+        """Test that cursors still work when published_date is not requested"""
+        url = f"{reverse('blogpost-by-author')}?author=Prolific&pagination=cursor&fields=title"
+        with django_assert_num_queries(1):
+            response = api_client.get(url)
+        assert set(response.data['results'][0]) == {'title'}
+
+        titles, _ = follow(api_client, url)
+        assert titles == [post.title for post in many_posts if post.author == "Prolific"]
+
+    def test_invalid_cursor_and_ordering(self, api_client, many_posts):
+        """Test that bad cursors are rejected and ordering cannot be combined"""
+        url = reverse('blogpost-list')
+        assert api_client.get(f"{url}?cursor=not-a-cursor").status_code == status.HTTP_404_NOT_FOUND
+        response = api_client.get(f"{url}?pagination=cursor&ordering=title")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+class TestPageNumberPagination:
+    """Test suite for page numbers without COUNT(*)"""
+
+    def test_count_can_be_skipped(self, api_client, many_posts, django_assert_num_queries):
+        """Test ?count=false pages: no count query, next/previous still work"""
+        url = f"{reverse('blogpost-list')}?count=false"
+        with django_assert_num_queries(1):
+            response = api_client.get(url)
+        assert 'count' not in response.data
+
+        titles, last = follow(api_client, url)
+        assert titles == [post.title for post in many_posts]
+        assert last.data['previous'].endswith('page=3')
+
+    def test_count_is_kept_by_default(self, api_client, many_posts):
+        """Test that the default page number response is unchanged"""
+        response = api_client.get(reverse('blogpost-list'))
+        assert response.data['count'] == 35
+        assert len(response.data['results']) == 10
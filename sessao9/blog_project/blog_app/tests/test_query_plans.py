@@ -0,0 +1,88 @@
+"""
+Query plan tests for the BlogPost API filters
+
+Every filter path of BlogPostViewSet must be served by an index: the
+SQLite plan may search or walk an index, but never scan the whole table.
+"""
+import pytest
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from blog_app.models import BlogPost
+from blog_app.views import BlogPostViewSet
+
+TABLE = BlogPost._meta.db_table
+
+FILTER_PATHS = [
+    "",
+    "?published=true",
+    "?published=false&category=Tech",
+    "?category=Tech",
+    "?min_words=100",
+    "?ordering=-word_count",
+    "?published=true&ordering=-published_date",
+]
+
+
+def query_plan(queryset):
+    """Return the EXPLAIN QUERY PLAN detail lines for a queryset"""
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def list_queryset(query_string):
+    view = BlogPostViewSet()
+    view.request = Request(APIRequestFactory().get(f"/api/posts/{query_string}"))
+    view.format_kwarg = None
+    return view.get_queryset()
+
+
+def assert_no_table_scan(plan):
+    for line in plan:
+        scans_table = line.startswith(f"SCAN {TABLE}") and "INDEX" not in line
+        assert not scans_table, f"full table scan: {plan}"
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="EXPLAIN QUERY PLAN is SQLite syntax")
+@pytest.mark.django_db
+class TestQueryPlans:
+    """Test suite asserting index usage of the API filters"""
+
+    @pytest.mark.parametrize("query_string", FILTER_PATHS)
+    def test_list_filters_use_an_index(self, query_string):
+        """Test that each list filter reads through an index"""
+        plan = query_plan(list_queryset(query_string)[:10])
+        assert_no_table_scan(plan)
+
+    def test_by_author_uses_author_index_in_order(self):
+        """Test that by_author searches its index and needs no sort"""
+        plan = query_plan(BlogPost.objects.filter(author="John Doe")[:10])
+        assert any("blogpost_author_date_idx" in line for line in plan), plan
+        assert not any("TEMP B-TREE" in line for line in plan), plan
+
+    @pytest.mark.parametrize("query_string", ["?published=true&category=Tech", "?category=Tech"])
+    def test_category_filters_search_an_index(self, query_string):
+        """Test that category filters look rows up instead of walking an index"""
+        plan = query_plan(list_queryset(query_string)[:10])
+        assert any(line.startswith(f"SEARCH {TABLE} USING INDEX") for line in plan), plan
+
+    @pytest.mark.parametrize("query_string", [
+        "", "?published=true&category=Tech", "?category=Tech",
+        "?ordering=-word_count", "?ordering=published_date",
+    ])
+    def test_ordering_needs_no_sort(self, query_string):
+        """Test that the default and requested orderings come straight from an index"""
+        plan = query_plan(list_queryset(query_string)[:10])
+        assert not any("TEMP B-TREE" in line for line in plan), plan
+
+    def test_default_ordering_is_stable(self):
+        """Test that posts sharing a published_date are ordered by id"""
+        posts = [BlogPost(title=f"Post {i}", content="text") for i in range(3)]
+        same_time = posts[0].published_date
+        for post in posts:
+            post.published_date = same_time
+            post.save()
+        assert [post.id for post in BlogPost.objects.all()] == sorted((p.id for p in posts), reverse=True)
@@ -0,0 +1,171 @@
+"""
+Tests for primary / replica routing and read-your-writes
+"""
+from datetime import timedelta
+
+import pytest
+from django.db import connections
+from django.urls import reverse
+from django.utils import timezone
+from freezegun import freeze_time
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog_app.models import BlogPost
+from blog_app.routers import PrimaryReplicaRouter, replica_reads
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=['default', 'replica'])
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client"""
+    return APIClient()
+
+
+@pytest.fixture
+def replica(settings):
+    """
+    Route reads to the 'replica' database and return a function copying the
+    primary into it, standing in for replication
+    """
+    settings.DATABASE_REPLICAS = ['replica']
+    settings.READ_YOUR_WRITES_SECONDS = 5
+
+    def sync():
+        primary, copy = connections['default'], connections['replica']
+        primary.ensure_connection()
+        copy.ensure_connection()
+        primary.connection.backup(copy.connection)
+
+    sync()
+    return sync
+
+
+@pytest.fixture
+def posts(replica):
+    """Create two posts on the primary and replicate them"""
+    posts = [
+        BlogPost.objects.create(title="Synced 1", content="a b", author="Ann"),
+        BlogPost.objects.create(title="Synced 2", content="a b c", author="Ann"),
+    ]
+    replica()
+    return posts
+
+
+def titles(response):
+    return sorted(post['title'] for post in response.data['results'])
+
+
+class TestRouter:
+    """Test suite for PrimaryReplicaRouter"""
+
+    def test_primary_without_replicas(self, settings):
+        """Test that reads stay on the primary when no replica is configured"""
+        settings.DATABASE_REPLICAS = []
+        router = PrimaryReplicaRouter()
+        with replica_reads():
+            assert router.db_for_read(BlogPost) == 'default'
+
+    def test_reads_and_writes(self, replica):
+        """Test that only enabled reads go to the replica"""
+        router = PrimaryReplicaRouter()
+        assert router.db_for_read(BlogPost) == 'default'
+        with replica_reads():
+            assert router.db_for_read(BlogPost) == 'replica'
+            assert router.db_for_write(BlogPost) == 'default'
+        assert router.allow_migrate('default', 'blog_app')
+        assert not router.allow_migrate('replica', 'blog_app')
+
+
+class TestReplicaReads:
+    """Test suite for which API actions read from the replica"""
+
+    def test_read_actions_use_the_replica(self, api_client, posts):
+        """Test that list, detail and by_author do not see unreplicated rows"""
+        post = BlogPost.objects.create(title="Unsynced", content="a", author="Ann")
+        assert titles(api_client.get(reverse('blogpost-list'))) == ["Synced 1", "Synced 2"]
+        response = api_client.get(f"{reverse('blogpost-by-author')}?author=Ann")
+        assert titles(response) == ["Synced 1", "Synced 2"]
+        response = api_client.get(reverse('blogpost-detail', args=[post.pk]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_writes_and_publish_use_the_primary(self, api_client, posts):
+        """Test that creating and publishing read and write the primary"""
+        response = api_client.post(reverse('blogpost-list'), {
+            'title': "New", 'content': "a b", 'author': "Bob", 'category': "Tech",
+        }, format='json')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert BlogPost.objects.using('default').filter(title="New").exists()
+        assert not BlogPost.objects.using('replica').filter(title="New").exists()
+
+        # The post only exists on the primary, so a replica lookup would 404
+        other_client = APIClient()
+        response = other_client.post(reverse('blogpost-publish', args=[response.data['id']]))
+        assert response.status_code == status.HTTP_200_OK
+        assert BlogPost.objects.using('default').get(title="New").is_published
+
+    def test_other_reads_use_the_primary(self, api_client, posts):
+        """Test that search and export are not routed to the replica"""
+        BlogPost.objects.create(title="Unsynced", content="a", author="Ann")
+        response = api_client.get(f"{reverse('blogpost-search')}?q=unsynced")
+        assert titles(response) == ["Unsynced"]
+        response = api_client.get(f"{reverse('blogpost-export')}?fields=title")
+        assert b"Unsynced" in b"".join(response.streaming_content)
+
+
+class TestReadYourWrites:
+    """Test suite for reading from the primary after a write"""
+
+    def test_writer_sees_its_write(self, api_client, posts):
+        """Test that the writer reads from the primary until the window ends"""
+        with freeze_time() as frozen:
+            response = api_client.post(reverse('blogpost-list'), {
+                'title': "Mine", 'content': "a b", 'author': "Ann", 'category': "Tech",
+            }, format='json')
+            detail = reverse('blogpost-detail', args=[response.data['id']])
+
+            assert APIClient().get(detail).status_code == status.HTTP_404_NOT_FOUND
+            assert api_client.get(detail).status_code == status.HTTP_200_OK
+            assert "Mine" in titles(api_client.get(reverse('blogpost-list')))
+
+            frozen.tick(timedelta(seconds=6))
+            response = api_client.get(f"{reverse('blogpost-list')}?category=Tech")
+            assert titles(response) == []
+
+    def test_failed_writes_do_not_pin(self, api_client, posts):
+        """Test that a rejected write leaves the client on the replica"""
+        response = api_client.post(reverse('blogpost-list'), {'title': ""}, format='json')
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert 'blog_read_primary' not in response.cookies
+
+    def test_forged_cookie_is_ignored(self, api_client, posts):
+        """Test that an unsigned cookie does not pin a client"""
+        post = BlogPost.objects.create(title="Unsynced", content="a", author="Ann")
+        api_client.cookies['blog_read_primary'] = '1'
+        response = api_client.get(reverse('blogpost-detail', args=[post.pk]))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class TestReplicaCaching:
+    """Test suite for the response cache with lagging replicas"""
+
+    def test_recent_replica_reads_are_not_cached(self, api_client, posts, replica):
+        """Test that a possibly stale replica read is neither cached nor validated"""
+        url = reverse('blogpost-list')
+        BlogPost.objects.create(title="Unsynced", content="a", author="Ann")
+        response = api_client.get(url)
+        assert "Unsynced" not in titles(response)
+        assert 'ETag' not in response
+
+        replica()
+        assert "Unsynced" in titles(api_client.get(url))
+
+    def test_settled_replica_reads_are_cached(self, api_client, posts, django_assert_num_queries):
+        """Test that replica reads are cached once the window has passed"""
+        url = reverse('blogpost-list')
+        with freeze_time(timezone.now() + timedelta(seconds=10)):
+            first = api_client.get(url)
+            assert 'ETag' in first
+            with django_assert_num_queries(0, connection=connections['replica']):
+                assert api_client.get(url).data == first.data
@@ -0,0 +1,173 @@
+"""
+Tests for the blog post full-text search
+"""
+import io
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from blog_app.models import BlogPost
+from blog_app.search import SQLiteSearchBackend, get_backend, parse_terms
+
+
+@pytest.fixture
+def api_client():
+    """Return an API client"""
+    return APIClient()
+
+
+@pytest.fixture
+def posts():
+    """Create posts with overlapping words in title and content"""
+    return {
+        post.title: post for post in (
+            BlogPost.objects.create(
+                title="Django performance",
+                content="Indexes make queries fast. Caching helps too.",
+                category="Tech", is_published=True,
+            ),
+            BlogPost.objects.create(
+                title="Cooking pasta",
+                content="Boil water, then think about Django while the pasta cooks.",
+                category="Food", is_published=True,
+            ),
+            BlogPost.objects.create(
+                title="Gardening",
+                content="Nothing about frameworks here. Tomatoes need sun.",
+                category="Home",
+            ),
+        )
+    }
+
+
+def search(client, query):
+    response = client.get(f"{reverse('blogpost-search')}?{query}")
+    assert response.status_code == status.HTTP_200_OK, response.data
+    return response.data['results']
+
+
+@pytest.mark.django_db
+class TestSearch:
+    """Test suite for the search action"""
+
+    def test_ranks_title_matches_first(self, api_client, posts):
+        """Test BM25 ranking with title matches weighted above content"""
+        results = search(api_client, "q=django")
+        assert [post['title'] for post in results] == ["Django performance", "Cooking pasta"]
+        assert results[0]['rank'] > results[1]['rank']
+        assert 'content' not in results[0]
+
+    def test_snippet_highlights_matches(self, api_client, posts):
+        """Test that snippets wrap the matched words in <mark>"""
+        results = search(api_client, "q=tomatoes")
+        assert "<mark>Tomatoes</mark>" in results[0]['snippet']
+
+    def test_snippet_escapes_stored_html(self, api_client, posts):
+        """Test that markup in the content is escaped and only <mark> is added"""
+        BlogPost.objects.create(
+            title="Evil", content='<script>alert("x")</script> tomatoes & <b>sun</b>',
+        )
+        results = search(api_client, "q=alert")
+        snippet = results[0]['snippet']
+        assert "<script>" not in snippet and "<b>" not in snippet
+        assert "&lt;script&gt;<mark>alert</mark>(&quot;x&quot;)&lt;/script&gt;" in snippet
+        assert "&amp; &lt;b&gt;sun&lt;/b&gt;" in snippet
+
+    def test_prefix_and_multiple_terms(self, api_client, posts):
+        """Test prefix terms and that every term must match"""
+        assert [p['title'] for p in search(api_client, "q=cach*")] == ["Django performance"]
+        assert search(api_client, "q=cach") == []
+        assert [p['title'] for p in search(api_client, "q=django pasta")] == ["Cooking pasta"]
+
+    def test_filters_and_pagination(self, api_client, posts):
+        """Test that the list filters apply to search results"""
+        results = search(api_client, "q=django&category=Food")
+        assert [post['title'] for post in results] == ["Cooking pasta"]
+        assert search(api_client, "q=tomatoes&published=true") == []
+
+    def test_query_syntax_is_not_interpreted(self, api_client, posts):
+        """Test that engine operators in q are treated as plain words"""
+        assert parse_terms('title:django OR "pasta" NEAR(x*)') == [
+            ("title", False), ("django", False), ("or", False),
+            ("pasta", False), ("near", False), ("x", True),
+        ]
+        assert len(search(api_client, "q=django%20-%22%28%5E")) == 2
+
+    def test_missing_query(self, api_client, posts):
+        """Test that an empty query is rejected"""
+        url = reverse('blogpost-search')
+        assert api_client.get(url).status_code == status.HTTP_400_BAD_REQUEST
+        assert api_client.get(f"{url}?q=%20*").status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_index_follows_writes(self, api_client, posts):
+        """Test that updates, bulk operations and deletes reach the index"""
+        post = posts["Gardening"]
+        post.content = "Django on the balcony"
+        post.save()
+        BlogPost.objects.bulk_create([BlogPost(title="Bulk Django", content="bulk")])
+        BlogPost.objects.filter(title="Cooking pasta").delete()
+        BlogPost.objects.filter(title="Django performance").update(title="Renamed")
+
+        titles = {p['title'] for p in search(api_client, "q=django")}
+        assert titles == {"Gardening", "Bulk Django"}
+
+
+@pytest.mark.skipif(connection.vendor != "sqlite", reason="FTS5 is SQLite specific")
+@pytest.mark.django_db
+class TestSearchIndex:
+    """Test suite for the FTS5 index maintenance"""
+
+    def test_rebuild_command_indexes_in_batches(self, posts, capsys):
+        """Test that the rebuild command restores a lost index"""
+        backend = get_backend()
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {backend.table} ({backend.table}) VALUES ('delete-all')")
+        assert not backend.search(BlogPost.objects.all(), [("django", False)]).exists()
+
+        call_command('rebuild_search_index', batch_size=2, verbosity=2)
+        output = capsys.readouterr().out
+        assert "2 posts indexed" in output and "Indexed 3 posts" in output
+
+        matches = backend.search(BlogPost.objects.all(), [("django", False)])
+        assert matches.count() == 2
+
+    def test_rebuild_command_creates_the_index_once(self, posts, monkeypatch):
+        """Test that rebuilding a missing index indexes every post once"""
+        backend = get_backend()
+        backend.uninstall()
+        rebuilds = []
+        rebuild = SQLiteSearchBackend.rebuild
+        monkeypatch.setattr(SQLiteSearchBackend, 'rebuild',
+                            lambda self, **kwargs: rebuilds.append(kwargs) or rebuild(self, **kwargs))
+        call_command('rebuild_search_index', batch_size=2, stdout=io.StringIO())
+        assert len(rebuilds) == 1
+        with connection.cursor() as cursor:
+            # Fails if the index holds entries the posts table does not
+            cursor.execute(f"INSERT INTO {backend.table} ({backend.table}) VALUES ('integrity-check')")
+            cursor.execute(f"SELECT rowid FROM {backend.table} WHERE {backend.table} MATCH 'django'")
+            assert len(cursor.fetchall()) == 2
+
+    def test_failed_rebuild_keeps_the_old_index(self, posts):
+        """Test that the rebuild is one transaction"""
+        backend = get_backend()
+
+        def interrupt(indexed):
+            raise RuntimeError("interrupted")
+
+        with pytest.raises(RuntimeError):
+            backend.rebuild(batch_size=1, progress=interrupt)
+        assert backend.search(BlogPost.objects.all(), [("django", False)]).count() == 2
+
+    def test_search_uses_the_fts_index(self, posts):
+        """Test that matching reads the FTS5 index instead of scanning posts"""
+        queryset = get_backend().search(BlogPost.objects.all(), [("django", False)])
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+            plan = [row[-1] for row in cursor.fetchall()]
+        assert any("VIRTUAL TABLE INDEX" in line for line in plan), plan
+        assert not any(line.startswith("SCAN blog_app_blogpost") and "INDEX" not in line for line in plan), plan
@@ -1,11 +1,26 @@
 """
 Blog app views
 """
+from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.utils import timezone
 from rest_framework import viewsets, status
+from rest_framework.exceptions import ValidationError
 from rest_framework.decorators import action
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
+from .cache import cache_response, invalidate, post_scopes
+from .export import export_posts
+from .fast_serializers import get_field_plan
 from .models import BlogPost
-from .serializers import BlogPostSerializer
+from .pagination import BlogPostPageNumberPagination, KeysetPagination
+from .renderers import CSVRenderer, NDJSONRenderer, ORJSONRenderer
+from .routers import reads_own_writes, replica_reads
+from .search import get_backend, parse_terms
+from .serializers import (
+    BULK_MAX_ITEMS, BlogPostBulkUpdateSerializer, BlogPostPublishManySerializer,
+    BlogPostSearchSerializer, BlogPostSerializer,
+)
 
 
 class BlogPostViewSet(viewsets.ModelViewSet):
@@ -14,10 +29,36 @@ class BlogPostViewSet(viewsets.ModelViewSet):
     """
     queryset = BlogPost.objects.all()
     serializer_class = BlogPostSerializer
+    pagination_class = BlogPostPageNumberPagination
+    renderer_classes = [ORJSONRenderer, BrowsableAPIRenderer]
+    
+    # Public ordering names mapped to model fields
+    orderable_fields = {
+        'id': 'id',
+        'title': 'title',
+        'published_date': 'published_date',
+        'word_count': 'cached_word_count',
+    }
+    
+    # Actions accepting sparse fieldsets (?fields=id,title,published_date);
+    # columns of fields left out are not fetched at all
+    sparse_actions = ('list', 'by_author', 'export')
+    
+    # Actions whose reads may be served by a replica (see routers.py); the
+    # rest, and every read from a client that has just written, use the
+    # primary
+    replica_actions = ('list', 'retrieve', 'by_author')
+    
+    def dispatch(self, request, *args, **kwargs):
+        action = self.action_map.get(request.method.lower())
+        use_replica = action in self.replica_actions and not reads_own_writes(request)
+        with replica_reads(use_replica):
+            return super().dispatch(request, *args, **kwargs)
     
     def get_queryset(self):
         """
-        Optionally filter by published status
+        Optionally filter by published status, category and minimum word
+        count, and order by ?ordering= (e.g. -word_count)
         """
         queryset = BlogPost.objects.all()
         is_published = self.request.query_params.get('published', None)
@@ -29,9 +70,133 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         category = self.request.query_params.get('category', None)
         if category is not None:
             queryset = queryset.filter(category=category)
+        
+        min_words = self.request.query_params.get('min_words', None)
+        if min_words is not None:
+            if not min_words.isdecimal():
+                raise ValidationError({'min_words': 'Must be a non-negative integer'})
+            queryset = queryset.filter(cached_word_count__gte=int(min_words))
+        
+        ordering = self.request.query_params.get('ordering', None)
+        if ordering is not None:
+            queryset = queryset.order_by(*self.get_ordering_fields(ordering))
+        
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            queryset = queryset.only(*self.get_model_fields(fields))
             
         return queryset
     
+    def get_cache_scopes(self):
+        """
+        Cache scopes a read depends on: the post for detail, otherwise the
+        narrowest of author and category filters, or every post
+        """
+        if self.action == 'retrieve':
+            return [f"post:{self.kwargs[self.lookup_url_kwarg or self.lookup_field]}"]
+        params = self.request.query_params
+        if self.action == 'by_author' and params.get('author'):
+            return [f"author:{params['author']}"]
+        if self.action != 'search' and params.get('category'):
+            return [f"category:{params['category']}"]
+        return ['posts']
+    
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        return self.fast_list(self.get_queryset())
+    
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+    
+    def fast_list(self, queryset):
+        """
+        Paginated read-only listing through a precompiled field plan: rows
+        are fetched with .values() and never become model instances or go
+        through the serializer fields (see fast_serializers)
+        """
+        plan = get_field_plan(self.get_serializer_class(), self.get_sparse_fields())
+        # Cursors are built from the key of the page edges
+        extra = ('published_date', 'id') if isinstance(self.paginator, KeysetPagination) else ()
+        page = self.paginate_queryset(plan.values(self.filter_queryset(queryset), *extra))
+        return self.get_paginated_response(plan.render(page))
+    
+    def get_serializer_class(self):
+        if self.action == 'search':
+            return BlogPostSearchSerializer
+        if self.action == 'bulk' and self.request.method == 'PATCH':
+            return BlogPostBulkUpdateSerializer
+        if self.action == 'publish_many':
+            return BlogPostPublishManySerializer
+        return super().get_serializer_class()
+    
+    def get_serializer(self, *args, **kwargs):
+        """
+        Restrict the serializer to the requested sparse fieldset
+        """
+        fields = self.get_sparse_fields()
+        if fields is not None:
+            kwargs.setdefault('fields', fields)
+        return super().get_serializer(*args, **kwargs)
+    
+    def get_sparse_fields(self):
+        """
+        Parse ?fields= into serializer field names, or None for all fields
+        """
+        value = self.request.query_params.get('fields', None)
+        if value is None or self.action not in self.sparse_actions:
+            return None
+        fields = [name.strip() for name in value.split(',') if name.strip()]
+        available = self.get_serializer_class().Meta.fields
+        unknown = [name for name in fields if name not in available]
+        if not fields or unknown:
+            raise ValidationError({'fields': f"Choose from {', '.join(available)}"})
+        return fields
+    
+    def get_model_fields(self, fields):
+        """
+        Model fields to load for a sparse fieldset
+        """
+        model_fields = {self.orderable_fields.get(name, name) for name in fields}
+        # Cursors are built from the published_date of the page edges
+        if isinstance(self.paginator, KeysetPagination):
+            model_fields.add('published_date')
+        return model_fields
+    
+    @property
+    def paginator(self):
+        """
+        Keyset pagination when asked for with ?pagination=cursor (or when
+        following a cursor), page numbers otherwise. Search results are
+        ordered by rank, so they always use page numbers.
+        """
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            wants_cursor = params.get('pagination') == 'cursor' or 'cursor' in params
+            if wants_cursor and self.action != 'search':
+                self._paginator = KeysetPagination()
+            else:
+                self._paginator = self.pagination_class()
+        return self._paginator
+    
+    def get_ordering_fields(self, ordering):
+        """
+        Translate a comma-separated ?ordering= value into model fields
+        """
+        fields = []
+        for term in ordering.split(','):
+            term = term.strip()
+            descending = term.startswith('-')
+            field = self.orderable_fields.get(term.lstrip('-'))
+            if field is None:
+                raise ValidationError({'ordering': f"Unknown ordering field '{term.lstrip('-')}'"})
+            fields.append(f"-{field}" if descending else field)
+        # Stable pages when the ordering key has duplicates; id follows the
+        # direction of the first key so a single index walk serves both
+        if 'id' not in {field.lstrip('-') for field in fields}:
+            fields.append('-id' if fields[0].startswith('-') else 'id')
+        return fields
+    
     @action(detail=True, methods=['post'])
     def publish(self, request, pk=None):
         """
@@ -42,10 +207,110 @@ class BlogPostViewSet(viewsets.ModelViewSet):
         serializer = self.get_serializer(post)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'])
+    def publish_many(self, request):
+        """
+        Publish the posts listed in {"ids": [...]} with a single UPDATE
+        """
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = set(serializer.validated_data['ids'])
+        
+        with transaction.atomic():
+            posts = BlogPost.objects.filter(id__in=ids)
+            found = list(posts.values_list('id', 'category', 'author'))
+            missing = ids - {pk for pk, _, _ in found}
+            if missing:
+                raise ValidationError({'ids': f"Unknown ids: {sorted(missing)}"})
+            posts.update(is_published=True, published_date=timezone.now())
+            invalidate(scope for pk, category, author in found
+                       for scope in post_scopes(category, author, pk))
+        return Response({'published': len(found)})
+    
+    @action(detail=False, methods=['post', 'patch'])
+    def bulk(self, request):
+        """
+        Create (POST) or partially update (PATCH, each item with its id) a
+        list of posts, in one transaction
+        """
+        if not isinstance(request.data, list):
+            return Response(
+                {"error": "Expected a list of posts"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        with transaction.atomic():
+            if request.method == 'POST':
+                serializer = self.get_serializer(
+                    data=request.data, many=True, allow_empty=False, max_length=BULK_MAX_ITEMS
+                )
+                serializer.is_valid(raise_exception=True)
+                serializer.save()
+                return Response(serializer.data, status=status.HTTP_201_CREATED)
+            
+            posts = BlogPost.objects.filter(id__in=self.get_bulk_ids(request.data))
+            serializer = self.get_serializer(
+                list(posts), data=request.data, many=True, partial=True,
+                allow_empty=False, max_length=BULK_MAX_ITEMS,
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+            return Response(serializer.data)
+    
+    def get_bulk_ids(self, items):
+        """
+        The ids of a bulk PATCH, parsed by the item serializer's id field so
+        "5" finds post 5; items without an id are left to the serializer
+        """
+        id_field = self.get_serializer_class()().fields['id']
+        ids, errors = [], []
+        for item in items:
+            error = {}
+            if isinstance(item, dict) and item.get('id') is not None:
+                try:
+                    ids.append(id_field.run_validation(item['id']))
+                except ValidationError as exc:
+                    error = {'id': exc.detail}
+            errors.append(error)
+        if any(errors):
+            raise ValidationError(errors)
+        return ids
+    
+    def get_export_queryset(self):
+        """
+        The list filters, plus ?author= as in by_author
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        author = self.request.query_params.get('author', None)
+        if author is not None:
+            queryset = queryset.filter(author=author)
+        return queryset
+    
+    @action(detail=False, methods=['get'], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Stream every post matching the list filters and ?author= as NDJSON
+        (default) or CSV (?format=csv or Accept: text/csv), unpaginated;
+        ?fields= selects the columns
+        """
+        queryset = self.get_export_queryset()
+        plan = get_field_plan(self.get_serializer_class(), self.get_sparse_fields())
+        renderer = request.accepted_renderer
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = StreamingHttpResponse(
+            export_posts(queryset, plan, renderer), content_type=content_type
+        )
+        response['Content-Disposition'] = f'attachment; filename="posts.{renderer.format}"'
+        return response
+    
     @action(detail=False, methods=['get'])
+    @cache_response
     def by_author(self, request):
         """
-        List posts by author
+        List posts by author, paginated like the list and accepting the
+        same filters and ?fields=
         """
         author = request.query_params.get('author', None)
         if author is None:
@@ -54,6 +319,30 @@ class BlogPostViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
             
-        posts = BlogPost.objects.filter(author=author)
-        serializer = self.get_serializer(posts, many=True)
-        return Response(serializer.data)
+        return self.fast_list(self.get_queryset().filter(author=author))
+    
+    @action(detail=False, methods=['get'])
+    @cache_response
+    def search(self, request):
+        """
+        Full-text search over title and content with ?q=, best matches
+        first; `word*` matches words starting with `word`. Accepts the list
+        filters, and ?ordering= instead of the rank order.
+        """
+        terms = parse_terms(request.query_params.get('q', ''))
+        if not terms:
+            return Response(
+                {"error": "Query parameter q is required"}, 
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        backend = get_backend()
+        posts = backend.search(self.get_queryset().defer('content'), terms)
+        if 'ordering' not in request.query_params:
+            posts = posts.order_by('-search_rank', '-published_date', '-id')
+        page = self.paginate_queryset(posts)
+        snippets = backend.snippets([post.pk for post in page], terms)
+        serializer = self.get_serializer(page, many=True, context={
+            **self.get_serializer_context(), 'snippets': snippets,
+        })
+        return self.get_paginated_response(serializer.data)
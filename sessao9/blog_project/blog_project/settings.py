@@ -2,6 +2,7 @@
 Django settings for blog_project project.
 """
 
+import os
 from pathlib import Path
 
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -31,6 +32,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'blog_app.routers.ReadYourWritesMiddleware',
 ]
 
 ROOT_URLCONF = 'blog_project.urls'
@@ -60,6 +62,36 @@ DATABASES = {
     }
 }
 
+# Read replicas: aliases in DATABASES that serve the API's list, detail and
+# by_author reads (see blog_app.routers). Set BLOG_REPLICA_DB to the file of
+# a replicated copy of the database to add one.
+DATABASE_REPLICAS = []
+if os.environ.get('BLOG_REPLICA_DB'):
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.environ['BLOG_REPLICA_DB'],
+    }
+    DATABASE_REPLICAS.append('replica')
+
+DATABASE_ROUTERS = ['blog_app.routers.PrimaryReplicaRouter']
+
+# Seconds a client keeps reading from the primary after a write, so it sees
+# its own changes while the replicas catch up
+READ_YOUR_WRITES_SECONDS = 5
+
+# Per-process memory cache; point 'default' at a shared backend (file,
+# Redis, Memcached) when running several workers
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blog-api',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    }
+}
+
+# Seconds a cached API response is kept; writes invalidate it earlier
+BLOG_CACHE_TIMEOUT = 300
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
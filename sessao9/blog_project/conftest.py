@@ -9,3 +9,16 @@ def pytest_configure():
     settings.DEBUG = False
     settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
     settings.SECRET_KEY = 'test-key-for-testing-purposes-only'
+    # Second database for the routing tests; reads only reach it in tests
+    # that list it in DATABASE_REPLICAS
+    settings.DATABASES.setdefault('replica', {
+        **settings.DATABASES['default'],
+        'NAME': settings.BASE_DIR / 'db_replica.sqlite3',
+    })
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with an empty cache"""
+    from django.core.cache import cache
+    cache.clear()